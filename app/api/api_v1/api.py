@@ -16,6 +16,8 @@ from app.api.api_v1.endpoints import developer
 
 
 from app.api.api_v1.endpoints import payroll_invoices
+from app.api.api_v1.endpoints import reports
+from app.api.api_v1.endpoints import jobs
 
 api_router = APIRouter()
 
@@ -38,3 +40,5 @@ api_router.include_router(developer.router, prefix="/developer", tags=["develope
 
 
 api_router.include_router(payroll_invoices.router, prefix="/payroll-invoices", tags=["payroll-invoices"])
+api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
@@ -1,4 +1,4 @@
-from . import auth, users, stores, schedules, weeks, timeclock, manager_timeentries, payroll, availability, leave_request, memberships, ai_schedule, developer, payroll_invoices
+from . import auth, users, stores, schedules, weeks, timeclock, manager_timeentries, payroll, availability, leave_request, memberships, ai_schedule, developer, payroll_invoices, reports
 
 __all__ = [
     "auth",
@@ -15,4 +15,5 @@ __all__ = [
     "ai_schedule",
     "developer", 
     "payroll_invoices",
+    "reports",
 ]
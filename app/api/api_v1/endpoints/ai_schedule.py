@@ -1,41 +1,89 @@
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user
 from app.core.access import require_store_access
 from app.models.user import User
-from app.schemas.ai_schedule import AiGapFillRequest, AiGapFillResponse, AiGapSuggestion
-from app.services.ai_gap_fill_service import build_gap_suggestions
+from app.models.week import Week
+from app.schemas.ai_schedule import AiGapFillRequest, AiGapFillResponse
+from app.schemas.job import JobOut
+from app.services.ai_gap_fill_service import (
+    JOB_KIND as GAP_FILL_JOB_KIND,
+    NO_SCHEDULE_NOTE,
+    in_flight_job,
+    params_key,
+    schedule_version,
+    stored_result,
+)
+from app.services.jobs import enqueue, job_accepted
 
 router = APIRouter()
 
 
-@router.post("/gap-fill", response_model=AiGapFillResponse)
-async def gap_fill_suggestions(
+@router.post(
+    "/gap-fill",
+    response_model=AiGapFillResponse,
+    responses={202: {"model": JobOut}},
+)
+def gap_fill_suggestions(
     data: AiGapFillRequest,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
+    """
+    200 with the stored result while the schedule is unchanged; otherwise
+    queues a gap-fill job (or hands out the one already running for the same
+    request) and returns 202 with it (poll /jobs/{id}).
+    """
     if user.role not in ("admin", "manager"):
         raise HTTPException(status_code=403, detail="Managers/Admin only")
 
     require_store_access(db, user, str(data.store_id))
 
-    suggestions, notes = await build_gap_suggestions(
-        db,
-        store_id=data.store_id,
-        week_id=data.week_id,
-        role_filter=data.role,
+    if not db.query(Week.id).filter(Week.id == data.week_id).first():
+        raise HTTPException(status_code=404, detail="Week not found")
+
+    version = schedule_version(db, store_id=data.store_id, week_id=data.week_id)
+    if version is None:
+        return AiGapFillResponse(
+            store_id=data.store_id,
+            week_id=data.week_id,
+            generated_at=datetime.now(timezone.utc),
+            suggestions=[],
+            notes=NO_SCHEDULE_NOTE,
+        )
+
+    key = params_key(
+        role=data.role,
         max_suggestions_per_shift=data.max_suggestions_per_shift,
         use_groq=data.use_groq,
     )
+    cached = stored_result(db, store_id=data.store_id, week_id=data.week_id, key=key, version=version)
+    if cached is not None:
+        return cached
 
-    return AiGapFillResponse(
-        store_id=data.store_id,
-        week_id=data.week_id,
-        generated_at=datetime.now(timezone.utc),
-        suggestions=[AiGapSuggestion(**s) for s in suggestions],
-        notes=notes,
-    )
+    dedupe_key = f"{data.store_id}:{data.week_id}:{key}:{version}"
+    # serializes concurrent identical requests until this transaction commits
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"gap-fill:{dedupe_key}"))))
+
+    job = in_flight_job(db, dedupe_key)
+    if job is None:
+        job = enqueue(
+            db,
+            GAP_FILL_JOB_KIND,
+            {
+                "store_id": str(data.store_id),
+                "week_id": str(data.week_id),
+                "role": data.role,
+                "max_suggestions_per_shift": data.max_suggestions_per_shift,
+                "use_groq": data.use_groq,
+                "dedupe_key": dedupe_key,
+            },
+            tenant_id=user.tenant_id,
+            created_by=user.id,
+        )
+    db.commit()
+    return job_accepted(job)
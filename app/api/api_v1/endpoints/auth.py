@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate
 from app.core.deps import get_db, get_current_user
 from app.core.security import verify_password, create_access_token, get_password_hash
 from app.models.user import User
@@ -62,6 +63,7 @@ def login(body: LoginRequest, db: Session = Depends(get_db)):
             user.locked_until = _now_utc() + timedelta(minutes=LOCKOUT_MINUTES)
 
         db.add(user)
+        invalidate(db, "users", user.id)
         db.commit()
 
         raise HTTPException(status_code=401, detail="Invalid email or password.")
@@ -70,6 +72,7 @@ def login(body: LoginRequest, db: Session = Depends(get_db)):
     user.failed_login_count = 0
     user.locked_until = None
     db.add(user)
+    invalidate(db, "users", user.id)
     db.commit()
 
     # Tenant active check (only tenant-scoped users except developer)
@@ -124,6 +127,7 @@ def change_password(
     me.locked_until = None
 
     db.add(me)
+    invalidate(db, "users", me.id)
     db.commit()
 
     return {"ok": True}
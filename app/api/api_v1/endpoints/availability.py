@@ -1,17 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user, require_role
+from app.core.pagination import DateRange, PageParams, page_params, paginate, week_scope_params
+from app.core.responses import fast_json_enabled, rows_response
+from app.db.projection import schema_columns
 from app.models.availability import Availability
+from app.models.availability_pattern import AvailabilityPattern
 from app.models.user import User
-from app.schemas.availability import AvailabilityUpsert, AvailabilityOut
+from app.models.week import Week
+from app.schemas.availability import (
+    AvailabilityBulkUpsert,
+    AvailabilityOut,
+    AvailabilityPatternCreate,
+    AvailabilityPatternOut,
+    AvailabilityUpsert,
+)
 
 router = APIRouter()
 
+_AVAILABILITY_OUT_COLUMNS = schema_columns(Availability, AvailabilityOut)
+
+
+def _day_filters(stmt, days: DateRange):
+    if days.week_id:
+        return stmt.where(Availability.week_id == days.week_id)
+    if days.date_from:
+        stmt = stmt.where(Availability.day >= days.date_from)
+    if days.date_to:
+        stmt = stmt.where(Availability.day <= days.date_to)
+    return stmt
+
 
 @router.get("/me", response_model=list[AvailabilityOut])
-def my_availability(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return db.query(Availability).filter(Availability.employee_id == user.id).all()
+def my_availability(
+    response: Response,
+    store_id: uuid.UUID | None = Query(None),
+    days: DateRange = Depends(week_scope_params),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    stmt = select(*_AVAILABILITY_OUT_COLUMNS).where(Availability.employee_id == user.id)
+    if store_id:
+        stmt = stmt.where(Availability.store_id == store_id)
+    stmt = _day_filters(stmt, days)
+
+    return paginate(db, stmt, order_by=(Availability.day, Availability.id), page=page, response=response)
 
 
 @router.post("/me", response_model=AvailabilityOut)
@@ -51,10 +90,147 @@ def upsert_my_availability(
     return row
 
 
+def _bulk_errors(db: Session, items: list[AvailabilityUpsert]) -> list[dict]:
+    weeks = {
+        w.id: w
+        for w in db.query(Week.id, Week.week_start, Week.week_end, Week.is_locked)
+        .filter(Week.id.in_({i.week_id for i in items}))
+        .all()
+    }
+
+    errors = []
+    seen = set()
+    for idx, item in enumerate(items):
+        key = (item.store_id, item.week_id, item.day)
+        wk = weeks.get(item.week_id)
+        if key in seen:
+            errors.append({"index": idx, "error": "Duplicate store/week/day"})
+        elif not wk:
+            errors.append({"index": idx, "error": "Week not found"})
+        elif wk.is_locked:
+            errors.append({"index": idx, "error": "Week is locked"})
+        elif not (wk.week_start <= item.day <= wk.week_end):
+            errors.append({"index": idx, "error": "day is outside the week"})
+        elif (
+            item.available_start_at
+            and item.available_end_at
+            and item.available_end_at <= item.available_start_at
+        ):
+            errors.append({"index": idx, "error": "available_end_at must be after available_start_at"})
+        seen.add(key)
+    return errors
+
+
+@router.post("/me/bulk", response_model=list[AvailabilityOut])
+def bulk_upsert_my_availability(
+    data: AvailabilityBulkUpsert,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Sets many days (a whole week or several) in one statement. Every item is
+    validated first; any error rejects the whole batch.
+    """
+    if user.role != "employee":
+        raise HTTPException(status_code=403, detail="Employees only")
+
+    errors = _bulk_errors(db, data.items)
+    if errors:
+        raise HTTPException(status_code=400, detail=errors)
+
+    stmt = insert(Availability).values(
+        [
+            {
+                "employee_id": user.id,
+                "store_id": i.store_id,
+                "week_id": i.week_id,
+                "day": i.day,
+                "available_start_at": i.available_start_at,
+                "available_end_at": i.available_end_at,
+            }
+            for i in data.items
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_availability_emp_store_week_day",
+        set_={
+            "available_start_at": stmt.excluded.available_start_at,
+            "available_end_at": stmt.excluded.available_end_at,
+        },
+    ).returning(*_AVAILABILITY_OUT_COLUMNS)
+
+    rows = sorted(db.execute(stmt).all(), key=lambda r: (r.day, r.id))
+    db.commit()
+    return rows
+
+
+# ---------------------------
+# Recurring patterns
+# ---------------------------
+@router.get("/patterns/me", response_model=list[AvailabilityPatternOut])
+def my_availability_patterns(
+    store_id: uuid.UUID | None = Query(None),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    q = db.query(AvailabilityPattern).filter(AvailabilityPattern.employee_id == user.id)
+    if store_id:
+        q = q.filter(AvailabilityPattern.store_id == store_id)
+    return q.order_by(AvailabilityPattern.weekday.asc(), AvailabilityPattern.start_time.asc()).all()
+
+
+@router.post("/patterns/me", response_model=AvailabilityPatternOut, status_code=201)
+def create_my_availability_pattern(
+    data: AvailabilityPatternCreate,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    if user.role != "employee":
+        raise HTTPException(status_code=403, detail="Employees only")
+    if data.effective_to and data.effective_to < data.effective_from:
+        raise HTTPException(status_code=400, detail="effective_to must be >= effective_from")
+    if data.end_time == data.start_time:
+        raise HTTPException(status_code=400, detail="end_time must differ from start_time")
+
+    row = AvailabilityPattern(employee_id=user.id, **data.model_dump())
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row
+
+
+@router.delete("/patterns/me/{pattern_id}", status_code=204)
+def delete_my_availability_pattern(
+    pattern_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    row = (
+        db.query(AvailabilityPattern)
+        .filter(AvailabilityPattern.id == pattern_id, AvailabilityPattern.employee_id == user.id)
+        .first()
+    )
+    if not row:
+        raise HTTPException(status_code=404, detail="Pattern not found")
+
+    db.delete(row)
+    db.commit()
+    return None
+
+
 @router.get("/store/{store_id}", response_model=list[AvailabilityOut])
 def store_availability(
     store_id: str,
+    response: Response,
+    days: DateRange = Depends(week_scope_params),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     _user: User = Depends(require_role("admin", "manager")),
 ):
-    return db.query(Availability).filter(Availability.store_id == store_id).all()
+    stmt = select(*_AVAILABILITY_OUT_COLUMNS).where(Availability.store_id == store_id)
+    stmt = _day_filters(stmt, days)
+
+    rows = paginate(db, stmt, order_by=(Availability.day, Availability.id), page=page, response=response)
+    if fast_json_enabled():
+        return rows_response((r._mapping for r in rows), headers=response.headers)
+    return rows
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
@@ -8,11 +8,10 @@ from app.models.tenant import Tenant
 from app.models.user import User
 from app.schemas.tenant import TenantCreate, TenantOut, TenantUpdate
 from pydantic import BaseModel, EmailStr
-from app.models.store import Store
-from app.models.schedule import Schedule
-from app.models.timeentry import TimeEntry
-from app.models.payroll_invoice import PayrollInvoice
 from app.schemas.developer_insights import TenantInsightsOut
+from app.schemas.job import JobOut
+from app.services.jobs import enqueue, job_accepted
+from app.services.tenant_insights import JOB_KIND as INSIGHTS_JOB_KIND, tenant_insights as compute_tenant_insights
 
 import secrets
 import string
@@ -208,147 +207,27 @@ def tenant_insights(
     if not t:
         raise HTTPException(status_code=404, detail="Tenant not found.")
 
-    stores_count = db.query(func.count(Store.id)).filter(Store.tenant_id == t.id).scalar() or 0
+    return compute_tenant_insights(db, [t.id])[0]
 
-    users_count = db.query(func.count(User.id)).filter(User.tenant_id == t.id).scalar() or 0
-    active_users_count = (
-        db.query(func.count(User.id))
-        .filter(User.tenant_id == t.id, func.lower(User.status) == "active")
-        .scalar()
-        or 0
-    )
-
-    managers_count = (
-        db.query(func.count(User.id))
-        .filter(User.tenant_id == t.id, func.lower(User.role) == "manager")
-        .scalar()
-        or 0
-    )
-    employees_count = (
-        db.query(func.count(User.id))
-        .filter(User.tenant_id == t.id, func.lower(User.role) == "employee")
-        .scalar()
-        or 0
-    )
-
-    schedules_count = db.query(func.count(Schedule.id)).filter(Schedule.tenant_id == t.id).scalar() or 0
-    published_schedules_count = (
-        db.query(func.count(Schedule.id))
-        .filter(Schedule.tenant_id == t.id, Schedule.published == True)  # noqa: E712
-        .scalar()
-        or 0
-    )
-
-    open_time_entries_count = (
-        db.query(func.count(TimeEntry.id))
-        .filter(TimeEntry.tenant_id == t.id, TimeEntry.clock_out_at.is_(None))
-        .scalar()
-        or 0
-    )
-
-    invoices_count = (
-        db.query(func.count(PayrollInvoice.id))
-        .filter(PayrollInvoice.tenant_id == t.id)
-        .scalar()
-        or 0
-    )
 
-    return TenantInsightsOut(
-        tenant_id=t.id,
-        tenant_code=t.code,
-        tenant_name=t.name,
-        is_active=bool(t.is_active),
-
-        stores_count=int(stores_count),
-        users_count=int(users_count),
-        active_users_count=int(active_users_count),
-        managers_count=int(managers_count),
-        employees_count=int(employees_count),
-
-        schedules_count=int(schedules_count),
-        published_schedules_count=int(published_schedules_count),
-
-        open_time_entries_count=int(open_time_entries_count),
-        invoices_count=int(invoices_count),
-    )
-
-
-@router.get("/tenants/insights", response_model=list[TenantInsightsOut])
+@router.get(
+    "/tenants/insights",
+    response_model=list[TenantInsightsOut],
+    responses={202: {"model": JobOut}},
+)
 def tenants_insights(
+    background: bool = Query(False),
     db: Session = Depends(get_db),
     me=Depends(get_current_user),
 ):
+    """
+    ?background=true: queue a job and return 202 with it (poll /jobs/{id}).
+    """
     _require_developer(me)
 
-    tenants = db.query(Tenant).order_by(Tenant.name.asc()).all()
-    out: list[TenantInsightsOut] = []
-
-    for t in tenants:
-        stores_count = db.query(func.count(Store.id)).filter(Store.tenant_id == t.id).scalar() or 0
-
-        users_count = db.query(func.count(User.id)).filter(User.tenant_id == t.id).scalar() or 0
-        active_users_count = (
-            db.query(func.count(User.id))
-            .filter(User.tenant_id == t.id, func.lower(User.status) == "active")
-            .scalar()
-            or 0
-        )
-
-        managers_count = (
-            db.query(func.count(User.id))
-            .filter(User.tenant_id == t.id, func.lower(User.role) == "manager")
-            .scalar()
-            or 0
-        )
-        employees_count = (
-            db.query(func.count(User.id))
-            .filter(User.tenant_id == t.id, func.lower(User.role) == "employee")
-            .scalar()
-            or 0
-        )
-
-        schedules_count = db.query(func.count(Schedule.id)).filter(Schedule.tenant_id == t.id).scalar() or 0
-        published_schedules_count = (
-            db.query(func.count(Schedule.id))
-            .filter(Schedule.tenant_id == t.id, Schedule.published == True)  # noqa: E712
-            .scalar()
-            or 0
-        )
-
-        open_time_entries_count = (
-            db.query(func.count(TimeEntry.id))
-            .filter(TimeEntry.tenant_id == t.id, TimeEntry.clock_out_at.is_(None))
-            .scalar()
-            or 0
-        )
-
-        invoices_count = (
-            db.query(func.count(PayrollInvoice.id))
-            .filter(PayrollInvoice.tenant_id == t.id)
-            .scalar()
-            or 0
-        )
-
-        out.append(
-            TenantInsightsOut(
-                tenant_id=t.id,
-                tenant_code=t.code,
-                tenant_name=t.name,
-                is_active=bool(t.is_active),
-
-                stores_count=int(stores_count),
-                users_count=int(users_count),
-                active_users_count=int(active_users_count),
-                managers_count=int(managers_count),
-                employees_count=int(employees_count),
-
-                schedules_count=int(schedules_count),
-                published_schedules_count=int(published_schedules_count),
-
-                open_time_entries_count=int(open_time_entries_count),
-                invoices_count=int(invoices_count),
-            )
-        )
-
-    return out
+    if background:
+        job = enqueue(db, INSIGHTS_JOB_KIND, {}, created_by=me.id)
+        db.commit()
+        return job_accepted(job)
 
+    return compute_tenant_insights(db)
@@ -0,0 +1,75 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, get_current_user
+from app.core.access import has_active_membership
+from app.core.pagination import PageParams, page_params, paginate
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.job import JobOut
+
+router = APIRouter()
+
+
+def _to_uuid(val: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(val)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid UUID: {val}")
+
+
+def _can_view(db: Session, me: User, job: Job) -> bool:
+    role = (me.role or "").lower()
+    if role == "developer" or job.created_by == me.id:
+        return True
+    if job.tenant_id is None or job.tenant_id != me.tenant_id:
+        return False
+    # tenant admins see every job of their tenant
+    if role == "tenant_admin":
+        return True
+    # store jobs are shared (gap-fill hands out one job per request): anyone
+    # with access to the store may poll it
+    store_id = (job.params or {}).get("store_id")
+    if store_id is None or role not in ("manager", "admin"):
+        return False
+    if role == "admin":
+        return True
+    try:
+        return has_active_membership(db, me.id, uuid.UUID(str(store_id)))
+    except ValueError:
+        return False
+
+
+@router.get("", response_model=list[JobOut])
+def list_my_jobs(
+    response: Response,
+    status: str | None = Query(None),
+    kind: str | None = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    stmt = select(Job).where(Job.created_by == me.id)
+    if status:
+        stmt = stmt.where(Job.status == status)
+    if kind:
+        stmt = stmt.where(Job.kind == kind)
+    return paginate(db, stmt, order_by=(Job.created_at, Job.id), page=page, response=response)
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    """
+    Status, progress and (once succeeded) result of a background job.
+    """
+    job = db.query(Job).filter(Job.id == _to_uuid(job_id)).first()
+    if not job or not _can_view(db, me, job):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
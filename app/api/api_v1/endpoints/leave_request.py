@@ -1,19 +1,55 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import any_, bindparam, case, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user, require_role
 from app.core.access import require_store_access
+from app.core.pagination import DateRange, PageParams, date_range_params, page_params, paginate, week_scope_params
+from app.db.projection import schema_columns
 from app.models.leave_request import LeaveRequest
 from app.models.user import User
-from app.schemas.leave_request import LeaveRequestCreate, LeaveDecision, LeaveRequestOut
+from app.schemas.leave_request import (
+    LeaveBulkDecision,
+    LeaveBulkDecisionResult,
+    LeaveConflictOut,
+    LeaveDecision,
+    LeaveDecisionOut,
+    LeaveRequestCreate,
+    LeaveRequestOut,
+)
+from app.services.leave_conflicts import find_leave_conflicts, find_leave_conflicts_many, unassign_conflicts
 
 router = APIRouter()
 
+_LEAVE_REQUEST_OUT_COLUMNS = schema_columns(LeaveRequest, LeaveRequestOut)
+
+
+def _leave_filters(stmt, status: str | None, dates: DateRange):
+    if status:
+        stmt = stmt.where(LeaveRequest.status == status)
+    # requests overlapping the range
+    if dates.date_from:
+        stmt = stmt.where(LeaveRequest.end_date >= dates.date_from)
+    if dates.date_to:
+        stmt = stmt.where(LeaveRequest.start_date <= dates.date_to)
+    return stmt
+
 
 @router.get("/me", response_model=list[LeaveRequestOut])
-def my_leave_requests(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return db.query(LeaveRequest).filter(LeaveRequest.employee_id == user.id).all()
+def my_leave_requests(
+    response: Response,
+    status: str | None = Query(None),
+    dates: DateRange = Depends(week_scope_params),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    stmt = select(*_LEAVE_REQUEST_OUT_COLUMNS).where(LeaveRequest.employee_id == user.id)
+    stmt = _leave_filters(stmt, status, dates)
+
+    return paginate(db, stmt, order_by=(LeaveRequest.start_date, LeaveRequest.id), page=page, response=response)
 
 
 @router.post("/me", response_model=LeaveRequestOut, status_code=201)
@@ -45,14 +81,116 @@ def create_my_leave_request(
 @router.get("/store/{store_id}", response_model=list[LeaveRequestOut])
 def list_store_leave_requests(
     store_id: str,
+    response: Response,
+    status: str | None = Query(None),
+    dates: DateRange = Depends(date_range_params),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     require_store_access(db, user, store_id)
-    return db.query(LeaveRequest).filter(LeaveRequest.store_id == store_id).all()
 
+    stmt = select(*_LEAVE_REQUEST_OUT_COLUMNS).where(LeaveRequest.store_id == store_id)
+    stmt = _leave_filters(stmt, status, dates)
 
-@router.post("/{leave_request_id}/decide", response_model=LeaveRequestOut)
+    return paginate(db, stmt, order_by=(LeaveRequest.start_date, LeaveRequest.id), page=page, response=response)
+
+
+@router.post("/decide", response_model=list[LeaveBulkDecisionResult])
+def bulk_decide_leave_requests(
+    data: LeaveBulkDecision,
+    db: Session = Depends(get_db),
+    user: User = Depends(require_role("manager", "admin")),
+):
+    """
+    Decides many pending requests at once. Store access is checked once per
+    distinct store; every allowed item is applied by one UPDATE ... RETURNING.
+    Results come back in request order with a per-item outcome; approved
+    items carry their shift conflicts, as on the single-item endpoint.
+    """
+    decisions: dict = {}
+    unassign: dict = {}
+    for item in data.items:
+        decisions.setdefault(item.id, item.status)
+        unassign.setdefault(item.id, item.unassign_conflicts)
+
+    found = {
+        r.id: r.store_id
+        for r in db.execute(
+            select(LeaveRequest.id, LeaveRequest.store_id).where(LeaveRequest.id.in_(list(decisions)))
+        )
+    }
+
+    forbidden_stores = set()
+    for store_id in set(found.values()):
+        try:
+            require_store_access(db, user, store_id)
+        except HTTPException as e:
+            if e.status_code != 403:
+                raise
+            forbidden_stores.add(store_id)
+
+    allowed = [i for i, sid in found.items() if sid not in forbidden_stores]
+
+    updated = {}
+    conflicts: dict = {}
+    removed = set()
+    if allowed:
+        stmt = (
+            update(LeaveRequest)
+            .where(
+                LeaveRequest.id == any_(bindparam("ids", allowed, type_=ARRAY(UUID(as_uuid=True)))),
+                LeaveRequest.status == "pending",
+            )
+            .values(
+                status=case({i: decisions[i] for i in allowed}, value=LeaveRequest.id),
+                decided_by=user.id,
+                decided_at=func.now(),
+            )
+            .returning(*_LEAVE_REQUEST_OUT_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        updated = {r.id: r for r in db.execute(stmt)}
+
+        conflicts = find_leave_conflicts_many(db, [r for r in updated.values() if r.status == "approved"])
+        removed = unassign_conflicts(
+            db, [c for lr_id, rows in conflicts.items() if unassign[lr_id] for c in rows]
+        )
+        db.commit()
+
+    out = []
+    seen = set()
+    for item in data.items:
+        if item.id in seen:
+            out.append(LeaveBulkDecisionResult(id=item.id, outcome="duplicate"))
+            continue
+        seen.add(item.id)
+
+        if item.id not in found:
+            outcome = "not_found"
+        elif found[item.id] in forbidden_stores:
+            outcome = "forbidden"
+        elif item.id in updated:
+            outcome = decisions[item.id]
+        else:
+            outcome = "already_decided"
+
+        row = updated.get(item.id)
+        out.append(
+            LeaveBulkDecisionResult(
+                id=item.id,
+                outcome=outcome,
+                leave_request=LeaveRequestOut.model_validate(row._mapping) if row is not None else None,
+                conflicts=[
+                    LeaveConflictOut(**c._mapping, unassigned=c.assignment_id in removed)
+                    for c in conflicts.get(item.id, [])
+                ],
+            )
+        )
+    return out
+
+
+@router.post("/{leave_request_id}/decide", response_model=LeaveDecisionOut)
 def decide_leave_request(
     leave_request_id: str,
     data: LeaveDecision,
@@ -73,6 +211,18 @@ def decide_leave_request(
     lr.decided_by = user.id
     lr.decided_at = datetime.utcnow()
 
+    conflicts = []
+    removed = set()
+    if lr.status == "approved":
+        conflicts = find_leave_conflicts(db, lr)
+        if data.unassign_conflicts:
+            removed = unassign_conflicts(db, conflicts)
+
     db.commit()
     db.refresh(lr)
-    return lr
+
+    out = LeaveDecisionOut.model_validate(lr)
+    out.conflicts = [
+        LeaveConflictOut(**c._mapping, unassigned=c.assignment_id in removed) for c in conflicts
+    ]
+    return out
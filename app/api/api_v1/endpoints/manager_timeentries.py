@@ -1,18 +1,29 @@
 from datetime import date
+import asyncio
+import json
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user
 from app.core.access import require_store_access
+from app.core.events import subscribe, unsubscribe
+from app.db.session import SessionLocal
 from app.models.user import User
 from app.models.timeentry import TimeEntry
 from app.models.week import Week
 from app.schemas.timeclock import TimeEntryOut
+from app.services.week_archive import load_week_archive
+from app.services.week_service import get_week_clock_in_bounds
 
 router = APIRouter()
 
+# SSE keep-alive comment interval (proxies drop idle streams)
+HEARTBEAT_SECONDS = 15
+
 
 def _to_uuid(val: str) -> uuid.UUID:
     try:
@@ -38,9 +49,19 @@ def list_time_entries_for_store_week(
     if not wk:
         raise HTTPException(status_code=404, detail="Week not found")
 
+    if wk.archived_at is not None:
+        archived = load_week_archive(db, store_id=store_uuid, week_id=wk.id)
+        return archived["time_entries"] if archived else []
+
+    lo, hi = get_week_clock_in_bounds(wk.week_start)
     return (
         db.query(TimeEntry)
-        .filter(TimeEntry.store_id == store_uuid, TimeEntry.week_id == wk.id)
+        .filter(
+            TimeEntry.store_id == store_uuid,
+            TimeEntry.week_id == wk.id,
+            TimeEntry.clock_in_at >= lo,
+            TimeEntry.clock_in_at < hi,
+        )
         .order_by(TimeEntry.clock_in_at.asc())
         .all()
     )
@@ -64,3 +85,62 @@ def list_open_entries_for_store(
         .order_by(TimeEntry.clock_in_at.asc())
         .all()
     )
+
+
+def _open_entries_json(store_uuid: uuid.UUID) -> str:
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(TimeEntry)
+            .filter(TimeEntry.store_id == store_uuid, TimeEntry.clock_out_at.is_(None))
+            .order_by(TimeEntry.clock_in_at.asc())
+            .all()
+        )
+        return json.dumps([TimeEntryOut.model_validate(r).model_dump(mode="json") for r in rows])
+    finally:
+        db.close()
+
+
+async def _store_event_stream(request: Request, store_uuid: uuid.UUID):
+    # subscribe before the snapshot so nothing falls between the two
+    q = subscribe(store_uuid)
+    try:
+        snapshot = await run_in_threadpool(_open_entries_json, store_uuid)
+        yield f"event: snapshot\ndata: {snapshot}\n\n"
+
+        while not await request.is_disconnected():
+            try:
+                kind, data = await asyncio.wait_for(q.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {kind}\ndata: {data}\n\n"
+    finally:
+        unsubscribe(store_uuid, q)
+
+
+@router.get("/stores/{store_id}/events")
+def stream_store_events(
+    store_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events for a store's live dashboard: a `snapshot` of open
+    entries, then `clock_in`, `clock_out` and `out_of_zone` events (data is a
+    TimeEntryOut) as they are committed. Replaces polling open-entries.
+    """
+    if user.role not in ("manager", "admin"):
+        raise HTTPException(status_code=403, detail="Managers/Admin only")
+
+    store_uuid = _to_uuid(store_id)
+    require_store_access(db, user, store_uuid)
+    # the stream can stay open for hours: don't hold a pooled connection
+    db.close()
+
+    return StreamingResponse(
+        _store_event_stream(request, store_uuid),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
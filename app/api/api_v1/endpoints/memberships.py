@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user
-from app.core.access import require_store_access
+from app.core.access import membership_key, require_store_access
+from app.core.cache import invalidate
+from app.core.pagination import PageParams, page_params, paginate
+from app.db.projection import schema_columns
 from app.models.user import User
 from app.models.membership import StoreMembership
 from app.models.store import Store
 from app.schemas.membership import MembershipCreate, MembershipOut
+from app.services.schedule_version import bump_store_schedule_versions
 
 router = APIRouter()
 
+_MEMBERSHIP_OUT_COLUMNS = schema_columns(StoreMembership, MembershipOut)
+
 
 @router.post("", response_model=MembershipOut, status_code=201)
 def create_membership(
@@ -52,6 +59,9 @@ def create_membership(
         existing.is_active = True
         existing.store_role = data.store_role
         existing.pay_rate = final_pay_rate
+        # pay settings feed schedule cost forecasts
+        bump_store_schedule_versions(db, store_id)
+        invalidate(db, "memberships", membership_key(data.user_id, store_id))
         db.commit()
         db.refresh(existing)
         return existing
@@ -64,6 +74,8 @@ def create_membership(
         is_active=True,
     )
     db.add(m)
+    bump_store_schedule_versions(db, store_id)
+    invalidate(db, "memberships", membership_key(data.user_id, store_id))
     db.commit()
     db.refresh(m)
     return m
@@ -72,20 +84,24 @@ def create_membership(
 @router.get("/store/{store_id}", response_model=list[MembershipOut])
 def list_store_memberships(
     store_id: str,
+    response: Response,
+    store_role: str | None = Query(None),
+    page: PageParams = Depends(page_params),
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
     if user.role != "admin":
         require_store_access(db, user, store_id)
 
-    return (
-        db.query(StoreMembership)
-        .filter(
-            StoreMembership.store_id == store_id,
-            StoreMembership.is_active == True,
-        )
-        .order_by(StoreMembership.user_id.asc())
-        .all()
+    stmt = select(*_MEMBERSHIP_OUT_COLUMNS).where(
+        StoreMembership.store_id == store_id,
+        StoreMembership.is_active == True,
+    )
+    if store_role:
+        stmt = stmt.where(StoreMembership.store_role == store_role)
+
+    return paginate(
+        db, stmt, order_by=(StoreMembership.user_id, StoreMembership.id), page=page, response=response
     )
 
 
@@ -103,5 +119,7 @@ def delete_membership(
         raise HTTPException(status_code=404, detail="Membership not found")
 
     m.is_active = False
+    bump_store_schedule_versions(db, m.store_id)
+    invalidate(db, "memberships", membership_key(m.user_id, m.store_id))
     db.commit()
     return {"ok": True, "membership_id": membership_id}
@@ -1,18 +1,66 @@
-from datetime import datetime, date, timezone
+from datetime import date
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
 
 from app.core.deps import get_db, get_current_user
+from app.core.access import require_store_access
 from app.models.user import User
 from app.models.store import Store
-from app.models.timeentry import TimeEntry
 from app.models.week import Week
 from app.schemas.payroll import StoreWeekPayrollSummary, EmployeePayrollLine
+from app.services.payroll_service import week_payroll_lines
+from app.services.time_entry_agg import rebuild_week
 
 router = APIRouter()
 
 
+def _to_uuid(val: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(val)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid UUID: {val}")
+
+
+def _line(r) -> EmployeePayrollLine:
+    return EmployeePayrollLine(
+        employee_id=r.employee_id,
+        total_minutes=int(r.total_minutes),
+        out_of_zone_seconds=int(r.out_of_zone_seconds),
+        open_entries=int(r.open_entries),
+        regular_minutes=int(r.regular_minutes),
+        overtime_minutes=int(r.overtime_minutes),
+        pay_rate_hourly=r.pay_rate_hourly,
+        gross_pay=r.gross_pay,
+        tax_withheld=r.tax_withheld,
+        net_pay=r.net_pay,
+    )
+
+
+def _get_store_for(db: Session, current_user: User, store_id: str) -> Store:
+    """Active store of the caller's tenant the caller may manage; 403/404 otherwise."""
+    if current_user.role not in ("manager", "admin"):
+        raise HTTPException(status_code=403, detail="Managers/Admin only")
+    if getattr(current_user, "tenant_id", None) is None:
+        raise HTTPException(status_code=403, detail="Tenant context missing.")
+
+    store = (
+        db.query(Store)
+        .filter(
+            Store.id == _to_uuid(store_id),
+            Store.tenant_id == current_user.tenant_id,
+            Store.is_active == True,
+        )
+        .first()
+    )
+    if not store:
+        raise HTTPException(status_code=404, detail="Store not found")
+
+    require_store_access(db, current_user, store.id)
+    return store
+
+
 @router.get("/stores/{store_id}/week/{week_start}/summary", response_model=StoreWeekPayrollSummary)
 def store_week_payroll_summary(
     store_id: str,
@@ -20,70 +68,88 @@ def store_week_payroll_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    if current_user.role not in ("manager", "admin"):
-        raise HTTPException(status_code=403, detail="Managers/Admin only")
-
-    store = db.query(Store).filter(Store.id == store_id, Store.is_active == True).first()
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
+    store = _get_store_for(db, current_user, store_id)
 
     wk = db.query(Week).filter(Week.week_start == week_start).first()
     if not wk:
         raise HTTPException(status_code=404, detail="Week not found")
 
-    start_dt = datetime.combine(wk.week_start, datetime.min.time(), tzinfo=timezone.utc)
-    end_dt = datetime.combine(wk.week_end, datetime.max.time(), tzinfo=timezone.utc)
-
-    # Total minutes per employee (clock_out_at NULL rows count as open_entries, not included in minutes)
-    # minutes = EXTRACT(EPOCH FROM (clock_out - clock_in))/60
-    total_minutes_expr = func.coalesce(
-        func.sum(
-            case(
-                (TimeEntry.clock_out_at.isnot(None),
-                 func.floor(func.extract("epoch", (TimeEntry.clock_out_at - TimeEntry.clock_in_at)) / 60)),
-                else_=0
-            )
-        ),
-        0
-    ).label("total_minutes")
-
-    out_of_zone_expr = func.coalesce(func.sum(TimeEntry.out_of_zone_seconds), 0).label("out_of_zone_seconds")
-
-    open_entries_expr = func.coalesce(
-        func.sum(case((TimeEntry.clock_out_at.is_(None), 1), else_=0)),
-        0
-    ).label("open_entries")
-
-    rows = (
-        db.query(
-            TimeEntry.employee_id.label("employee_id"),
-            total_minutes_expr,
-            out_of_zone_expr,
-            open_entries_expr,
-        )
-        .filter(
-            TimeEntry.store_id == store.id,
-            TimeEntry.clock_in_at >= start_dt,
-            TimeEntry.clock_in_at <= end_dt,
-        )
-        .group_by(TimeEntry.employee_id)
-        .order_by(TimeEntry.employee_id.asc())
-        .all()
-    )
-
-    lines = [
-        EmployeePayrollLine(
-            employee_id=r.employee_id,
-            total_minutes=int(r.total_minutes),
-            out_of_zone_seconds=int(r.out_of_zone_seconds),
-            open_entries=int(r.open_entries),
-        )
-        for r in rows
-    ]
+    # minutes, overtime and pay per employee in one grouped query
+    rows = week_payroll_lines(db, week=wk, store_ids=[store.id])
 
     return StoreWeekPayrollSummary(
         store_id=store.id,
         week_start=wk.week_start.isoformat(),
         week_end=wk.week_end.isoformat(),
-        lines=lines,
+        lines=[_line(r) for r in rows],
+    )
+
+
+@router.post("/stores/{store_id}/week/{week_start}/rebuild-aggregates")
+def rebuild_store_week_aggregates(
+    store_id: str,
+    week_start: date,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Recomputes the weekly time-entry totals for one store+week from raw entries.
+    """
+    store = _get_store_for(db, current_user, store_id)
+
+    wk = db.query(Week).filter(Week.week_start == week_start).first()
+    if not wk:
+        raise HTTPException(status_code=404, detail="Week not found")
+
+    if wk.archived_at is not None:
+        raise HTTPException(status_code=400, detail="Week is archived; its aggregates cannot be rebuilt")
+
+    try:
+        rows = rebuild_week(db, week=wk, store_id=store.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+
+    return {"ok": True, "store_id": str(store.id), "week_start": wk.week_start.isoformat(), "rows": rows}
+
+
+@router.get("/tenant/week/{week_start}/summary", response_model=list[StoreWeekPayrollSummary])
+def tenant_week_payroll_summary(
+    week_start: date,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Same as the store summary, for every active store of the caller's tenant.
+    """
+    if (current_user.role or "").lower() not in ("admin", "tenant_admin"):
+        raise HTTPException(status_code=403, detail="Admin only")
+    if getattr(current_user, "tenant_id", None) is None:
+        raise HTTPException(status_code=403, detail="Tenant context missing.")
+
+    wk = db.query(Week).filter(Week.week_start == week_start).first()
+    if not wk:
+        raise HTTPException(status_code=404, detail="Week not found")
+
+    stores = (
+        db.query(Store.id)
+        .filter(Store.tenant_id == current_user.tenant_id, Store.is_active == True)
+        .order_by(Store.code.asc())
+        .all()
     )
+
+    rows = week_payroll_lines(db, week=wk, tenant_id=current_user.tenant_id)
+
+    lines_by_store: dict = {}
+    for r in rows:
+        lines_by_store.setdefault(r.store_id, []).append(_line(r))
+
+    return [
+        StoreWeekPayrollSummary(
+            store_id=s.id,
+            week_start=wk.week_start.isoformat(),
+            week_end=wk.week_end.isoformat(),
+            lines=lines_by_store.get(s.id, []),
+        )
+        for s in stores
+    ]
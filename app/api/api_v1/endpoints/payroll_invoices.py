@@ -1,17 +1,28 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, date
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user
 from app.models.user import User
 from app.models.store import Store
 from app.models.week import Week
-from app.models.timeentry import TimeEntry
-from app.models.membership import StoreMembership
 from app.models.payroll_invoice import PayrollInvoice
+from app.schemas.job import JobOut
 from app.schemas.payroll_invoice import PayrollInvoiceOut, GenerateInvoicesResult
+from app.services.invoice_service import JOB_KIND as INVOICE_JOB_KIND, generate_week_invoices
+from app.services.jobs import enqueue, job_accepted
+from app.services.payroll_export import (
+    INVOICE_COLUMNS,
+    AGGREGATE_COLUMNS,
+    build_export_query,
+    parquet_available,
+    stream_csv,
+    stream_parquet,
+)
 
 router = APIRouter()
 
@@ -37,34 +48,28 @@ def _parse_week_start(week_start: str) -> date:
         raise HTTPException(status_code=400, detail="week_start must be YYYY-MM-DD")
 
 
-def _minutes_between(ci: datetime, co: datetime | None) -> int:
-    if not ci or not co:
-        return 0
-    sec = int((co - ci).total_seconds())
-    if sec <= 0:
-        return 0
-    return sec // 60
-
-
-def _safe_float(v, default=0.0) -> float:
+def _parse_uuid(val: str) -> uuid.UUID:
     try:
-        if v is None:
-            return float(default)
-        return float(str(v).strip())
+        return uuid.UUID(val)
     except Exception:
-        return float(default)
+        raise HTTPException(status_code=400, detail=f"Invalid UUID: {val}")
 
 
 @router.post(
     "/stores/{store_id}/week/{week_start}/generate-invoices",
     response_model=GenerateInvoicesResult,
+    responses={202: {"model": JobOut}},
 )
 def generate_store_week_invoices(
     store_id: str,
     week_start: str,
+    background: bool = Query(False),
     db: Session = Depends(get_db),
     me: User = Depends(get_current_user),
 ):
+    """
+    ?background=true: queue a job and return 202 with it (poll /jobs/{id}).
+    """
     _require_tenant(me)
     _require_manager_or_admin(me)
 
@@ -82,89 +87,18 @@ def generate_store_week_invoices(
     if not wk:
         raise HTTPException(status_code=404, detail="Week not found for that week_start.")
 
-    entries = (
-        db.query(TimeEntry)
-        .filter(TimeEntry.store_id == store_id, TimeEntry.week_id == wk.id)
-        .all()
-    )
-
-    minutes_by_emp: dict[str, int] = {}
-    for e in entries:
-        m = _minutes_between(e.clock_in_at, e.clock_out_at)
-        if m <= 0:
-            continue
-        emp_id = str(e.employee_id)
-        minutes_by_emp[emp_id] = minutes_by_emp.get(emp_id, 0) + m
-
-    if not minutes_by_emp:
-        return GenerateInvoicesResult(created=0, skipped_existing=0)
-
-    created = 0
-    skipped = 0
-
-    for emp_id_str, total_minutes in minutes_by_emp.items():
-        exists = (
-            db.query(PayrollInvoice)
-            .filter(
-                PayrollInvoice.store_id == store_id,
-                PayrollInvoice.employee_id == emp_id_str,
-                PayrollInvoice.week_start == ws,
-            )
-            .first()
-        )
-        if exists:
-            skipped += 1
-            continue
-
-        mem = (
-            db.query(StoreMembership)
-            .filter(
-                StoreMembership.store_id == store_id,
-                StoreMembership.user_id == emp_id_str,
-                StoreMembership.is_active == True,  # noqa: E712
-            )
-            .first()
-        )
-
-        pay_rate = _safe_float(getattr(mem, "pay_rate_hourly", None), 0.0)
-        if pay_rate <= 0:
-            pay_rate = _safe_float(getattr(mem, "pay_rate", None), 0.0)
-
-        tax_enabled = bool(getattr(mem, "tax_enabled", False))
-        tax_rate_percent = _safe_float(getattr(mem, "tax_rate_percent", None), 0.0)
-
-        total_hours = total_minutes / 60.0
-        regular_hours = min(total_hours, 40.0)
-        overtime_hours = max(total_hours - 40.0, 0.0)
-
-        gross = (regular_hours * pay_rate) + (overtime_hours * pay_rate * 1.5)
-
-        tax_withheld = 0.0
-        if tax_enabled and tax_rate_percent > 0:
-            tax_withheld = gross * (tax_rate_percent / 100.0)
-
-        net = gross - tax_withheld
-
-        inv = PayrollInvoice(
+    if background:
+        job = enqueue(
+            db,
+            INVOICE_JOB_KIND,
+            {"store_id": str(store.id), "week_id": str(wk.id)},
             tenant_id=me.tenant_id,
-            store_id=store_id,
-            employee_id=emp_id_str,
-            week_start=ws,
-            # invoice_no is generated by DB sequence automatically ✅
-            pay_rate_hourly=pay_rate,
-            regular_minutes=int(regular_hours * 60),
-            overtime_minutes=int(overtime_hours * 60),
-            gross_pay=round(gross, 2),
-            tax_enabled=tax_enabled,
-            tax_rate_percent=tax_rate_percent,
-            tax_withheld=round(tax_withheld, 2),
-            net_pay=round(net, 2),
-            status="issued",
+            created_by=me.id,
         )
+        db.commit()
+        return job_accepted(job)
 
-        db.add(inv)
-        created += 1
-
+    created, skipped = generate_week_invoices(db, tenant_id=me.tenant_id, store=store, week=wk)
     db.commit()
 
     return GenerateInvoicesResult(created=created, skipped_existing=skipped)
@@ -205,6 +139,62 @@ def list_store_week_invoices(
     )
 
 
+@router.get("/export")
+def export_invoices(
+    start_date: date,
+    end_date: date,
+    format: str = Query(default="csv", pattern="^(csv|parquet)$"),
+    include_time_aggregates: bool = False,
+    store_id: str | None = None,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    """
+    Streams every invoice of the tenant with week_start in [start_date, end_date]
+    as CSV or Parquet. Optionally adds the week's time-entry totals per row.
+    """
+    _require_tenant(me)
+    _require_manager_or_admin(me)
+
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+
+    store_uuid = None
+    if store_id:
+        store_uuid = _parse_uuid(store_id)
+        store = (
+            db.query(Store.id)
+            .filter(Store.id == store_uuid, Store.tenant_id == me.tenant_id)
+            .first()
+        )
+        if not store:
+            raise HTTPException(status_code=404, detail="Store not found.")
+
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export is not available (pyarrow not installed).")
+
+    stmt = build_export_query(
+        tenant_id=me.tenant_id,
+        start_date=start_date,
+        end_date=end_date,
+        store_id=store_uuid,
+        include_time_aggregates=include_time_aggregates,
+    )
+    columns = INVOICE_COLUMNS + (AGGREGATE_COLUMNS if include_time_aggregates else [])
+
+    filename = f"payroll_invoices_{start_date.isoformat()}_{end_date.isoformat()}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if format == "parquet":
+        return StreamingResponse(
+            stream_parquet(stmt, columns),
+            media_type="application/vnd.apache.parquet",
+            headers=headers,
+        )
+
+    return StreamingResponse(stream_csv(stmt, columns), media_type="text/csv", headers=headers)
+
+
 @router.get("/me/week/{week_start}/invoices", response_model=list[PayrollInvoiceOut])
 def list_my_week_invoices(
     week_start: str,
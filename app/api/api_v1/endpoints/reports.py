@@ -0,0 +1,97 @@
+from datetime import date
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, get_current_user
+from app.core.access import require_store_access
+from app.models.user import User
+from app.models.store import Store
+from app.models.membership import StoreMembership
+from app.models.week import Week
+from app.schemas.reports import GeofenceComplianceReport, VarianceReport
+from app.services.geofence_report_service import build_geofence_compliance_report
+from app.services.variance_report_service import build_variance_report
+
+router = APIRouter()
+
+MAX_RANGE_DAYS = 366
+
+
+def _role(me: User) -> str:
+    return (getattr(me, "role", "") or "").lower()
+
+
+def _to_uuid(val: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(val)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid UUID: {val}")
+
+
+def _report_stores(db: Session, me: User, store_id: str | None) -> list[Store]:
+    if _role(me) not in ("admin", "tenant_admin", "manager"):
+        raise HTTPException(status_code=403, detail="Managers/Admin only")
+    if getattr(me, "tenant_id", None) is None:
+        raise HTTPException(status_code=403, detail="Tenant context missing.")
+
+    q = db.query(Store).filter(Store.tenant_id == me.tenant_id)
+
+    if store_id:
+        sid = _to_uuid(store_id)
+        # q already keeps admins and tenant admins inside their tenant
+        store = q.filter(Store.id == sid).first()
+        if not store:
+            raise HTTPException(status_code=404, detail="Store not found.")
+        if _role(me) == "manager":
+            require_store_access(db, me, store.id)
+        return [store]
+
+    if _role(me) == "manager":
+        q = q.join(
+            StoreMembership,
+            (StoreMembership.store_id == Store.id)
+            & (StoreMembership.user_id == me.id)
+            & (StoreMembership.is_active.is_(True)),
+        )
+
+    return q.order_by(Store.code.asc()).all()
+
+
+@router.get("/geofence-compliance", response_model=GeofenceComplianceReport)
+def geofence_compliance_report(
+    start_date: date,
+    end_date: date,
+    store_id: str | None = None,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be >= start_date")
+    if (end_date - start_date).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range too large (max {MAX_RANGE_DAYS} days)")
+
+    stores = _report_stores(db, me, store_id)
+
+    return build_geofence_compliance_report(db, stores=stores, start_date=start_date, end_date=end_date)
+
+
+@router.get("/variance", response_model=VarianceReport)
+def variance_report(
+    week_start: date,
+    store_id: str | None = None,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    """
+    Scheduled vs actual for one week: no-shows, lateness, early leaves and
+    unscheduled work per employee and store.
+    """
+    wk = db.query(Week).filter(Week.week_start == week_start).first()
+    if not wk:
+        raise HTTPException(status_code=404, detail="Week not found for that week_start.")
+
+    stores = _report_stores(db, me, store_id)
+
+    return build_variance_report(db, stores=stores, week=wk)
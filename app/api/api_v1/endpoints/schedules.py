@@ -1,8 +1,11 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
+from app.core.cache import TTLCache, invalidate
 from app.core.deps import get_db, get_current_user
+from app.core.responses import fast_json_enabled, json_bytes_response
 from app.core.access import require_store_access
 from app.models.user import User
 from app.models.schedule import Schedule, Shift, ShiftAssignment
@@ -14,10 +17,28 @@ from app.schemas.schedule import (
     ShiftAssignRequest,
     ShiftAssignmentOut,
     PublishScheduleRequest,
+    ScheduleValidationOut,
+    ScheduleViolationOut,
 )
+from app.schemas.payroll import ScheduleCostForecast
+from app.services.schedule_constraints import ScheduleConstraints
+from app.services.schedule_cost import schedule_cost_forecast
+from app.services.schedule_snapshot import (
+    MSGPACK_MEDIA_TYPE,
+    drop_snapshot,
+    get_snapshot_body,
+    schedule_doc,
+    write_snapshot,
+)
+from app.services.schedule_version import bump_schedule_versions, schedule_cache_key
+from app.services.week_archive import load_week_archive
 
 router = APIRouter()
 
+# "store_id:week_id" -> unpublished schedule document (published ones are
+# served from snapshots); invalidated by bump_schedule_versions and publish
+schedule_cache = TTLCache("schedules", max_size=2_000)
+
 
 @router.get("/ping")
 def ping():
@@ -52,34 +73,48 @@ def _get_schedule_or_404(db: Session, schedule_id: str) -> Schedule:
     return s
 
 
-@router.get("/{store_id}/{week_id}", response_model=ScheduleOut)
-def get_schedule(
-    store_id: str,
-    week_id: str,
+# Registered before GET "/{store_id}/{week_id}", which would also match these.
+@router.get("/{schedule_id}/validate", response_model=ScheduleValidationOut)
+def validate_schedule(
+    schedule_id: str,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
-    require_store_access(db, user, store_id)
+    schedule = _get_schedule_or_404(db, schedule_id)
+    require_store_access(db, user, str(schedule.store_id))
 
-    schedule = (
-        db.query(Schedule)
-        .options(selectinload(Schedule.shifts).selectinload(Shift.assignments))
-        .filter(
-            Schedule.store_id == _to_uuid(store_id),
-            Schedule.week_id == _to_uuid(week_id),
-        )
-        .first()
+    violations = ScheduleConstraints.load(db, schedule).validate(schedule.shifts)
+    errors = sum(1 for v in violations if v.severity == "error")
+
+    return ScheduleValidationOut(
+        schedule_id=schedule.id,
+        valid=errors == 0,
+        errors=errors,
+        warnings=len(violations) - errors,
+        violations=[ScheduleViolationOut.model_validate(v) for v in violations],
     )
-    if not schedule:
-        raise HTTPException(status_code=404, detail="Schedule not found")
 
-    return schedule
+
+@router.get("/{schedule_id}/cost-forecast", response_model=ScheduleCostForecast)
+def get_schedule_cost_forecast(
+    schedule_id: str,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    """
+    Projected hours and pay per employee if the schedule is worked as
+    planned. Cached per schedule version.
+    """
+    schedule = _get_schedule_or_404(db, schedule_id)
+    require_store_access(db, user, str(schedule.store_id))
+    return schedule_cost_forecast(db, schedule)
 
 
-@router.post("/{store_id}/{week_id}", response_model=ScheduleOut, status_code=201)
-def create_schedule(
+@router.get("/{store_id}/{week_id}", response_model=ScheduleOut)
+def get_schedule(
     store_id: str,
     week_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
 ):
@@ -88,21 +123,56 @@ def create_schedule(
     store_uuid = _to_uuid(store_id)
     week_uuid = _to_uuid(week_id)
 
-    _ensure_week_not_locked(db, week_uuid)
+    cache_key = schedule_cache_key(store_uuid, week_uuid)
+    cached = schedule_cache.get(cache_key)
+    if cached is not None:
+        return json_bytes_response(cached) if fast_json_enabled() else cached
+    token = schedule_cache.token()
+
+    # published: pre-rendered bytes, no ORM loading
+    snap = get_snapshot_body(
+        db,
+        store_id=store_uuid,
+        week_id=week_uuid,
+        want_msgpack=MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""),
+    )
+    if snap:
+        body, media_type = snap
+        return Response(content=body, media_type=media_type)
+
+    if fast_json_enabled():
+        row = db.execute(
+            select(Schedule.__table__).where(
+                Schedule.store_id == store_uuid,
+                Schedule.week_id == week_uuid,
+            )
+        ).first()
+        if row:
+            doc = schedule_doc(db, row)
+            if not row.is_published:
+                schedule_cache.set(cache_key, doc, token)
+            return json_bytes_response(doc)
 
-    existing = (
+    schedule = (
         db.query(Schedule)
-        .filter(Schedule.store_id == store_uuid, Schedule.week_id == week_uuid)
+        .options(selectinload(Schedule.shifts).selectinload(Shift.assignments))
+        .filter(
+            Schedule.store_id == store_uuid,
+            Schedule.week_id == week_uuid,
+        )
         .first()
     )
-    if existing:
-        return existing
+    if schedule:
+        if not schedule.is_published:
+            schedule_cache.set(cache_key, ScheduleOut.model_validate(schedule).model_dump(), token)
+        return schedule
 
-    schedule = Schedule(store_id=store_uuid, week_id=week_uuid, is_published=False)
-    db.add(schedule)
-    db.commit()
-    db.refresh(schedule)
-    return schedule
+    # archived weeks no longer have hot rows
+    archived = load_week_archive(db, store_id=store_uuid, week_id=week_uuid)
+    if archived and archived["schedule"]:
+        return archived["schedule"]
+
+    raise HTTPException(status_code=404, detail="Schedule not found")
 
 
 @router.post("/{schedule_id}/shifts", response_model=ShiftOut, status_code=201)
@@ -131,6 +201,7 @@ def add_shift(
         headcount_required=data.headcount_required,
     )
     db.add(shift)
+    bump_schedule_versions(db, [schedule.id])
     db.commit()
     db.refresh(shift)
     return shift
@@ -170,8 +241,18 @@ def assign_employee(
     if len(shift.assignments) >= shift.headcount_required:
         raise HTTPException(status_code=400, detail="Shift is already full")
 
+    # hard constraints: overlapping shifts, approved leave
+    constraints = ScheduleConstraints.load(db, schedule, employee_ids=[data.employee_id])
+    errors = [v for v in constraints.check_assign(data.employee_id, shift) if v.severity == "error"]
+    if errors:
+        raise HTTPException(
+            status_code=400,
+            detail=[ScheduleViolationOut.model_validate(v).model_dump(mode="json") for v in errors],
+        )
+
     assignment = ShiftAssignment(shift_id=shift.id, employee_id=data.employee_id)
     db.add(assignment)
+    bump_schedule_versions(db, [schedule.id])
     db.commit()
     db.refresh(assignment)
     return assignment
@@ -204,6 +285,7 @@ def unassign_employee(
         raise HTTPException(status_code=400, detail="Schedule is published. Unpublish to edit.")
 
     db.delete(a)
+    bump_schedule_versions(db, [schedule.id])
     db.commit()
     return None
 
@@ -220,6 +302,42 @@ def set_published(
     _ensure_week_not_locked(db, schedule.week_id)
 
     schedule.is_published = data.is_published
+    if schedule.is_published:
+        write_snapshot(db, schedule)
+    else:
+        drop_snapshot(db, schedule.id)
+    invalidate(db, "schedules", schedule_cache_key(schedule.store_id, schedule.week_id))
+    db.commit()
+    db.refresh(schedule)
+    return schedule
+
+
+# Registered last: "/{store_id}/{week_id}" would otherwise also match
+# POST "/{schedule_id}/shifts" and "/{schedule_id}/publish".
+@router.post("/{store_id}/{week_id}", response_model=ScheduleOut, status_code=201)
+def create_schedule(
+    store_id: str,
+    week_id: str,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+):
+    require_store_access(db, user, store_id)
+
+    store_uuid = _to_uuid(store_id)
+    week_uuid = _to_uuid(week_id)
+
+    _ensure_week_not_locked(db, week_uuid)
+
+    existing = (
+        db.query(Schedule)
+        .filter(Schedule.store_id == store_uuid, Schedule.week_id == week_uuid)
+        .first()
+    )
+    if existing:
+        return existing
+
+    schedule = Schedule(store_id=store_uuid, week_id=week_uuid, is_published=False)
+    db.add(schedule)
     db.commit()
     db.refresh(schedule)
     return schedule
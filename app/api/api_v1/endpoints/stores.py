@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate
 from app.core.deps import get_db, get_current_user
+from app.core.pagination import PageParams, page_params, paginate
 from app.models.store import Store
 from app.models.tenant import Tenant
 from app.schemas.store import StoreCreate, StoreOut
@@ -28,32 +31,39 @@ def _require_tenant_active(db: Session, me):
     return t
 
 
+def _tenant_stores_page(db: Session, me, response: Response, page: PageParams, is_active: bool | None):
+    stmt = select(Store).where(Store.tenant_id == me.tenant_id)
+    if is_active is not None:
+        stmt = stmt.where(Store.is_active.is_(is_active))
+    return paginate(db, stmt, order_by=(Store.code, Store.id), page=page, response=response)
+
+
 @router.get("", response_model=list[StoreOut])
-def list_stores(db: Session = Depends(get_db), me=Depends(get_current_user)):
+def list_stores(
+    response: Response,
+    is_active: bool | None = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    me=Depends(get_current_user),
+):
     _require_tenant_scoped(me)
     _require_tenant_active(db, me)
 
-    items = (
-        db.query(Store)
-        .filter(Store.tenant_id == me.tenant_id)
-        .order_by(Store.code.asc())
-        .all()
-    )
-    return items
+    return _tenant_stores_page(db, me, response, page, is_active)
 
 
 @router.get("/me", response_model=list[StoreOut])
-def my_stores(db: Session = Depends(get_db), me=Depends(get_current_user)):
+def my_stores(
+    response: Response,
+    is_active: bool | None = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    me=Depends(get_current_user),
+):
     _require_tenant_scoped(me)
     _require_tenant_active(db, me)
 
-    items = (
-        db.query(Store)
-        .filter(Store.tenant_id == me.tenant_id)
-        .order_by(Store.code.asc())
-        .all()
-    )
-    return items
+    return _tenant_stores_page(db, me, response, page, is_active)
 
 
 @router.post("", response_model=StoreOut)
@@ -92,6 +102,7 @@ def create_store(body: StoreCreate, db: Session = Depends(get_db), me=Depends(ge
         geofence_lat=getattr(body, "geofence_lat", None),
         geofence_lng=getattr(body, "geofence_lng", None),
         geofence_radius_m=getattr(body, "geofence_radius_m", None) or 150,
+        geofence_polygon=[list(p) for p in body.geofence_polygon] if body.geofence_polygon else None,
         is_active=True,
     )
     db.add(s)
@@ -110,5 +121,7 @@ def delete_store(store_id: str, db: Session = Depends(get_db), me=Depends(get_cu
         raise HTTPException(status_code=404, detail="Store not found.")
 
     db.delete(s)
+    # memberships go with the store (ON DELETE CASCADE)
+    invalidate(db, "memberships")
     db.commit()
     return {"ok": True}
@@ -3,7 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.deps import get_db, get_current_user
-from app.core.geofence import inside_geofence
+from app.core.events import emit_store_event
+from app.core.geofence import inside_store_geofence
 from app.core.access_employee import require_employee_store_membership
 
 from app.models.store import Store
@@ -11,6 +12,7 @@ from app.models.timeentry import TimeEntry
 from app.models.user import User
 from app.models.week import Week
 from app.services.week_service import get_week_start, get_week_end
+from app.services.time_entry_agg import record_clock_in, record_clock_out, record_out_of_zone
 
 from app.schemas.timeclock import (
     TimeEntryOut,
@@ -53,7 +55,7 @@ def clock_in(
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
-    if not inside_geofence(data.lat, data.lng, store.geofence_lat, store.geofence_lng, store.geofence_radius_m):
+    if not inside_store_geofence(store, data.lat, data.lng):
         raise HTTPException(status_code=403, detail="You must be at the store to clock in")
 
     open_entry = (
@@ -72,11 +74,16 @@ def clock_in(
         week_id=wk.id,
         clock_in_at=datetime.utcnow(),
         clock_out_at=None,
+        clock_in_lat=data.lat,
+        clock_in_lng=data.lng,
         out_of_zone_seconds=0,
         is_out_of_zone=False,
         created_at=datetime.utcnow(),
     )
     db.add(entry)
+    db.flush()
+    record_clock_in(db, entry)
+    emit_store_event(db, entry.store_id, "clock_in", TimeEntryOut.model_validate(entry).model_dump(mode="json"))
     db.commit()
     db.refresh(entry)
     return entry
@@ -91,9 +98,12 @@ def clock_out(
     if current_user.role != "employee":
         raise HTTPException(status_code=403, detail="Employees only")
 
+    # locked: a concurrent clock-out of the same entry waits here and then
+    # sees it closed, so its minutes reach the weekly aggregate once
     entry = (
         db.query(TimeEntry)
         .filter(TimeEntry.id == data.time_entry_id, TimeEntry.employee_id == current_user.id)
+        .with_for_update()
         .first()
     )
     if not entry:
@@ -106,11 +116,13 @@ def clock_out(
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
-    if not inside_geofence(data.lat, data.lng, store.geofence_lat, store.geofence_lng, store.geofence_radius_m):
+    if not inside_store_geofence(store, data.lat, data.lng):
         raise HTTPException(status_code=403, detail="You must be at the store to clock out")
 
     entry.clock_out_at = datetime.utcnow()
     entry.is_out_of_zone = False
+    record_clock_out(db, entry)
+    emit_store_event(db, entry.store_id, "clock_out", TimeEntryOut.model_validate(entry).model_dump(mode="json"))
     db.commit()
     db.refresh(entry)
     return entry
@@ -136,9 +148,11 @@ def out_of_zone_ping(
     if data.is_out_of_zone:
         entry.out_of_zone_seconds += data.seconds_since_last_ping
         entry.is_out_of_zone = True
+        record_out_of_zone(db, entry, data.seconds_since_last_ping)
     else:
         entry.is_out_of_zone = False
 
+    emit_store_event(db, entry.store_id, "out_of_zone", TimeEntryOut.model_validate(entry).model_dump(mode="json"))
     db.commit()
     db.refresh(entry)
     return entry
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.cache import invalidate
 from app.core.deps import get_db, get_current_user
+from app.core.pagination import PageParams, page_params, paginate
+from app.core.responses import fast_json_enabled, rows_response
 from app.core.security import get_password_hash
+from app.db.projection import schema_columns
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut, ResetPasswordOut
 
@@ -46,17 +51,30 @@ def _gen_temp_password(length: int = 12) -> str:
     return "".join(secrets.choice(alphabet) for _ in range(length))
 
 
+_USER_OUT_COLUMNS = schema_columns(User, UserOut)
+
+
 @router.get("", response_model=list[UserOut])
-def list_users(db: Session = Depends(get_db), me=Depends(get_current_user)):
+def list_users(
+    response: Response,
+    role: str | None = Query(None),
+    status: str | None = Query(None),
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(get_db),
+    me=Depends(get_current_user),
+):
     _require_tenant_scoped(me)
 
-    users = (
-        db.query(User)
-        .filter(User.tenant_id == me.tenant_id)
-        .order_by(User.email.asc())
-        .all()
-    )
-    return users
+    stmt = select(*_USER_OUT_COLUMNS).where(User.tenant_id == me.tenant_id)
+    if role:
+        stmt = stmt.where(User.role == role.lower())
+    if status:
+        stmt = stmt.where(User.status == status.lower())
+
+    rows = paginate(db, stmt, order_by=(User.email, User.id), page=page, response=response)
+    if fast_json_enabled():
+        return rows_response((r._mapping for r in rows), headers=response.headers)
+    return rows
 
 
 @router.post("", response_model=UserOut)
@@ -132,6 +150,7 @@ def reset_password(user_id: str, db: Session = Depends(get_db), me=Depends(get_c
         u.locked_until = None
 
     db.add(u)
+    invalidate(db, "users", u.id)
     db.commit()
 
     return ResetPasswordOut(
@@ -159,5 +178,7 @@ def delete_user(user_id: str, db: Session = Depends(get_db), me=Depends(get_curr
         raise HTTPException(status_code=404, detail="User not found.")
 
     db.delete(u)
+    invalidate(db, "users", u.id)
+    invalidate(db, "memberships")
     db.commit()
     return {"ok": True}
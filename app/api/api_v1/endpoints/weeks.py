@@ -4,13 +4,18 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache, invalidate
 from app.core.deps import get_db, get_current_user
 from app.models.week import Week
 from app.models.user import User
 from app.services.week_service import get_week_start, get_week_end
+from app.services.report_cache import drop_week_reports
 
 router = APIRouter()
 
+# week_start -> /current body; invalidated by lock/unlock
+week_cache = TTLCache("weeks", max_size=64)
+
 
 @router.get("/current")
 def get_current_week(db: Session = Depends(get_db)):
@@ -18,6 +23,11 @@ def get_current_week(db: Session = Depends(get_db)):
     week_start = get_week_start(today)
     week_end = get_week_end(week_start)
 
+    cached = week_cache.get(week_start)
+    if cached is not None:
+        return cached
+
+    token = week_cache.token()
     wk = db.query(Week).filter(Week.week_start == week_start).first()
     if not wk:
         wk = Week(week_start=week_start, week_end=week_end, is_locked=False, locked_at=None)
@@ -25,13 +35,15 @@ def get_current_week(db: Session = Depends(get_db)):
         db.commit()
         db.refresh(wk)
 
-    return {
+    body = {
         "id": str(wk.id),
         "week_start": wk.week_start,
         "week_end": wk.week_end,
         "is_locked": wk.is_locked,
         "locked_at": wk.locked_at,
     }
+    week_cache.set(week_start, body, token)
+    return body
 
 
 def _to_uuid(val: str) -> uuid.UUID:
@@ -60,6 +72,7 @@ def lock_week(
 
     wk.is_locked = True
     wk.locked_at = datetime.utcnow()
+    invalidate(db, "weeks", wk.week_start)
     db.commit()
     db.refresh(wk)
 
@@ -83,8 +96,14 @@ def unlock_week(
     if not wk.is_locked:
         return {"id": str(wk.id), "is_locked": wk.is_locked, "locked_at": wk.locked_at}
 
+    if wk.archived_at is not None:
+        raise HTTPException(status_code=400, detail="Week is archived and cannot be unlocked")
+
     wk.is_locked = False
     wk.locked_at = None
+    # cached reports were computed from the locked data
+    drop_week_reports(db, wk.id)
+    invalidate(db, "weeks", wk.week_start)
     db.commit()
     db.refresh(wk)
 
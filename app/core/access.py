@@ -2,6 +2,7 @@ import uuid
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
 from app.models.membership import StoreMembership
 from app.models.user import User
 
@@ -15,6 +16,35 @@ def _to_uuid(val):
         raise HTTPException(status_code=400, detail=f"Invalid UUID: {val}")
 
 
+# "user_id:store_id" -> has an active membership; invalidated by memberships.py writes
+membership_cache = TTLCache("memberships")
+
+
+def membership_key(user_id, store_id) -> str:
+    return f"{user_id}:{store_id}"
+
+
+def has_active_membership(db: Session, user_id: uuid.UUID, store_id: uuid.UUID) -> bool:
+    key = membership_key(user_id, store_id)
+    hit = membership_cache.get(key)
+    if hit is not None:
+        return hit
+
+    token = membership_cache.token()
+    found = (
+        db.query(StoreMembership.id)
+        .filter(
+            StoreMembership.user_id == user_id,
+            StoreMembership.store_id == store_id,
+            StoreMembership.is_active.is_(True),
+        )
+        .first()
+        is not None
+    )
+    membership_cache.set(key, found, token)
+    return found
+
+
 def require_store_access(db: Session, user: User, store_id):
     store_uuid = _to_uuid(store_id)
 
@@ -27,16 +57,7 @@ def require_store_access(db: Session, user: User, store_id):
             detail="Store access requires manager/admin role",
         )
 
-    membership = (
-        db.query(StoreMembership)
-        .filter(
-            StoreMembership.user_id == user.id,
-            StoreMembership.store_id == store_uuid,
-            StoreMembership.is_active.is_(True),
-        )
-        .first()
-    )
-    if not membership:
+    if not has_active_membership(db, user.id, store_uuid):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not assigned to this store",
@@ -2,7 +2,7 @@ import uuid
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.models.membership import StoreMembership
+from app.core.access import has_active_membership
 from app.models.user import User
 
 
@@ -27,17 +27,7 @@ def require_employee_store_membership(db: Session, user: User, store_id: str):
             detail="Employee membership required",
         )
 
-    membership = (
-        db.query(StoreMembership)
-        .filter(
-            StoreMembership.user_id == user.id,
-            StoreMembership.store_id == store_uuid,
-            StoreMembership.is_active.is_(True),
-        )
-        .first()
-    )
-
-    if not membership:
+    if not has_active_membership(db, user.id, store_uuid):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not assigned to this store",
@@ -0,0 +1,192 @@
+# app/core/cache.py
+"""
+In-process TTL caches kept coherent across workers by a change feed.
+
+    _users = TTLCache("users")
+
+    token = _users.token()
+    value = _users.get(key)
+    if value is None:
+        value = load(db, key)
+        _users.set(key, value, token)
+
+Writers record what they changed on the session; it goes out when the session
+commits and is dropped on rollback:
+
+    invalidate(db, "users", user.id)    # one entry
+    invalidate(db, "memberships")       # the whole cache
+    db.commit()
+
+Delivery:
+  - the committing process drops the entries right after commit
+  - settings.CACHE_CHANGE_FEED_PG_NOTIFY: one compact
+    `pg_notify('cache_changes', '[["users","<id>"],...]')` per transaction;
+    every worker's listener (app/core/pg_listen.py) drops the same entries
+    when it arrives
+
+Entries expire after settings.CACHE_TTL_SECONDS, which bounds staleness if a
+notification is ever lost. While the listener is disconnected the caches are
+bypassed, and they are cleared when it reconnects.
+
+token() / set(..., token): a value read from the database before an
+invalidation arrived is not cached (the set is skipped if the cache was
+invalidated in between).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core import pg_listen
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_changes"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD = 7900
+
+_PENDING_KEY = "pending_cache_changes"
+
+_caches: Dict[str, "TTLCache"] = {}
+
+
+def _pg_notify_enabled() -> bool:
+    return bool(settings.CACHE_CHANGE_FEED_PG_NOTIFY)
+
+
+class TTLCache:
+    def __init__(self, name: str, *, max_size: int = 10_000, ttl_seconds: float | None = None):
+        if name in _caches:
+            raise ValueError(f"cache {name!r} already exists")
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        _caches[name] = self
+
+    def _ttl(self) -> float:
+        return self.ttl_seconds if self.ttl_seconds is not None else settings.CACHE_TTL_SECONDS
+
+    def _usable(self) -> bool:
+        if not _pg_notify_enabled():
+            return True
+        pg_listen.listen(CHANNEL, _apply_payload, on_reconnect=clear_all)
+        return pg_listen.connected()
+
+    def token(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Any | None:
+        if not self._usable():
+            return None
+        k = str(key)
+        with self._lock:
+            hit = self._data.get(k)
+            if hit is None:
+                return None
+            if hit[0] < time.monotonic():
+                del self._data[k]
+                return None
+            self._data.move_to_end(k)
+            return hit[1]
+
+    def set(self, key: Hashable, value: Any, token: int) -> None:
+        if value is None or not self._usable():
+            return
+        with self._lock:
+            if token != self._generation:
+                return
+            k = str(key)
+            self._data[k] = (time.monotonic() + self._ttl(), value)
+            self._data.move_to_end(k)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(str(key), None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def clear_all() -> None:
+    for cache in list(_caches.values()):
+        cache.invalidate()
+
+
+# ---------------------------
+# Change feed
+# ---------------------------
+def invalidate(db: Session, cache: str, key: Hashable | None = None) -> None:
+    """
+    Drops `key` (or the whole cache) in every worker once the session commits.
+    """
+    change = (cache, None if key is None else str(key))
+    pending = db.info.setdefault(_PENDING_KEY, [])
+    if change not in pending:
+        pending.append(change)
+
+
+def _payload(changes: List[tuple]) -> str:
+    payload = json.dumps(changes, separators=(",", ":"))
+    if len(payload.encode("utf-8")) <= MAX_PAYLOAD:
+        return payload
+    # too many keys: clear the affected caches instead
+    return json.dumps([[c, None] for c in sorted({c for c, _ in changes})], separators=(",", ":"))
+
+
+def _apply(changes) -> None:
+    for name, key in changes:
+        cache = _caches.get(name)
+        if cache is not None:
+            cache.invalidate(key)
+
+
+def _apply_payload(payload: str) -> None:
+    try:
+        changes = json.loads(payload)
+    except ValueError:
+        logger.warning("bad cache change payload: %r", payload[:200])
+        clear_all()
+        return
+    _apply(changes)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session) -> None:
+    if not _pg_notify_enabled():
+        return
+    pending = session.info.get(_PENDING_KEY)
+    if not pending:
+        return
+    session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": _payload(pending)})
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    # locally too in NOTIFY mode: this worker's next request must not wait
+    # for the round trip
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
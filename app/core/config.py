@@ -21,6 +21,40 @@ class Settings(BaseSettings):
     # DATABASE
     DATABASE_URL: str
 
+    # PERFORMANCE
+    # orjson responses + dict fast paths on large list endpoints (app/core/responses.py)
+    FAST_JSON: bool = False
+
+    # live store events (app/core/events.py): fan out across workers via Postgres NOTIFY
+    STORE_EVENTS_PG_NOTIFY: bool = False
+
+    # in-process caches (app/core/cache.py): invalidated across workers via
+    # Postgres NOTIFY; entries expire after the TTL regardless
+    CACHE_CHANGE_FEED_PG_NOTIFY: bool = True
+    CACHE_TTL_SECONDS: int = 60
+
+    # background jobs (app/services/jobs.py, run_jobs_worker.py)
+    JOBS_TENANT_CONCURRENCY: int = 2
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_RETRY_BASE_SECONDS: int = 10
+    JOBS_RETRY_MAX_SECONDS: int = 600
+    JOBS_HEARTBEAT_SECONDS: int = 15
+    JOBS_STALE_SECONDS: int = 120
+
+    # stored gap-fill results: valid while the schedule version matches, and
+    # at most this long (availability and leave do not bump the version)
+    GAP_FILL_RESULT_MAX_AGE_SECONDS: int = 900
+
+    # request instrumentation (app/core/instrumentation.py), exported at GET /metrics
+    METRICS_ENABLED: bool = True
+    # /metrics is served only when this is set, behind "Authorization: Bearer <token>"
+    METRICS_TOKEN: str | None = None
+    # flag requests running one statement more than this many times
+    METRICS_N_PLUS_ONE_THRESHOLD: int = 10
+    # when set, "X-Profile: <token>" answers with a sampled profile of the request
+    PROFILE_TOKEN: str | None = None
+    PROFILE_INTERVAL_SECONDS: float = 0.001
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="allow",   # <<< THIS FIXES YOUR ERROR
@@ -1,8 +1,12 @@
+import uuid
+
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.security import ALGORITHM
 from app.db.session import SessionLocal
@@ -20,6 +24,10 @@ _PASSWORD_CHANGE_ALLOWLIST = {
 }
 
 
+# user id -> column values; invalidated by auth.py / users.py writes
+user_cache = TTLCache("users")
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -28,6 +36,29 @@ def get_db():
         db.close()
 
 
+def load_user(db: Session, user_id: str) -> User | None:
+    """
+    The token's user, attached to `db`. Cached hits are merged in without a
+    query, so endpoints can modify and commit the returned user as usual.
+    """
+    try:
+        key = str(uuid.UUID(str(user_id)))
+    except ValueError:
+        return None
+
+    cols = user_cache.get(key)
+    if cols is not None:
+        user = User(**cols)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    token = user_cache.token()
+    user = db.query(User).filter(User.id == key).first()
+    if user is not None:
+        user_cache.set(key, {a.key: getattr(user, a.key) for a in inspect(User).column_attrs}, token)
+    return user
+
+
 def _credentials_exception():
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -52,7 +83,7 @@ def get_current_user(
     except JWTError:
         raise _credentials_exception()
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = load_user(db, user_id)
     if not user:
         raise _credentials_exception()
 
@@ -85,7 +116,7 @@ def get_current_user_optional(
     except JWTError:
         return None
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = load_user(db, user_id)
     if not user:
         return None
 
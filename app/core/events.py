@@ -0,0 +1,134 @@
+# app/core/events.py
+"""
+Per-store live events (clock-in, clock-out, out-of-zone) for SSE streams.
+
+Publishing is tied to the request's transaction:
+
+    emit_store_event(db, store_id, "clock_in", payload)
+    db.commit()   # delivered here; dropped on rollback
+
+Delivery:
+  - default: in-process fan-out to this worker's subscribers after commit
+  - settings.STORE_EVENTS_PG_NOTIFY: `pg_notify('store_events', ...)` inside
+    the transaction (Postgres delivers it on commit), and every worker's
+    listener (app/core/pg_listen.py) fans out to its own subscribers, so
+    streams see events from all workers
+
+Subscribers are asyncio queues; publishers may be in any thread (sync
+endpoints run in the threadpool). A slow subscriber loses its oldest events
+rather than blocking anyone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import uuid
+from typing import Any, Dict, Set, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core import pg_listen
+from app.core.config import settings
+
+CHANNEL = "store_events"
+QUEUE_SIZE = 256
+
+_PENDING_KEY = "pending_store_events"
+
+# store_id -> {(loop, queue)}
+_subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_lock = threading.Lock()
+
+
+def _pg_notify_enabled() -> bool:
+    return bool(settings.STORE_EVENTS_PG_NOTIFY)
+
+
+# ---------------------------
+# Subscribe
+# ---------------------------
+def subscribe(store_id: uuid.UUID) -> asyncio.Queue:
+    """
+    Queue of (event type, JSON data) for a store. Call from the event loop.
+    """
+    if _pg_notify_enabled():
+        pg_listen.listen(CHANNEL, _dispatch_message)
+    q: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    with _lock:
+        _subscribers.setdefault(str(store_id), set()).add((asyncio.get_running_loop(), q))
+    return q
+
+
+def unsubscribe(store_id: uuid.UUID, q: asyncio.Queue) -> None:
+    with _lock:
+        subs = _subscribers.get(str(store_id))
+        if not subs:
+            return
+        for entry in [e for e in subs if e[1] is q]:
+            subs.discard(entry)
+        if not subs:
+            _subscribers.pop(str(store_id), None)
+
+
+def _offer(q: asyncio.Queue, item: Tuple[str, str]) -> None:
+    if q.full():
+        q.get_nowait()
+    q.put_nowait(item)
+
+
+def dispatch(store_id: str, kind: str, data: str) -> None:
+    # thread-safe fan-out to this process's subscribers
+    with _lock:
+        subs = list(_subscribers.get(store_id, ()))
+    for loop, q in subs:
+        try:
+            loop.call_soon_threadsafe(_offer, q, (kind, data))
+        except RuntimeError:  # loop closed
+            pass
+
+
+# ---------------------------
+# Publish (transactional)
+# ---------------------------
+def emit_store_event(db: Session, store_id: uuid.UUID, kind: str, data: Dict[str, Any]) -> None:
+    """
+    Queues an event on the session; it is published when the session commits.
+    """
+    message = json.dumps({"store_id": str(store_id), "type": kind, "data": data}, default=str)
+    db.info.setdefault(_PENDING_KEY, []).append(message)
+
+
+@event.listens_for(Session, "before_commit")
+def _notify_before_commit(session: Session) -> None:
+    if not _pg_notify_enabled():
+        return
+    pending = session.info.get(_PENDING_KEY)
+    if not pending:
+        return
+    for message in pending:
+        session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": message})
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or _pg_notify_enabled():
+        return
+    for message in pending:
+        _dispatch_message(message)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _dispatch_message(message: str) -> None:
+    try:
+        doc = json.loads(message)
+    except ValueError:
+        return
+    dispatch(doc["store_id"], doc["type"], json.dumps(doc["data"]))
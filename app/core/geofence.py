@@ -1,16 +1,71 @@
 # app/core/geofence.py
+"""
+Geofence math shared by the timeclock endpoints and geofence reports.
 
+Scalar helpers (`distance_m`, `inside_geofence`, `inside_store_geofence`) are
+used on the clock-in/out path. The batch helpers evaluate many points against
+many store fences at once with NumPy:
+
+  - circle fences: cheap equirectangular distance first, exact haversine only
+    for points that land near the fence edge
+  - polygon fences: bounding-box reject, then vectorized ray casting
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
 from math import radians, sin, cos, sqrt, atan2
+from typing import Iterable, Sequence
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371000.0
+
+# Points whose approximate distance is within this fraction of the radius are
+# re-checked with exact haversine. Equirectangular error at fence scale (< 2km)
+# is far below 1%, so anything outside the band is decided by the fast path.
+PREFILTER_TOLERANCE = 0.01
+
+
+@dataclass(frozen=True)
+class Fence:
+    """
+    A store geofence: a circle (center + radius) or a polygon of (lat, lng) vertices.
+    A polygon takes precedence over the circle when both are set.
+    """
+
+    lat: float | None = None
+    lng: float | None = None
+    radius_m: float = 150.0
+    polygon: tuple[tuple[float, float], ...] | None = None
+
+    @property
+    def is_configured(self) -> bool:
+        if self.polygon:
+            return True
+        return self.lat is not None and self.lng is not None
+
 
+def fence_for_store(store) -> Fence:
+    polygon = getattr(store, "geofence_polygon", None)
+    return Fence(
+        lat=store.geofence_lat,
+        lng=store.geofence_lng,
+        radius_m=float(store.geofence_radius_m or 0),
+        polygon=tuple((float(p[0]), float(p[1])) for p in polygon) if polygon else None,
+    )
 
+
+# ---------------------------
+# Scalar (single point)
+# ---------------------------
 def distance_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     # Haversine distance (meters)
-    r = 6371000.0
     dlat = radians(lat2 - lat1)
     dlng = radians(lng2 - lng1)
     a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return r * c
+    return EARTH_RADIUS_M * c
 
 
 def inside_geofence(
@@ -24,3 +79,134 @@ def inside_geofence(
     if store_lat is None or store_lng is None:
         return True
     return distance_m(user_lat, user_lng, store_lat, store_lng) <= radius_m
+
+
+def inside_store_geofence(store, user_lat: float, user_lng: float) -> bool:
+    fence = fence_for_store(store)
+    if fence.polygon:
+        return bool(contains_batch([user_lat], [user_lng], [fence])[0, 0])
+    return inside_geofence(user_lat, user_lng, fence.lat, fence.lng, fence.radius_m)
+
+
+# ---------------------------
+# Batch (NumPy)
+# ---------------------------
+def haversine_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """
+    Exact great-circle distance in meters. Inputs broadcast like NumPy arrays.
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.asarray(lng2) - np.asarray(lng1))
+
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def equirectangular_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """
+    Fast planar approximation of the distance in meters. Accurate at fence scale,
+    only used to decide points that are clearly inside or clearly outside.
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dlmb = np.radians(np.asarray(lng2) - np.asarray(lng1))
+    # wrap across the antimeridian
+    dlmb = (dlmb + np.pi) % (2 * np.pi) - np.pi
+
+    x = dlmb * np.cos((phi1 + phi2) / 2)
+    y = phi2 - phi1
+    return EARTH_RADIUS_M * np.hypot(x, y)
+
+
+def _as_points(lats: Iterable[float], lngs: Iterable[float]) -> tuple[np.ndarray, np.ndarray]:
+    plat = np.asarray(lats, dtype=np.float64).reshape(-1)
+    plng = np.asarray(lngs, dtype=np.float64).reshape(-1)
+    if plat.shape != plng.shape:
+        raise ValueError("lats and lngs must have the same length")
+    return plat, plng
+
+
+def _circle_arrays(fences: Sequence[Fence]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    flat = np.array([f.lat if f.lat is not None else np.nan for f in fences], dtype=np.float64)
+    flng = np.array([f.lng if f.lng is not None else np.nan for f in fences], dtype=np.float64)
+    frad = np.array([f.radius_m for f in fences], dtype=np.float64)
+    return flat, flng, frad
+
+
+def distance_matrix_m(lats, lngs, fences: Sequence[Fence]) -> np.ndarray:
+    """
+    Exact distance (meters) from every point to every fence center.
+    Shape (points, fences); NaN where the fence has no center.
+    """
+    plat, plng = _as_points(lats, lngs)
+    flat, flng, _ = _circle_arrays(fences)
+    return haversine_m(plat[:, None], plng[:, None], flat[None, :], flng[None, :])
+
+
+def _points_in_polygon(plat: np.ndarray, plng: np.ndarray, polygon: Sequence[tuple[float, float]]) -> np.ndarray:
+    vlat = np.array([v[0] for v in polygon], dtype=np.float64)
+    vlng = np.array([v[1] for v in polygon], dtype=np.float64)
+
+    inside = np.zeros(plat.shape, dtype=bool)
+
+    # bounding box reject before the per-edge work
+    cand = (
+        (plat >= vlat.min()) & (plat <= vlat.max())
+        & (plng >= vlng.min()) & (plng <= vlng.max())
+    )
+    if not cand.any():
+        return inside
+
+    y = plat[cand][:, None]
+    x = plng[cand][:, None]
+
+    y1, x1 = vlat[None, :], vlng[None, :]
+    y2, x2 = np.roll(vlat, -1)[None, :], np.roll(vlng, -1)[None, :]
+
+    # ray casting: count edges crossed by a ray going east from the point
+    straddles = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+    crossings = np.count_nonzero(straddles & (x < x_cross), axis=1)
+
+    inside[cand] = (crossings % 2) == 1
+    return inside
+
+
+def contains_batch(lats, lngs, fences: Sequence[Fence]) -> np.ndarray:
+    """
+    Evaluate many points against many fences.
+    Returns a bool matrix of shape (points, fences).
+
+    Unconfigured fences are fail-open (every point is inside), same as
+    `inside_geofence`.
+    """
+    plat, plng = _as_points(lats, lngs)
+    out = np.ones((plat.size, len(fences)), dtype=bool)
+    if plat.size == 0 or not fences:
+        return out
+
+    circle_idx = [i for i, f in enumerate(fences) if not f.polygon and f.is_configured]
+    if circle_idx:
+        flat, flng, frad = _circle_arrays([fences[i] for i in circle_idx])
+
+        approx = equirectangular_m(plat[:, None], plng[:, None], flat[None, :], flng[None, :])
+        lo = frad * (1 - PREFILTER_TOLERANCE)
+        hi = frad * (1 + PREFILTER_TOLERANCE)
+
+        result = approx <= lo
+        ambiguous = (approx > lo) & (approx <= hi)
+        if ambiguous.any():
+            pi, fi = np.nonzero(ambiguous)
+            exact = haversine_m(plat[pi], plng[pi], flat[fi], flng[fi])
+            result[pi, fi] = exact <= frad[fi]
+
+        out[:, circle_idx] = result
+
+    for i, f in enumerate(fences):
+        if f.polygon:
+            out[:, i] = _points_in_polygon(plat, plng, f.polygon)
+
+    return out
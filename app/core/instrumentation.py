@@ -0,0 +1,256 @@
+# app/core/instrumentation.py
+"""
+Request instrumentation, exported at GET /metrics (app/core/metrics.py) when
+settings.METRICS_TOKEN is set:
+
+  - http_requests_total, http_request_duration_seconds: per route template
+    (e.g. /api/v1/schedules/{store_id}/{week_id}), method and status
+  - http_request_db_queries, http_request_db_seconds: statements executed and
+    time spent in the database per request, from the engine's
+    before/after_cursor_execute hooks
+  - http_n_plus_one_total: requests that ran one statement (literals and
+    bind parameters ignored) more than settings.METRICS_N_PLUS_ONE_THRESHOLD
+    times; each one is also logged with the statement
+
+Profiling: with settings.PROFILE_TOKEN set, a request carrying
+`X-Profile: <token>` is sampled every settings.PROFILE_INTERVAL_SECONDS and
+answered with the profile (text, collapsed stacks for flamegraph.pl or
+speedscope) instead of its body. Sampled threads are the event loop and the
+threadpool workers that run the request's queries.
+
+Statements outside a request (job workers, scripts) are not counted.
+"""
+
+from __future__ import annotations
+
+import collections
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Counter, List, Set, Tuple
+
+from fastapi import Request
+from fastapi.responses import PlainTextResponse, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import COUNT_BUCKETS, counter, histogram, render
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+
+_LABELS = ("method", "route")
+
+REQUESTS = counter("http_requests_total", "HTTP requests handled.", _LABELS + ("status",))
+DURATION = histogram("http_request_duration_seconds", "HTTP request latency until the response starts.", _LABELS)
+DB_QUERIES = histogram("http_request_db_queries", "SQL statements executed per HTTP request.", _LABELS, COUNT_BUCKETS)
+DB_SECONDS = histogram("http_request_db_seconds", "Time spent in SQL statements per HTTP request.", _LABELS)
+N_PLUS_ONE = counter("http_n_plus_one_total", "Requests that repeated one SQL statement past the N+1 threshold.", _LABELS)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=collections.Counter)
+    # set while profiling: threads to sample
+    threads: Set[int] | None = None
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+# ---------------------------
+# SQL hooks
+# ---------------------------
+_PARAMS = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|\b\d+(?:\.\d+)?\b|'(?:[^']|'')*'")
+_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """The statement with literals and parameters as `?` and IN lists collapsed."""
+    s = _PARAMS.sub("?", statement)
+    s = _LISTS.sub("?", s)
+    return _SPACE.sub(" ", s).strip()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    if stats.threads is not None:
+        stats.threads.add(threading.get_ident())
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.db_seconds += time.perf_counter() - started.pop()
+    stats.queries += 1
+    stats.statements[fingerprint(statement)] += 1
+
+
+# ---------------------------
+# Profiler
+# ---------------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    if path.startswith(_ROOT + os.sep):
+        path = os.path.relpath(path, _ROOT)
+    else:
+        path = "/".join(path.split(os.sep)[-2:])
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, threads: Set[int], interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.threads = threads
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter[Tuple[str, ...]] = collections.Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            for tid in list(self.threads):
+                frame = frames.get(tid)
+                if frame is None:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def report(self, title: str, stats: RequestStats, elapsed: float) -> str:
+        self_time: Counter[str] = collections.Counter()
+        for stack, n in self.stacks.items():
+            self_time[stack[-1]] += n
+
+        lines = [
+            f"# {title}",
+            f"# wall {elapsed * 1000:.1f} ms, {stats.queries} queries, db {stats.db_seconds * 1000:.1f} ms, "
+            f"{self.samples} samples every {self.interval * 1000:g} ms",
+            "#",
+            "# top frames by own samples",
+        ]
+        for label, n in self_time.most_common(15):
+            lines.append(f"#   {n:6d}  {label}")
+        lines.append("#")
+        lines.append("# top statements")
+        for stmt, n in stats.statements.most_common(5):
+            lines.append(f"#   {n:6d}  {stmt[:200]}")
+        lines.append("#")
+        lines.append("# collapsed stacks: frame;frame;... samples")
+        for stack, n in self.stacks.most_common():
+            lines.append(f"{';'.join(stack)} {n}")
+        return "\n".join(lines) + "\n"
+
+
+def _profile_requested(request: Request) -> bool:
+    token = settings.PROFILE_TOKEN
+    sent = request.headers.get(PROFILE_HEADER)
+    return bool(token) and sent is not None and hmac.compare_digest(sent.encode(), token.encode())
+
+
+# ---------------------------
+# Middleware
+# ---------------------------
+def _route_label(request: Request) -> str:
+    route = request.scope.get("route")
+    # unmatched paths share one label, so scanners cannot grow the series
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _record(request: Request, status: int, stats: RequestStats, elapsed: float) -> None:
+    labels = {"method": request.method, "route": _route_label(request)}
+    REQUESTS.inc(status=str(status), **labels)
+    DURATION.observe(elapsed, **labels)
+    DB_QUERIES.observe(stats.queries, **labels)
+    DB_SECONDS.observe(stats.db_seconds, **labels)
+
+    if stats.statements:
+        statement, n = stats.statements.most_common(1)[0]
+        if n > settings.METRICS_N_PLUS_ONE_THRESHOLD:
+            N_PLUS_ONE.inc(**labels)
+            logger.warning(
+                "possible N+1 in %s %s: %d of %d statements were %s",
+                labels["method"], labels["route"], n, stats.queries, statement[:300],
+            )
+
+
+async def instrument_requests(request: Request, call_next):
+    if not settings.METRICS_ENABLED:
+        return await call_next(request)
+
+    stats = RequestStats()
+    sampler = None
+    if _profile_requested(request):
+        stats.threads = {threading.get_ident()}
+        sampler = _Sampler(stats.threads, settings.PROFILE_INTERVAL_SECONDS)
+        sampler.start()
+
+    token = _current.set(stats)
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        if sampler is not None and not response.headers.get("content-type", "").startswith("text/event-stream"):
+            # run the endpoint to the end; the profile replaces the body
+            async for _ in response.body_iterator:
+                pass
+    finally:
+        elapsed = time.perf_counter() - started
+        _current.reset(token)
+        if sampler is not None:
+            sampler.stop()
+        _record(request, status, stats, elapsed)
+
+    if sampler is None or response.headers.get("content-type", "").startswith("text/event-stream"):
+        return response
+
+    title = f"{request.method} {request.url.path} -> {status}"
+    return PlainTextResponse(sampler.report(title, stats, elapsed), headers={"X-Profile-Status": str(status)})
+
+
+def metrics_response(request: Request) -> Response:
+    """GET /metrics: needs `Authorization: Bearer <settings.METRICS_TOKEN>`; 404 without a token configured."""
+    token = settings.METRICS_TOKEN
+    if not settings.METRICS_ENABLED or not token:
+        return PlainTextResponse("Not Found", status_code=404)
+    sent = request.headers.get("authorization", "")
+    if not hmac.compare_digest(sent.encode(), f"Bearer {token}".encode()):
+        return PlainTextResponse("Unauthorized", status_code=401)
+
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
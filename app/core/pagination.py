@@ -0,0 +1,201 @@
+# app/core/pagination.py
+"""
+Shared keyset pagination for list endpoints.
+
+    @router.get("", response_model=list[ThingOut])
+    def list_things(response: Response, page: PageParams = Depends(page_params), ...):
+        stmt = select(...).where(...)
+        return paginate(db, stmt, order_by=(Thing.code, Thing.id), page=page, response=response)
+
+The response body stays a plain list. Paging info travels in headers:
+  - X-Next-Cursor: pass back as ?cursor= to get the next page (absent on the last page)
+  - X-Total-Count: exact row count (?count=exact)
+  - X-Estimated-Count: planner estimate, no scan (?count=estimate)
+
+Cursors encode the sort key of the last row, so pages stay stable and cheap
+(an index range scan) no matter how deep the client pages. The last order_by
+column must be unique (the primary key) to break ties.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Literal, Sequence
+
+from fastapi import Depends, HTTPException, Query, Response
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db
+from app.models.week import Week
+from app.services.week_service import get_current_and_next_week
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+CountMode = Literal["none", "estimate", "exact"]
+
+
+@dataclass
+class PageParams:
+    limit: int = DEFAULT_LIMIT
+    cursor: str | None = None
+    count: CountMode = "none"
+
+
+def page_params(
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: str | None = Query(None),
+    count: CountMode = Query("none"),
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor, count=count)
+
+
+@dataclass
+class DateRange:
+    date_from: date | None = None
+    date_to: date | None = None
+    # set when the range was given as ?week_id=
+    week_id: uuid.UUID | None = None
+
+
+def date_range_params(
+    date_from: date | None = Query(None),
+    date_to: date | None = Query(None),
+) -> DateRange:
+    if date_from and date_to and date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must be >= date_from")
+    return DateRange(date_from=date_from, date_to=date_to)
+
+
+def week_scope_params(
+    week_id: uuid.UUID | None = Query(None),
+    dates: DateRange = Depends(date_range_params),
+    db: Session = Depends(get_db),
+) -> DateRange:
+    """
+    Date scope for per-week data: ?week_id=, or ?date_from=/?date_to=,
+    defaulting to the current and next week so payloads do not grow with
+    account age.
+    """
+    if week_id is not None:
+        wk = db.query(Week.week_start, Week.week_end).filter(Week.id == week_id).first()
+        if not wk:
+            raise HTTPException(status_code=404, detail="Week not found")
+        return DateRange(date_from=wk.week_start, date_to=wk.week_end, week_id=week_id)
+
+    if dates.date_from is None and dates.date_to is None:
+        start, end = get_current_and_next_week()
+        return DateRange(date_from=start, date_to=end)
+
+    return dates
+
+
+# ---------------------------
+# Cursor encoding
+# ---------------------------
+def _encode_value(v: Any) -> Any:
+    if isinstance(v, uuid.UUID):
+        return str(v)
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    return v
+
+
+def _decode_value(raw: Any, col) -> Any:
+    if raw is None:
+        return None
+    try:
+        py = col.type.python_type
+    except NotImplementedError:
+        return raw
+    if py is uuid.UUID:
+        return uuid.UUID(raw)
+    if py is datetime:
+        return datetime.fromisoformat(raw)
+    if py is date:
+        return date.fromisoformat(raw)
+    return py(raw)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Sequence) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError
+        return [_decode_value(v, col) for v, col in zip(values, order_by)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ---------------------------
+# Counts
+# ---------------------------
+def estimated_count(db: Session, stmt) -> int:
+    # planner row estimate of the filtered query: no scan
+    # filter values stay bound parameters; only the SQL text is spliced in
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True})
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def exact_count(db: Session, stmt) -> int:
+    return int(db.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar() or 0)
+
+
+# ---------------------------
+# Paginate
+# ---------------------------
+def _is_entity_select(stmt) -> bool:
+    desc = stmt.column_descriptions
+    return len(desc) == 1 and isinstance(desc[0]["expr"], type)
+
+
+def paginate(
+    db: Session,
+    stmt,
+    *,
+    order_by: Sequence,
+    page: PageParams,
+    response: Response,
+) -> List:
+    """
+    Applies ordering, the cursor and the limit to `stmt` (ascending keyset)
+    and sets the paging headers. Returns ORM entities for `select(Model)`,
+    Row tuples otherwise. Every order_by column must be readable from the
+    result by its key.
+    """
+    if page.count == "exact":
+        response.headers["X-Total-Count"] = str(exact_count(db, stmt))
+    elif page.count == "estimate":
+        response.headers["X-Estimated-Count"] = str(estimated_count(db, stmt))
+
+    if page.cursor:
+        after = decode_cursor(page.cursor, order_by)
+        stmt = stmt.where(
+            tuple_(*order_by) > tuple_(*[literal(v, col.type) for v, col in zip(after, order_by)])
+        )
+
+    stmt = stmt.order_by(*[col.asc() for col in order_by]).limit(page.limit + 1)
+
+    result = db.execute(stmt)
+    rows = result.scalars().all() if _is_entity_select(stmt) else result.all()
+
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor([getattr(last, col.key) for col in order_by])
+
+    return rows
@@ -0,0 +1,121 @@
+# app/core/pg_listen.py
+"""
+One Postgres LISTEN connection per process, shared by every NOTIFY consumer
+(store events, cache change feed).
+
+    pg_listen.listen("channel", handler, on_reconnect=callback)
+
+Handlers receive the payload string and run on the listener thread; keep them
+short. The thread starts on the first listen() call. If the connection drops,
+it reconnects, re-LISTENs every channel and calls each on_reconnect callback:
+notifications sent while disconnected are lost, so consumers with state
+derived from them must resync. `connected()` tells whether notifications are
+currently being received.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import threading
+import time
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], None]
+
+_handlers: Dict[str, Handler] = {}
+_on_reconnect: List[Callable[[], None]] = []
+_lock = threading.Lock()
+
+_started = False
+_connected = threading.Event()
+# wakes the listener when a channel is added after it started
+_wake_r, _wake_w = os.pipe()
+
+
+def connected() -> bool:
+    return _connected.is_set()
+
+
+def listen(channel: str, handler: Handler, *, on_reconnect: Callable[[], None] | None = None) -> None:
+    """
+    Routes NOTIFYs on `channel` to `handler`. Idempotent per channel.
+    """
+    global _started
+    with _lock:
+        if channel in _handlers:
+            return
+        _handlers[channel] = handler
+        if on_reconnect is not None:
+            _on_reconnect.append(on_reconnect)
+        start = not _started
+        _started = True
+    if start:
+        threading.Thread(target=_listen_forever, name="pg-listener", daemon=True).start()
+    else:
+        os.write(_wake_w, b"x")
+
+
+def _listen_forever() -> None:
+    from app.db.session import engine
+
+    first = True
+    while True:
+        conn = None
+        try:
+            raw = engine.raw_connection()
+            conn = raw.driver_connection
+            raw.detach()  # dedicated connection, never returned to the pool
+            conn.autocommit = True
+
+            listening: set[str] = set()
+            while True:
+                with _lock:
+                    channels = set(_handlers) - listening
+                if channels:
+                    with conn.cursor() as cur:
+                        for ch in channels:
+                            cur.execute(f'LISTEN "{ch}"')
+                    listening |= channels
+
+                if not _connected.is_set():
+                    _connected.set()
+                    if not first:
+                        _resync()
+                    first = False
+
+                ready, _, _ = select.select([conn, _wake_r], [], [], 30)
+                if _wake_r in ready:
+                    os.read(_wake_r, 64)
+                if conn in ready:
+                    conn.poll()
+                    while conn.notifies:
+                        n = conn.notifies.pop(0)
+                        handler = _handlers.get(n.channel)
+                        if handler is not None:
+                            try:
+                                handler(n.payload)
+                            except Exception:
+                                logger.exception("NOTIFY handler for %s failed", n.channel)
+        except Exception:
+            logger.exception("Postgres listener failed; reconnecting")
+            _connected.clear()
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            time.sleep(1)
+
+
+def _resync() -> None:
+    with _lock:
+        callbacks = list(_on_reconnect)
+    for cb in callbacks:
+        try:
+            cb()
+        except Exception:
+            logger.exception("listener reconnect callback failed")
@@ -0,0 +1,62 @@
+# app/core/responses.py
+"""
+Opt-in fast JSON responses (settings.FAST_JSON).
+
+When enabled and orjson is installed:
+  - ORJSONResponse is the app's default response class
+  - list endpoints that build plain dicts from column rows can return
+    `rows_response(...)`, which encodes them directly with orjson and skips
+    response_model validation + jsonable_encoder
+
+Output matches the pydantic encoding: UUIDs as strings, dates ISO 8601,
+UTC datetimes with a trailing "Z".
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z if orjson is not None else 0
+
+
+def fast_json_enabled() -> bool:
+    return bool(settings.FAST_JSON) and orjson is not None
+
+
+def default_response_class() -> type[Response]:
+    return ORJSONResponse if fast_json_enabled() else JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def rows_response(
+    rows: Iterable[Mapping[str, Any]],
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    Serializes row mappings (e.g. `db.execute(select(...)).mappings()`) as a
+    JSON array. Only call when fast_json_enabled().
+    """
+    return Response(
+        content=dumps([dict(r) for r in rows]),
+        status_code=status_code,
+        headers=dict(headers) if headers else None,
+        media_type="application/json",
+    )
+
+
+def json_bytes_response(content: Any, status_code: int = 200) -> Response:
+    return Response(content=dumps(content), status_code=status_code, media_type="application/json")
+
@@ -0,0 +1,19 @@
+# app/db/projection.py
+
+from __future__ import annotations
+
+from typing import Type
+
+from pydantic import BaseModel
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> tuple:
+    """
+    Model columns for the fields of an output schema, in schema order.
+
+    `select(*schema_columns(User, UserOut))` loads plain Row tuples (no ORM
+    hydration, no identity map) that the response_model validates by
+    attribute, or that rows_response() encodes directly.
+    """
+    table_cols = model.__table__.c
+    return tuple(getattr(model, name) for name in schema.model_fields if name in table_cols)
@@ -3,8 +3,14 @@ from app.api.api_v1.api import api_router
 from app.core.config import settings
 from jose import jwt, JWTError
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.responses import default_response_class
+from app.core.instrumentation import instrument_requests, metrics_response
 
-app = FastAPI(title="Shift Management API", version="0.1.0")
+app = FastAPI(
+    title="Shift Management API",
+    version="0.1.0",
+    default_response_class=default_response_class(),
+)
 
 # ---------------------------
 # MUST CHANGE PASSWORD GUARD
@@ -45,6 +51,13 @@ async def must_change_password_guard(request: Request, call_next):
     return await call_next(request)
 
 
+# ---------------------------
+# METRICS / PROFILING (wraps the guard above and the routes; CORS, added
+# below, is outermost, so preflights it answers itself are not counted)
+# ---------------------------
+app.middleware("http")(instrument_requests)
+
+
 # ---------------------------
 # ROUTES
 # ---------------------------
@@ -61,6 +74,11 @@ def health():
     return {"ok": True}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    return metrics_response(request)
+
+
 
 # ---------------------------
 # CORS (required for web apps)
@@ -83,4 +101,6 @@ app.add_middleware(
     allow_credentials=False,  # keep false for simple + reliable browser behavior
     allow_methods=["*"],
     allow_headers=["*"],
+    # browsers hide response headers outside the safelist unless exposed
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Estimated-Count", "Location"],
 )
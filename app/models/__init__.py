@@ -5,12 +5,19 @@ from app.models.store import Store
 from app.models.membership import StoreMembership
 from app.models.week import Week
 from app.models.schedule import Schedule, Shift, ShiftAssignment
+from app.models.schedule_snapshot import ScheduleSnapshot
 from app.models.timeentry import TimeEntry
+from app.models.timeentry_weekly_agg import TimeEntryWeeklyAgg
 from app.models.tenant import Tenant
 # NEW
 from app.models.availability import Availability
+from app.models.availability_pattern import AvailabilityPattern
 from app.models.leave_request import LeaveRequest
 from app.models.payroll_invoice import PayrollInvoice
+from app.models.week_report_cache import WeekReportCache
+from app.models.week_archive import WeekArchive
+from app.models.job import Job
+from app.models.gap_fill_result import GapFillResult
 
 __all__ = [
     "Base",
@@ -21,11 +28,18 @@ __all__ = [
     "Schedule",
     "Shift",
     "ShiftAssignment",
+    "ScheduleSnapshot",
     "TimeEntry",
+    "TimeEntryWeeklyAgg",
     "Availability",
+    "AvailabilityPattern",
     "LeaveRequest",
     "Tenant",
     "PayrollInvoice",
+    "WeekReportCache",
+    "WeekArchive",
+    "Job",
+    "GapFillResult",
 ]
 
 
@@ -0,0 +1,51 @@
+import uuid
+from datetime import datetime, date, time
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, SmallInteger, Time
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class AvailabilityPattern(Base):
+    """
+    Recurring availability: every `weekday` between effective_from and
+    effective_to (inclusive, open-ended when null), from start_time to
+    end_time in the store's local time. end_time <= start_time runs past
+    midnight.
+
+    Never materialized into `availability` rows; expanded per week on demand
+    (app/services/availability_service.py). An `availability` row for the same
+    employee/store/day overrides the pattern for that day.
+    """
+    __tablename__ = "availability_patterns"
+    __table_args__ = (
+        Index("ix_availability_patterns_store_employee", "store_id", "employee_id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    employee_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    store_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("stores.id", ondelete="CASCADE"), nullable=False
+    )
+
+    # 0 = Monday ... 6 = Sunday (date.weekday())
+    weekday: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    # store-local wall clock
+    start_time: Mapped[time] = mapped_column(Time, nullable=False)
+    end_time: Mapped[time] = mapped_column(Time, nullable=False)
+
+    effective_from: Mapped[date] = mapped_column(Date, nullable=False)
+    effective_to: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
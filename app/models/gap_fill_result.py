@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class GapFillResult(Base):
+    """
+    Latest gap-fill suggestions for a store + week + request parameters,
+    computed against `schedule_version`. Served as long as the schedule's
+    version still matches; overwritten by the next run.
+    """
+    __tablename__ = "gap_fill_results"
+    __table_args__ = (
+        UniqueConstraint("store_id", "week_id", "params_key", name="uq_gap_fill_results_store_week_params"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    week_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+
+    # hash of the request parameters (role, max_suggestions_per_shift, use_groq)
+    params_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    schedule_version: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # AiGapFillResponse JSON
+    result: Mapped[Any] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
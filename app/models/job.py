@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class Job(Base):
+    """
+    Durable background job (app/services/jobs.py).
+
+    queued -> running -> succeeded | failed. A failed attempt goes back to
+    queued with a later run_after until max_attempts is reached. Workers claim
+    queued rows with FOR UPDATE SKIP LOCKED and refresh heartbeat_at while
+    running; a running job whose heartbeat goes stale is requeued.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index(
+            "ix_jobs_queued_run_after",
+            "run_after",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index("ix_jobs_tenant_status", "tenant_id", "status"),
+        Index("ix_jobs_created_by_created_at", "created_by", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # handler name, e.g. "payroll.generate_invoices"
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # concurrency is limited per tenant; null for platform-level jobs
+    tenant_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    created_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    # queued | running | succeeded | failed
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued", server_default="queued")
+
+    params: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    result: Mapped[Any | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    progress_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    progress_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    progress_message: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3, server_default="3")
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    locked_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
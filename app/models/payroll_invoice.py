@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, Date, DateTime, String, Numeric, Boolean, Integer, BigInteger
+from sqlalchemy import Column, Date, DateTime, String, Numeric, Boolean, Integer, BigInteger, FetchedValue, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -8,6 +8,10 @@ from app.models.base import Base
 
 class PayrollInvoice(Base):
     __tablename__ = "payroll_invoices"
+    __table_args__ = (
+        # one invoice per employee per store per week (migrations 003/004)
+        UniqueConstraint("store_id", "employee_id", "week_start", name="uq_invoice_store_emp_week"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -17,8 +21,8 @@ class PayrollInvoice(Base):
 
     week_start = Column(Date, nullable=False, index=True)
 
-    # DB: bigint with sequence default
-    invoice_no = Column(BigInteger, nullable=False, index=True)
+    # DB: bigint with sequence default (never sent by the ORM)
+    invoice_no = Column(BigInteger, nullable=False, index=True, server_default=FetchedValue())
 
     pay_rate_hourly = Column(Numeric(10, 2), nullable=False, default=0)
 
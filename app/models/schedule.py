@@ -41,6 +41,9 @@ class Schedule(Base):
 
     is_published: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
+    # bumped by every change that affects derived results (cost forecast, gap-fill)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=datetime.utcnow,
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class ScheduleSnapshot(Base):
+    """
+    Rendered document of a published schedule (shifts and assignments).
+    Written on publish, deleted on unpublish.
+    """
+    __tablename__ = "schedule_snapshots"
+    __table_args__ = (
+        UniqueConstraint("store_id", "week_id", name="uq_schedule_snapshots_store_week"),
+    )
+
+    schedule_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("schedules.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    store_id = Column(UUID(as_uuid=True), nullable=False)
+    week_id = Column(UUID(as_uuid=True), nullable=False)
+
+    # ready-to-send response bodies
+    json_body = Column(LargeBinary, nullable=False)
+    msgpack_body = Column(LargeBinary, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
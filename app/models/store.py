@@ -1,6 +1,6 @@
 import uuid
 from sqlalchemy import Column, String, Boolean, Float, Integer, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from app.models.base import Base
 
@@ -25,4 +25,7 @@ class Store(Base):
     geofence_lng = Column(Float, nullable=True)
     geofence_radius_m = Column(Integer, nullable=False, default=150)
 
+    # optional polygon fence: [[lat, lng], ...] (takes precedence over the circle)
+    geofence_polygon = Column(JSONB, nullable=True)
+
     is_active = Column(Boolean, default=True, nullable=False)
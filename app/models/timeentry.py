@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Boolean, Integer
+from sqlalchemy import DateTime, ForeignKey, Boolean, Integer, Float
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -32,6 +32,10 @@ class TimeEntry(Base):
     clock_in_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     clock_out_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # where the employee clocked in (used by geofence compliance reports)
+    clock_in_lat: Mapped[float | None] = mapped_column(Float, nullable=True)
+    clock_in_lng: Mapped[float | None] = mapped_column(Float, nullable=True)
+
     out_of_zone_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     is_out_of_zone: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
@@ -0,0 +1,32 @@
+# app/models/timeentry_weekly_agg.py
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class TimeEntryWeeklyAgg(Base):
+    """
+    Running totals of time_entries per store + week + employee.
+    Maintained on clock-in / clock-out / out-of-zone ping and rebuildable
+    from time_entries (see app/services/time_entry_agg.py).
+    """
+    __tablename__ = "time_entry_weekly_agg"
+
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    week_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, index=True)
+    employee_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+
+    # closed entries only, floor(minutes) per entry
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # entries without clock-out
+    open_entries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    out_of_zone_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
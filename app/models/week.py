@@ -23,8 +23,15 @@ class Week(Base):
     # Friday date (YYYY-MM-DD)
     week_start = Column(Date, nullable=False)
 
+    # Thursday date (YYYY-MM-DD)
+    week_end = Column(Date, nullable=False)
+
     # Lock state (admin controls)
     is_locked = Column(Boolean, nullable=False, default=False)
+    locked_at = Column(DateTime, nullable=True)
+
+    # Set once the week's rows were moved to week_archives (read-only from then on)
+    archived_at = Column(DateTime(timezone=True), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
@@ -0,0 +1,31 @@
+import uuid
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class WeekArchive(Base):
+    """
+    Cold copy of one store + locked week, moved out of the hot tables.
+    `payload` is zlib-compressed JSON (see app/services/week_archive.py).
+    """
+    __tablename__ = "week_archives"
+    __table_args__ = (
+        UniqueConstraint("store_id", "week_id", name="uq_week_archives_store_week"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    store_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    week_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+
+    format_version = Column(Integer, nullable=False, default=1)
+    payload = Column(LargeBinary, nullable=False)
+
+    # rows archived per table, e.g. {"shifts": 12, "time_entries": 80}
+    row_counts = Column(JSONB, nullable=False)
+
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,31 @@
+import uuid
+
+from sqlalchemy import Column, String, DateTime, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+
+
+class WeekReportCache(Base):
+    """
+    Computed report payload for one store + week.
+    Only written once the week is locked (data no longer changes).
+    Unlocking the week drops its rows.
+    """
+    __tablename__ = "week_report_cache"
+    __table_args__ = (
+        UniqueConstraint("report_kind", "store_id", "week_id", name="uq_week_report_cache_kind_store_week"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # geofence | ...
+    report_kind = Column(String(32), nullable=False)
+
+    store_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    week_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+
+    payload = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,5 +1,5 @@
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, time
 from pydantic import BaseModel, Field
 
 
@@ -12,6 +12,11 @@ class AvailabilityUpsert(BaseModel):
     available_end_at: datetime | None = None
 
 
+class AvailabilityBulkUpsert(BaseModel):
+    # one or more weeks of day windows, applied all-or-nothing
+    items: list[AvailabilityUpsert] = Field(..., min_length=1, max_length=366)
+
+
 class AvailabilityOut(BaseModel):
     id: uuid.UUID
     employee_id: uuid.UUID
@@ -26,3 +31,34 @@ class AvailabilityOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AvailabilityPatternCreate(BaseModel):
+    store_id: uuid.UUID
+    # 0 = Monday ... 6 = Sunday
+    weekday: int = Field(..., ge=0, le=6)
+
+    # store-local; end_time <= start_time runs past midnight
+    start_time: time
+    end_time: time
+
+    effective_from: date
+    effective_to: date | None = None
+
+
+class AvailabilityPatternOut(BaseModel):
+    id: uuid.UUID
+    employee_id: uuid.UUID
+    store_id: uuid.UUID
+    weekday: int
+
+    start_time: time
+    end_time: time
+
+    effective_from: date
+    effective_to: date | None
+
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class JobOut(BaseModel):
+    id: uuid.UUID
+    kind: str
+    # queued | running | succeeded | failed
+    status: str
+
+    progress_done: int
+    progress_total: int | None = None
+    progress_message: str | None = None
+
+    # handler output once succeeded
+    result: Any | None = None
+    # last failure (also set while a retry is pending)
+    error: str | None = None
+
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
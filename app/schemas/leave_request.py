@@ -13,6 +13,20 @@ class LeaveRequestCreate(BaseModel):
 class LeaveDecision(BaseModel):
     # approved | rejected
     status: str = Field(pattern="^(approved|rejected)$")
+    # on approval: remove the employee's conflicting assignments (not in locked weeks)
+    unassign_conflicts: bool = False
+
+
+class LeaveBulkDecisionItem(BaseModel):
+    id: uuid.UUID
+    # approved | rejected
+    status: str = Field(pattern="^(approved|rejected)$")
+    # on approval: remove the employee's conflicting assignments (not in locked weeks)
+    unassign_conflicts: bool = False
+
+
+class LeaveBulkDecision(BaseModel):
+    items: list[LeaveBulkDecisionItem] = Field(..., min_length=1, max_length=1000)
 
 
 class LeaveRequestOut(BaseModel):
@@ -30,3 +44,33 @@ class LeaveRequestOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class LeaveConflictOut(BaseModel):
+    assignment_id: uuid.UUID
+    shift_id: uuid.UUID
+    schedule_id: uuid.UUID
+    week_id: uuid.UUID
+    role: str
+    start_at: datetime
+    end_at: datetime
+    is_published: bool
+    week_locked: bool
+    unassigned: bool = False
+
+    class Config:
+        from_attributes = True
+
+
+class LeaveDecisionOut(LeaveRequestOut):
+    # approved requests: the employee's shift assignments overlapping the leave
+    conflicts: list[LeaveConflictOut] = []
+
+
+class LeaveBulkDecisionResult(BaseModel):
+    id: uuid.UUID
+    # approved | rejected | not_found | forbidden | already_decided | duplicate
+    outcome: str
+    leave_request: LeaveRequestOut | None = None
+    # approved items: the employee's shift assignments overlapping the leave
+    conflicts: list[LeaveConflictOut] = []
@@ -9,9 +9,45 @@ class EmployeePayrollLine(BaseModel):
     out_of_zone_seconds: int
     open_entries: int  # missed clock-out count
 
+    # computed with the same rules as invoices (40h regular, 1.5x overtime)
+    regular_minutes: int = 0
+    overtime_minutes: int = 0
+    pay_rate_hourly: float = 0
+    gross_pay: float = 0
+    tax_withheld: float = 0
+    net_pay: float = 0
+
 
 class StoreWeekPayrollSummary(BaseModel):
     store_id: uuid.UUID
     week_start: str  # ISO date string
     week_end: str    # ISO date string
     lines: List[EmployeePayrollLine]
+
+
+class ScheduleCostLine(BaseModel):
+    employee_id: uuid.UUID
+    shifts: int
+    scheduled_minutes: int
+
+    # same rules as invoices (40h regular, 1.5x overtime)
+    regular_minutes: int
+    overtime_minutes: int
+    pay_rate_hourly: float
+    gross_pay: float
+    tax_withheld: float
+    net_pay: float
+
+
+class ScheduleCostForecast(BaseModel):
+    schedule_id: uuid.UUID
+    version: int
+
+    scheduled_minutes: int
+    regular_minutes: int
+    overtime_minutes: int
+    gross_pay: float
+    tax_withheld: float
+    net_pay: float
+
+    lines: List[ScheduleCostLine]
@@ -0,0 +1,93 @@
+import uuid
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class EdgeClockIn(BaseModel):
+    time_entry_id: uuid.UUID
+    store_id: uuid.UUID
+    employee_id: uuid.UUID
+    clock_in_at: datetime
+    distance_m: Optional[float] = None  # None for polygon fences
+    radius_ratio: Optional[float] = None  # distance / radius (circle fences)
+    inside: bool
+
+
+class EmployeeGeofenceLine(BaseModel):
+    store_id: uuid.UUID
+    employee_id: uuid.UUID
+    entries: int
+    out_of_zone_seconds: int
+    edge_clock_ins: int
+    outside_clock_ins: int
+    is_outlier: bool
+
+
+class StoreGeofenceLine(BaseModel):
+    store_id: uuid.UUID
+    store_code: Optional[str] = None
+    employees: int
+    entries: int
+    out_of_zone_seconds: int
+    edge_clock_ins: int
+    outside_clock_ins: int
+
+    # distribution of per-employee out-of-zone seconds
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    outlier_threshold_seconds: float
+
+
+class GeofenceComplianceReport(BaseModel):
+    start_date: date
+    end_date: date
+    week_starts: List[date]
+    stores: List[StoreGeofenceLine]
+    employees: List[EmployeeGeofenceLine]
+    edge_clock_ins: List[EdgeClockIn]
+
+
+class EmployeeVarianceLine(BaseModel):
+    store_id: uuid.UUID
+    employee_id: uuid.UUID
+    scheduled_shifts: int
+    scheduled_minutes: int
+    worked_entries: int
+    worked_minutes: int
+    no_shows: int
+    late_count: int
+    late_minutes: int
+    early_leave_count: int
+    early_leave_minutes: int
+    unscheduled_entries: int
+    unscheduled_minutes: int
+    drift_minutes: int  # worked - scheduled
+
+
+class StoreVarianceLine(BaseModel):
+    store_id: uuid.UUID
+    store_code: Optional[str] = None
+    employees: int
+    scheduled_shifts: int
+    scheduled_minutes: int
+    worked_entries: int
+    worked_minutes: int
+    no_shows: int
+    late_count: int
+    late_minutes: int
+    early_leave_count: int
+    early_leave_minutes: int
+    unscheduled_entries: int
+    unscheduled_minutes: int
+    drift_minutes: int
+
+
+class VarianceReport(BaseModel):
+    week_start: date
+    week_end: date
+    stores: List[StoreVarianceLine]
+    employees: List[EmployeeVarianceLine]
@@ -55,3 +55,26 @@ class ShiftAssignRequest(BaseModel):
 
 class PublishScheduleRequest(BaseModel):
     is_published: bool
+
+
+class ScheduleViolationOut(BaseModel):
+    # overlap | on_leave | overstaffed | outside_availability | weekly_hours | understaffed
+    code: str
+    # error | warning
+    severity: str
+    message: str
+    shift_id: uuid.UUID | None = None
+    employee_id: uuid.UUID | None = None
+    assignment_id: uuid.UUID | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class ScheduleValidationOut(BaseModel):
+    schedule_id: uuid.UUID
+    # no errors (warnings allowed)
+    valid: bool
+    errors: int
+    warnings: int
+    violations: list[ScheduleViolationOut] = []
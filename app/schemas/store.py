@@ -1,5 +1,5 @@
 import uuid
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class StoreCreate(BaseModel):
@@ -11,6 +11,21 @@ class StoreCreate(BaseModel):
     geofence_lng: float | None = None
     geofence_radius_m: int = Field(default=150, ge=20, le=2000)
 
+    # optional polygon fence as [[lat, lng], ...]; overrides the circle when set
+    geofence_polygon: list[tuple[float, float]] | None = None
+
+    @field_validator("geofence_polygon")
+    @classmethod
+    def _validate_polygon(cls, v):
+        if v is None:
+            return v
+        if len(v) < 3:
+            raise ValueError("geofence_polygon needs at least 3 vertices")
+        for lat, lng in v:
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise ValueError("geofence_polygon vertex out of range")
+        return v
+
 
 class StoreOut(BaseModel):
     id: uuid.UUID
@@ -21,6 +36,7 @@ class StoreOut(BaseModel):
     geofence_lat: float | None
     geofence_lng: float | None
     geofence_radius_m: int
+    geofence_polygon: list[tuple[float, float]] | None = None
 
     is_active: bool
 
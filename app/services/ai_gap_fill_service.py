@@ -1,19 +1,50 @@
+"""
+Gap-fill suggestions: candidates for every under-staffed shift of a store's
+week schedule, optionally reranked by Groq.
+
+Runs as the "ai.gap_fill" background job (POST /ai/gap-fill answers 202).
+All database work is sync (plan_gap_fill) and runs in a thread; only the Groq
+calls run on the event loop, a few shifts at a time, with progress reported
+per shift.
+
+Results are stored per (store, week, request parameters) together with the
+schedule version they were computed from, and served as-is while the version
+still matches (and for at most GAP_FILL_RESULT_MAX_AGE_SECONDS, since
+availability and leave changes do not bump the version).
+"""
+
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import uuid
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
 
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session, selectinload
 
+from app.core.config import settings
+from app.models.gap_fill_result import GapFillResult
+from app.models.job import Job
 from app.models.schedule import Schedule, Shift
 from app.models.membership import StoreMembership
-from app.models.availability import Availability
 from app.models.leave_request import LeaveRequest
 from app.models.week import Week
+from app.schemas.ai_schedule import AiGapFillResponse, AiGapSuggestion
+from app.services.availability_service import week_availability_windows
 from app.services.groq_client import GroqClient
+from app.services.jobs import JobContext, JobError, job_handler
+
+JOB_KIND = "ai.gap_fill"
+
+# Groq calls in flight per job
+RERANK_CONCURRENCY = 4
+
+NO_SCHEDULE_NOTE = "No schedule exists yet. Create schedule first, then run gap-fill."
 
 
 @dataclass
@@ -22,6 +53,25 @@ class Gap:
     needed: int
 
 
+@dataclass
+class ShiftPlan:
+    shift_id: uuid.UUID
+    role: str
+    start: datetime
+    end: datetime
+    needed: int
+    # eligible employees, fewest existing assignments first
+    candidates: List[uuid.UUID]
+
+
+@dataclass
+class GapFillPlan:
+    shifts: List[ShiftPlan] = field(default_factory=list)
+    assignment_count: Dict[uuid.UUID, int] = field(default_factory=dict)
+    # set when there is nothing to suggest
+    note: str | None = None
+
+
 def _overlaps(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
     return a_start < b_end and b_start < a_end
 
@@ -32,15 +82,16 @@ def _dt_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
-async def build_gap_suggestions(
+def plan_gap_fill(
     db: Session,
     *,
     store_id: uuid.UUID,
     week_id: uuid.UUID,
     role_filter: str | None,
-    max_suggestions_per_shift: int,
-    use_groq: bool,
-) -> Tuple[List[Dict], str]:
+) -> GapFillPlan:
+    """
+    Every database read of a gap-fill run: gaps and their eligible candidates.
+    """
     wk = db.query(Week).filter(Week.id == week_id).first()
     if not wk:
         raise ValueError("Week not found")
@@ -53,7 +104,7 @@ async def build_gap_suggestions(
     )
 
     if not sched:
-        return ([], "No schedule exists yet. Create schedule first, then run gap-fill.")
+        return GapFillPlan(note=NO_SCHEDULE_NOTE)
 
     shifts: List[Shift] = list(sched.shifts or [])
 
@@ -69,7 +120,7 @@ async def build_gap_suggestions(
             gaps.append(Gap(shift_id=sh.id, needed=needed))
 
     if not gaps:
-        return ([], "No gaps found. All shifts are already filled.")
+        return GapFillPlan(note="No gaps found. All shifts are already filled.")
 
     # Eligible employees in this store (employee memberships only)
     emp_rows = (
@@ -83,33 +134,16 @@ async def build_gap_suggestions(
     )
     employee_ids = [r.user_id for r in emp_rows]
     if not employee_ids:
-        return ([], "No employees assigned to this store.")
+        return GapFillPlan(note="No employees assigned to this store.")
 
-    # Availability for that store+week (STRICT: must exist AND cover shift)
-    av_rows = (
-        db.query(Availability)
-        .filter(
-            Availability.store_id == store_id,
-            Availability.week_id == week_id,
-            Availability.employee_id.in_(employee_ids),
-        )
-        .all()
-    )
+    # Availability for that store+week (STRICT: must exist AND cover shift):
+    # submitted rows plus windows from recurring patterns
+    availability_map = week_availability_windows(db, store_id=store_id, week=wk, employee_ids=employee_ids)
 
-    availability_map: Dict[uuid.UUID, List[Tuple[datetime, datetime]]] = {}
-    for a in av_rows:
-        if not a.available_start_at or not a.available_end_at:
-            continue
-        s = _dt_utc(a.available_start_at)
-        e = _dt_utc(a.available_end_at)
-        if e <= s:
-            continue
-        availability_map.setdefault(a.employee_id, []).append((s, e))
-
-    # ✅ STRICT RULE: If employee has NO availability rows, they are NOT eligible
+    # ✅ STRICT RULE: If employee has NO availability (rows or patterns), they are NOT eligible
     eligible_with_availability = set(availability_map.keys())
     if not eligible_with_availability:
-        return ([], "No employees have submitted availability for this store/week.")
+        return GapFillPlan(note="No employees have submitted availability for this store/week.")
 
     # Approved leave overlapping week dates
     leave_rows = (
@@ -164,14 +198,11 @@ async def build_gap_suggestions(
         if eid in assignment_count:
             assignment_count[eid] = len(windows)
 
-    suggestions_out: List[Dict] = []
-
-    groq = GroqClient()
-    can_groq = use_groq and groq.is_configured()
+    needed_by_shift = {g.shift_id: g.needed for g in gaps}
+    plan = GapFillPlan(assignment_count=assignment_count)
 
     for sh in shifts:
-        gap = next((g for g in gaps if g.shift_id == sh.id), None)
-        if not gap:
+        if sh.id not in needed_by_shift:
             continue
 
         sh_start = _dt_utc(sh.start_at)
@@ -188,55 +219,202 @@ async def build_gap_suggestions(
             candidates.append(eid)
 
         candidates.sort(key=lambda x: assignment_count.get(x, 0))
-        top = candidates[: max_suggestions_per_shift]
+        plan.shifts.append(
+            ShiftPlan(
+                shift_id=sh.id,
+                role=sh.role,
+                start=sh_start,
+                end=sh_end,
+                needed=needed_by_shift[sh.id],
+                candidates=candidates,
+            )
+        )
 
-        # Optional: Groq rerank only (small + cheap)
-        if can_groq and top:
-            payload = {
-                "shift_start": sh_start.isoformat(),
-                "shift_end": sh_end.isoformat(),
-                "shift_role": sh.role,
-                "candidates": [str(x) for x in top],
-                "assignment_counts": {str(k): assignment_count.get(k, 0) for k in top},
-                "instruction": "Return ONLY a JSON array of UUID strings reordered best-first.",
-            }
-
-            try:
-                txt = await groq.chat_completion(
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "Reorder candidates to fill a work shift. Output only JSON array of UUID strings.",
-                        },
-                        {"role": "user", "content": json.dumps(payload)},
-                    ],
-                    temperature=0.0,
-                    max_tokens=200,
-                )
-                arr = json.loads(txt)
-                reranked = []
-                for v in arr:
-                    reranked.append(uuid.UUID(str(v)))
-                top_set = set(top)
-                top = [x for x in reranked if x in top_set]
-                if not top:
-                    top = candidates[: max_suggestions_per_shift]
-            except Exception:
-                top = candidates[: max_suggestions_per_shift]
-
-        suggestions_out.append(
-            {
-                "shift_id": sh.id,
-                "needed_slots": gap.needed,
-                "suggested_employee_ids": top,
-            }
+    return plan
+
+
+async def _rerank(groq: GroqClient, sp: ShiftPlan, top: List[uuid.UUID], assignment_count: Dict) -> List[uuid.UUID]:
+    # Groq rerank only (small + cheap); falls back to the fairness order
+    payload = {
+        "shift_start": sp.start.isoformat(),
+        "shift_end": sp.end.isoformat(),
+        "shift_role": sp.role,
+        "candidates": [str(x) for x in top],
+        "assignment_counts": {str(k): assignment_count.get(k, 0) for k in top},
+        "instruction": "Return ONLY a JSON array of UUID strings reordered best-first.",
+    }
+
+    try:
+        txt = await groq.chat_completion(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Reorder candidates to fill a work shift. Output only JSON array of UUID strings.",
+                },
+                {"role": "user", "content": json.dumps(payload)},
+            ],
+            temperature=0.0,
+            max_tokens=200,
         )
+        arr = json.loads(txt)
+        reranked = []
+        for v in arr:
+            reranked.append(uuid.UUID(str(v)))
+        top_set = set(top)
+        out = [x for x in reranked if x in top_set]
+        return out or top
+    except Exception:
+        return top
+
+
+async def build_gap_suggestions(
+    db: Session,
+    *,
+    store_id: uuid.UUID,
+    week_id: uuid.UUID,
+    role_filter: str | None,
+    max_suggestions_per_shift: int,
+    use_groq: bool,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> Tuple[List[Dict], str]:
+    plan = await asyncio.to_thread(
+        plan_gap_fill, db, store_id=store_id, week_id=week_id, role_filter=role_filter
+    )
+    if plan.note:
+        return [], plan.note
+
+    groq = GroqClient()
+    can_groq = use_groq and groq.is_configured()
+    limit = asyncio.Semaphore(RERANK_CONCURRENCY)
+    # progress writes one at a time, so the last one reported is the highest
+    reporting = asyncio.Lock()
+    total = len(plan.shifts)
+    done = 0
+
+    async def suggest(sp: ShiftPlan) -> Dict:
+        nonlocal done
+        top = sp.candidates[:max_suggestions_per_shift]
+        if can_groq and top:
+            async with limit:
+                top = await _rerank(groq, sp, top, plan.assignment_count)
+
+        done += 1
+        if on_progress is not None:
+            async with reporting:
+                await asyncio.to_thread(on_progress, done, total)
+        return {
+            "shift_id": sp.shift_id,
+            "needed_slots": sp.needed,
+            "suggested_employee_ids": top,
+        }
+
+    suggestions_out = list(await asyncio.gather(*(suggest(sp) for sp in plan.shifts)))
 
     note = (
-        "STRICT mode: employees with NO availability rows are excluded. "
+        "STRICT mode: employees with NO availability (rows or recurring patterns) are excluded. "
         "Rules used: approved leave + availability must cover shift + no overlap + fairness (fewer existing assignments)."
     )
     if use_groq:
         note += " Groq rerank used only when GROQ_API_KEY is set."
 
     return suggestions_out, note
+
+
+# ---------------------------
+# Stored results
+# ---------------------------
+def params_key(*, role: str | None, max_suggestions_per_shift: int, use_groq: bool) -> str:
+    raw = json.dumps(
+        {
+            "role": (role or "").strip().lower() or None,
+            "max_suggestions_per_shift": max_suggestions_per_shift,
+            "use_groq": use_groq,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def schedule_version(db: Session, *, store_id: uuid.UUID, week_id: uuid.UUID) -> int | None:
+    return db.execute(
+        select(Schedule.version).where(Schedule.store_id == store_id, Schedule.week_id == week_id)
+    ).scalar()
+
+
+def stored_result(db: Session, *, store_id: uuid.UUID, week_id: uuid.UUID, key: str, version: int) -> Dict | None:
+    max_age = timedelta(seconds=settings.GAP_FILL_RESULT_MAX_AGE_SECONDS)
+    return db.execute(
+        select(GapFillResult.result).where(
+            GapFillResult.store_id == store_id,
+            GapFillResult.week_id == week_id,
+            GapFillResult.params_key == key,
+            GapFillResult.schedule_version == version,
+            GapFillResult.created_at > func.now() - max_age,
+        )
+    ).scalar()
+
+
+def in_flight_job(db: Session, dedupe_key: str) -> Job | None:
+    # the same run already queued or running: hand out that job
+    return (
+        db.query(Job)
+        .filter(
+            Job.kind == JOB_KIND,
+            Job.status.in_(("queued", "running")),
+            Job.params["dedupe_key"].astext == dedupe_key,
+        )
+        .order_by(Job.created_at.desc())
+        .first()
+    )
+
+
+def _save_result(db: Session, *, store_id: uuid.UUID, week_id: uuid.UUID, key: str, version: int, result: Dict) -> None:
+    stmt = insert(GapFillResult).values(
+        store_id=store_id, week_id=week_id, params_key=key, schedule_version=version, result=result
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_gap_fill_results_store_week_params",
+            set_={"schedule_version": version, "result": result, "created_at": func.now()},
+        )
+    )
+    db.commit()
+
+
+@job_handler(JOB_KIND)
+async def _gap_fill_job(ctx: JobContext) -> Dict:
+    p = ctx.params
+    store_id = uuid.UUID(p["store_id"])
+    week_id = uuid.UUID(p["week_id"])
+    key = params_key(role=p.get("role"), max_suggestions_per_shift=p["max_suggestions_per_shift"], use_groq=p["use_groq"])
+
+    # read before planning: a change made meanwhile makes the stored result
+    # stale right away rather than hiding behind the new version
+    version = await asyncio.to_thread(schedule_version, ctx.db, store_id=store_id, week_id=week_id)
+
+    try:
+        suggestions, notes = await build_gap_suggestions(
+            ctx.db,
+            store_id=store_id,
+            week_id=week_id,
+            role_filter=p.get("role"),
+            max_suggestions_per_shift=p["max_suggestions_per_shift"],
+            use_groq=p["use_groq"],
+            on_progress=lambda done, total: ctx.progress(done, total),
+        )
+    except ValueError as e:
+        raise JobError(str(e))
+
+    result = AiGapFillResponse(
+        store_id=store_id,
+        week_id=week_id,
+        generated_at=datetime.now(timezone.utc),
+        suggestions=[AiGapSuggestion(**s) for s in suggestions],
+        notes=notes,
+    ).model_dump(mode="json")
+
+    if version is not None:
+        await asyncio.to_thread(
+            _save_result, ctx.db, store_id=store_id, week_id=week_id, key=key, version=version, result=result
+        )
+    return result
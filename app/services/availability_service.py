@@ -0,0 +1,185 @@
+# app/services/availability_service.py
+"""
+Concrete availability windows for a store + week.
+
+Two sources:
+  - `availability` rows: per week and day, UTC timestamps
+  - `availability_patterns`: weekday + store-local time window + effective
+    range, expanded here into UTC windows for the days of one week
+
+A row for an employee's day overrides that employee's pattern windows for the
+same day (a row without times marks the day unavailable).
+
+Pattern expansion is memoized per (store, week) in-process. Entries are
+stamped with the store timezone and the count / latest update of the store's
+patterns, so any change (from any process) is picked up on the next call at
+the cost of one small aggregate query.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.availability import Availability
+from app.models.availability_pattern import AvailabilityPattern
+from app.models.store import Store
+from app.models.week import Week
+
+Window = Tuple[datetime, datetime]
+DayWindow = Tuple[date, datetime, datetime]
+
+_MEMO_MAX = 1024
+_memo: "OrderedDict[tuple, tuple]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def store_tz(name: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _dt_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def local_window(day: date, start: time, end: time, tz: ZoneInfo) -> Window:
+    """
+    UTC bounds of a store-local wall-clock window on `day`; end <= start
+    ends on the next day.
+    """
+    end_day = day + timedelta(days=1) if end <= start else day
+    s = datetime.combine(day, start, tzinfo=tz).astimezone(timezone.utc)
+    e = datetime.combine(end_day, end, tzinfo=tz).astimezone(timezone.utc)
+    return s, e
+
+
+def expand_pattern(pattern, days: Iterable[date], tz: ZoneInfo) -> List[DayWindow]:
+    out: List[DayWindow] = []
+    for d in days:
+        if d.weekday() != pattern.weekday:
+            continue
+        if d < pattern.effective_from or (pattern.effective_to and d > pattern.effective_to):
+            continue
+        s, e = local_window(d, pattern.start_time, pattern.end_time, tz)
+        out.append((d, s, e))
+    return out
+
+
+def pattern_windows(db: Session, *, store_id: uuid.UUID, week: Week) -> Dict[uuid.UUID, List[DayWindow]]:
+    """
+    {employee_id: [(local day, start utc, end utc), ...]} from the store's
+    patterns for the week. Memoized per (store, week).
+    """
+    of_store = AvailabilityPattern.store_id == store_id
+    stamp = tuple(
+        db.execute(
+            select(
+                select(Store.timezone).where(Store.id == store_id).scalar_subquery(),
+                select(func.count(AvailabilityPattern.id)).where(of_store).scalar_subquery(),
+                select(func.max(AvailabilityPattern.updated_at)).where(of_store).scalar_subquery(),
+            )
+        ).one()
+    )
+    tz_name, n_patterns, _ = stamp
+    key = (store_id, week.id)
+
+    with _memo_lock:
+        hit = _memo.get(key)
+        if hit and hit[0] == stamp:
+            _memo.move_to_end(key)
+            return hit[1]
+
+    windows: Dict[uuid.UUID, List[DayWindow]] = {}
+    if n_patterns:
+        tz = store_tz(tz_name)
+        # the day before the week only contributes windows running past midnight
+        first = week.week_start - timedelta(days=1)
+        days = [first + timedelta(days=i) for i in range((week.week_end - first).days + 1)]
+
+        patterns = db.execute(
+            select(
+                AvailabilityPattern.employee_id,
+                AvailabilityPattern.weekday,
+                AvailabilityPattern.start_time,
+                AvailabilityPattern.end_time,
+                AvailabilityPattern.effective_from,
+                AvailabilityPattern.effective_to,
+            ).where(
+                of_store,
+                AvailabilityPattern.effective_from <= week.week_end,
+                or_(AvailabilityPattern.effective_to.is_(None), AvailabilityPattern.effective_to >= first),
+            )
+        ).all()
+
+        week_lo = datetime.combine(week.week_start, time.min, tzinfo=tz).astimezone(timezone.utc)
+        for p in patterns:
+            for d, s, e in expand_pattern(p, days, tz):
+                if d < week.week_start and e <= week_lo:
+                    continue
+                windows.setdefault(p.employee_id, []).append((d, s, e))
+
+    with _memo_lock:
+        _memo[key] = (stamp, windows)
+        _memo.move_to_end(key)
+        while len(_memo) > _MEMO_MAX:
+            _memo.popitem(last=False)
+    return windows
+
+
+def week_availability_windows(
+    db: Session,
+    *,
+    store_id: uuid.UUID,
+    week: Week,
+    employee_ids: Iterable[uuid.UUID] | None = None,
+) -> Dict[uuid.UUID, List[Window]]:
+    """
+    {employee_id: [(start utc, end utc), ...]} for the week: availability rows,
+    plus pattern windows on days the employee has no row for.
+    """
+    ids = set(employee_ids) if employee_ids is not None else None
+
+    stmt = select(
+        Availability.employee_id,
+        Availability.day,
+        Availability.available_start_at,
+        Availability.available_end_at,
+    ).where(Availability.store_id == store_id, Availability.week_id == week.id)
+    if ids is not None:
+        if not ids:
+            return {}
+        stmt = stmt.where(Availability.employee_id.in_(ids))
+
+    out: Dict[uuid.UUID, List[Window]] = {}
+    row_days: set[tuple[uuid.UUID, date]] = set()
+    for r in db.execute(stmt):
+        row_days.add((r.employee_id, r.day))
+        if not r.available_start_at or not r.available_end_at:
+            continue
+        s = _dt_utc(r.available_start_at)
+        e = _dt_utc(r.available_end_at)
+        if e <= s:
+            continue
+        out.setdefault(r.employee_id, []).append((s, e))
+
+    for emp_id, day_windows in pattern_windows(db, store_id=store_id, week=week).items():
+        if ids is not None and emp_id not in ids:
+            continue
+        for d, s, e in day_windows:
+            if (emp_id, d) in row_days:
+                continue
+            out.setdefault(emp_id, []).append((s, e))
+
+    return out
@@ -0,0 +1,224 @@
+# app/services/geofence_report_service.py
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.geofence import fence_for_store, contains_batch, distance_matrix_m
+from app.models.store import Store
+from app.models.timeentry import TimeEntry
+from app.models.week import Week
+from app.services.report_cache import get_or_compute_week_report
+from app.services.week_service import get_week_clock_in_bounds
+
+REPORT_KIND = "geofence"
+
+# clock-ins farther than this fraction of the radius count as "near the edge"
+EDGE_RATIO = 0.8
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def compute_week_geofence(db: Session, store: Store, week: Week) -> Dict:
+    """
+    Per-employee out-of-zone totals and edge clock-ins for one store + week.
+    The payload is JSON-ready so locked weeks can be cached as-is.
+    """
+    lo, hi = get_week_clock_in_bounds(week.week_start)
+    in_week = (
+        TimeEntry.store_id == store.id,
+        TimeEntry.week_id == week.id,
+        TimeEntry.clock_in_at >= lo,
+        TimeEntry.clock_in_at < hi,
+    )
+
+    totals = (
+        db.query(
+            TimeEntry.employee_id.label("employee_id"),
+            func.count(TimeEntry.id).label("entries"),
+            func.coalesce(func.sum(TimeEntry.out_of_zone_seconds), 0).label("out_of_zone_seconds"),
+        )
+        .filter(*in_week)
+        .group_by(TimeEntry.employee_id)
+        .all()
+    )
+
+    employees: Dict[str, Dict] = {
+        str(r.employee_id): {
+            "employee_id": str(r.employee_id),
+            "entries": int(r.entries),
+            "out_of_zone_seconds": int(r.out_of_zone_seconds),
+            "edge_clock_ins": 0,
+            "outside_clock_ins": 0,
+        }
+        for r in totals
+    }
+
+    points = (
+        db.query(
+            TimeEntry.id,
+            TimeEntry.employee_id,
+            TimeEntry.clock_in_at,
+            TimeEntry.clock_in_lat,
+            TimeEntry.clock_in_lng,
+        )
+        .filter(
+            *in_week,
+            TimeEntry.clock_in_lat.isnot(None),
+            TimeEntry.clock_in_lng.isnot(None),
+        )
+        .all()
+    )
+
+    edge_rows: List[Dict] = []
+    fence = fence_for_store(store)
+
+    if points and fence.is_configured:
+        lats = np.fromiter((p.clock_in_lat for p in points), dtype=np.float64, count=len(points))
+        lngs = np.fromiter((p.clock_in_lng for p in points), dtype=np.float64, count=len(points))
+
+        inside = contains_batch(lats, lngs, [fence])[:, 0]
+
+        if fence.polygon:
+            # distance to a polygon center is not meaningful; only inside/outside counts
+            dist = np.full(len(points), np.nan)
+            ratio = np.full(len(points), np.nan)
+            flagged = ~inside
+        else:
+            dist = distance_matrix_m(lats, lngs, [fence])[:, 0]
+            ratio = dist / fence.radius_m if fence.radius_m > 0 else np.full(len(points), np.inf)
+            flagged = ~inside | (ratio >= EDGE_RATIO)
+
+        for i in np.flatnonzero(flagged):
+            p = points[i]
+            emp = employees.get(str(p.employee_id))
+            if emp is not None:
+                emp["edge_clock_ins"] += 1
+                if not inside[i]:
+                    emp["outside_clock_ins"] += 1
+
+            edge_rows.append(
+                {
+                    "time_entry_id": str(p.id),
+                    "store_id": str(store.id),
+                    "employee_id": str(p.employee_id),
+                    "clock_in_at": p.clock_in_at.isoformat(),
+                    "distance_m": None if np.isnan(dist[i]) else round(float(dist[i]), 1),
+                    "radius_ratio": None if np.isnan(ratio[i]) else round(float(ratio[i]), 3),
+                    "inside": bool(inside[i]),
+                }
+            )
+
+    return {
+        "store_id": str(store.id),
+        "week_id": str(week.id),
+        "employees": list(employees.values()),
+        "edge_clock_ins": edge_rows,
+    }
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    if values.size == 0:
+        return {f"p{p}": 0.0 for p in PERCENTILES}
+    pct = np.percentile(values, PERCENTILES)
+    return {f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, pct)}
+
+
+def _outlier_threshold(values: np.ndarray) -> float:
+    # Tukey fence: Q3 + 1.5 * IQR
+    if values.size == 0:
+        return 0.0
+    q1, q3 = np.percentile(values, (25, 75))
+    return float(q3 + 1.5 * (q3 - q1))
+
+
+def build_geofence_compliance_report(
+    db: Session,
+    *,
+    stores: List[Store],
+    start_date: date,
+    end_date: date,
+) -> Dict:
+    """
+    Geofence compliance over a date range, expanded to whole weeks.
+    Each store+week is computed independently (cached once the week is locked),
+    then merged and summarized with NumPy.
+    """
+    weeks = (
+        db.query(Week)
+        .filter(Week.week_start <= end_date, Week.week_end >= start_date)
+        .order_by(Week.week_start.asc())
+        .all()
+    )
+
+    store_lines: List[Dict] = []
+    employee_lines: List[Dict] = []
+    edge_rows: List[Dict] = []
+
+    for store in stores:
+        merged: Dict[str, Dict] = {}
+
+        for wk in weeks:
+            payload = get_or_compute_week_report(
+                db,
+                kind=REPORT_KIND,
+                store_id=store.id,
+                week=wk,
+                compute=lambda store=store, wk=wk: compute_week_geofence(db, store, wk),
+            )
+
+            for e in payload["employees"]:
+                cur = merged.setdefault(
+                    e["employee_id"],
+                    {
+                        "store_id": str(store.id),
+                        "employee_id": e["employee_id"],
+                        "entries": 0,
+                        "out_of_zone_seconds": 0,
+                        "edge_clock_ins": 0,
+                        "outside_clock_ins": 0,
+                    },
+                )
+                cur["entries"] += e["entries"]
+                cur["out_of_zone_seconds"] += e["out_of_zone_seconds"]
+                cur["edge_clock_ins"] += e["edge_clock_ins"]
+                cur["outside_clock_ins"] += e["outside_clock_ins"]
+
+            edge_rows.extend(payload["edge_clock_ins"])
+
+        lines = sorted(merged.values(), key=lambda x: x["employee_id"])
+        oz = np.array([x["out_of_zone_seconds"] for x in lines], dtype=np.float64)
+
+        threshold = _outlier_threshold(oz)
+        flags = (oz > threshold) & (oz > 0)
+        for line, flag in zip(lines, flags):
+            line["is_outlier"] = bool(flag)
+
+        store_lines.append(
+            {
+                "store_id": str(store.id),
+                "store_code": store.code,
+                "employees": len(lines),
+                "entries": sum(x["entries"] for x in lines),
+                "out_of_zone_seconds": int(oz.sum()),
+                "edge_clock_ins": sum(x["edge_clock_ins"] for x in lines),
+                "outside_clock_ins": sum(x["outside_clock_ins"] for x in lines),
+                "outlier_threshold_seconds": round(threshold, 1),
+                **_percentiles(oz),
+            }
+        )
+        employee_lines.extend(lines)
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "week_starts": [wk.week_start for wk in weeks],
+        "stores": store_lines,
+        "employees": employee_lines,
+        "edge_clock_ins": edge_rows,
+    }
@@ -0,0 +1,85 @@
+# app/services/invoice_service.py
+"""
+Weekly payroll invoice generation for one store.
+
+Runs inline (POST .../generate-invoices) or as the "payroll.generate_invoices"
+background job (?background=true). Invoices are immutable: one per employee,
+store and week (unique constraint), so reruns and job retries only add the
+missing ones.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Tuple
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.payroll_invoice import PayrollInvoice
+from app.models.store import Store
+from app.models.week import Week
+from app.services.jobs import JobContext, JobError, job_handler
+from app.services.payroll_service import week_payroll_lines
+
+JOB_KIND = "payroll.generate_invoices"
+
+
+def generate_week_invoices(db: Session, *, tenant_id: uuid.UUID, store: Store, week: Week) -> Tuple[int, int]:
+    """
+    Issues invoices for every employee with worked minutes. Returns
+    (created, skipped_existing); caller commits.
+    """
+    # minutes, overtime and pay per employee in one grouped query
+    lines = [
+        r
+        for r in week_payroll_lines(db, week=week, store_ids=[store.id])
+        if int(r.total_minutes) > 0
+    ]
+    if not lines:
+        return 0, 0
+
+    rows = [
+        {
+            "tenant_id": tenant_id,
+            "store_id": store.id,
+            "employee_id": r.employee_id,
+            "week_start": week.week_start,
+            # invoice_no is generated by DB sequence automatically ✅
+            "pay_rate_hourly": r.pay_rate_hourly,
+            "regular_minutes": int(r.regular_minutes),
+            "overtime_minutes": int(r.overtime_minutes),
+            "gross_pay": r.gross_pay,
+            "tax_enabled": bool(r.tax_enabled),
+            "tax_rate_percent": r.tax_rate_percent,
+            "tax_withheld": r.tax_withheld,
+            "net_pay": r.net_pay,
+            "status": "issued",
+        }
+        for r in lines
+    ]
+    created = db.execute(
+        insert(PayrollInvoice)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["store_id", "employee_id", "week_start"])
+        .returning(PayrollInvoice.id)
+    ).all()
+    return len(created), len(rows) - len(created)
+
+
+@job_handler(JOB_KIND)
+def _generate_invoices_job(ctx: JobContext) -> dict:
+    store = (
+        ctx.db.query(Store)
+        .filter(Store.id == ctx.params["store_id"], Store.tenant_id == ctx.tenant_id)
+        .first()
+    )
+    if not store:
+        raise JobError("Store not found.")
+    week = ctx.db.query(Week).filter(Week.id == ctx.params["week_id"]).first()
+    if not week:
+        raise JobError("Week not found.")
+
+    created, skipped = generate_week_invoices(ctx.db, tenant_id=ctx.tenant_id, store=store, week=week)
+    ctx.db.commit()
+    return {"ok": True, "created": created, "skipped_existing": skipped}
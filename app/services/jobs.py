@@ -0,0 +1,384 @@
+# app/services/jobs.py
+"""
+Durable background jobs on a Postgres table (`jobs`).
+
+Register a handler in one of HANDLER_MODULES:
+
+    @job_handler("payroll.generate_invoices")
+    def _generate(ctx: JobContext) -> dict:
+        ...
+        ctx.progress(i, total)
+        return {...}          # stored as the job's result (JSON)
+
+Enqueue from a request and answer 202:
+
+    job = enqueue(db, "payroll.generate_invoices", {...}, tenant_id=..., created_by=...)
+    db.commit()               # visible to workers, and wakes them, on commit
+    return job_accepted(job)
+
+Workers (run_jobs_worker.py) claim queued jobs with FOR UPDATE SKIP LOCKED,
+with at most settings.JOBS_TENANT_CONCURRENCY running per tenant. A handler
+raising JobError fails the job for good; any other exception is retried with
+exponential backoff until max_attempts. Running jobs heartbeat; a job whose
+worker died is requeued once its heartbeat is JOBS_STALE_SECONDS old.
+
+Handlers get their own session (ctx.db) and commit their own writes; async
+handlers run with asyncio.run on the worker thread. Progress is written in a
+separate short transaction, so pollers see it while the handler works.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import case, func, select, text, update
+from sqlalchemy.orm import Session, aliased
+
+from app.core import pg_listen
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.job import Job
+from app.schemas.job import JobOut
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "jobs"
+
+# imported by workers so their handlers register
+HANDLER_MODULES = (
+    "app.services.invoice_service",
+    "app.services.tenant_insights",
+    "app.services.ai_gap_fill_service",
+)
+
+_handlers: Dict[str, Callable] = {}
+
+
+class JobError(Exception):
+    """Permanent failure: the job is failed without retrying."""
+
+
+@dataclass
+class JobContext:
+    db: Session
+    job_id: uuid.UUID
+    worker_id: str
+    params: Dict[str, Any]
+    tenant_id: uuid.UUID | None
+    _last_progress: float = field(default=0.0, repr=False)
+
+    def progress(self, done: int, total: int | None = None, message: str | None = None) -> None:
+        # throttled: at most a few writes per second, always the last one
+        now = time.monotonic()
+        if total is None or done < total:
+            if now - self._last_progress < 0.25:
+                return
+        self._last_progress = now
+        values: Dict[str, Any] = {"progress_done": done, "heartbeat_at": func.now()}
+        if total is not None:
+            values["progress_total"] = total
+        if message is not None:
+            values["progress_message"] = message[:255]
+        _update_owned(self.job_id, self.worker_id, values)
+
+
+def job_handler(kind: str):
+    def register(fn: Callable) -> Callable:
+        _handlers[kind] = fn
+        return fn
+
+    return register
+
+
+def load_handlers() -> None:
+    for name in HANDLER_MODULES:
+        importlib.import_module(name)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------
+# Enqueue
+# ---------------------------
+def enqueue(
+    db: Session,
+    kind: str,
+    params: Dict[str, Any],
+    *,
+    tenant_id: uuid.UUID | None = None,
+    created_by: uuid.UUID | None = None,
+    max_attempts: int | None = None,
+) -> Job:
+    """
+    Adds a queued job in the caller's transaction; caller commits.
+    """
+    job = Job(
+        kind=kind,
+        params=params,
+        tenant_id=tenant_id,
+        created_by=created_by,
+        status="queued",
+        progress_done=0,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_after=_now(),
+        created_at=_now(),
+    )
+    db.add(job)
+    db.flush()
+    # delivered on commit
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": kind})
+    return job
+
+
+def job_accepted(job: Job) -> JSONResponse:
+    """
+    202 for work handed to a job; poll the Location for status, progress and
+    the result.
+    """
+    return JSONResponse(
+        status_code=202,
+        content=JobOut.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"{settings.API_V1_STR}/jobs/{job.id}"},
+    )
+
+
+# ---------------------------
+# Claim / finish
+# ---------------------------
+def claim_next(db: Session, worker_id: str, *, kinds: Iterable[str] | None = None) -> uuid.UUID | None:
+    """
+    Marks the next runnable job as running and commits. Tenants at their
+    concurrency limit are skipped; the limit is re-checked under a per-tenant
+    advisory lock, so concurrent workers cannot overshoot it.
+    """
+    limit = settings.JOBS_TENANT_CONCURRENCY
+    other = aliased(Job)
+    running = (
+        select(func.count(other.id))
+        .where(other.tenant_id == Job.tenant_id, other.status == "running")
+        .scalar_subquery()
+    )
+    full: set[uuid.UUID] = set()
+
+    while True:
+        stmt = (
+            select(Job)
+            .where(
+                Job.status == "queued",
+                Job.run_after <= func.now(),
+                (Job.tenant_id.is_(None)) | (running < limit),
+            )
+            .order_by(Job.run_after.asc(), Job.created_at.asc())
+            .limit(1)
+            .with_for_update(skip_locked=True, of=Job)
+        )
+        if kinds:
+            stmt = stmt.where(Job.kind.in_(list(kinds)))
+        if full:
+            stmt = stmt.where(Job.tenant_id.not_in(full))
+
+        job = db.execute(stmt).scalar_one_or_none()
+        if job is None:
+            db.rollback()
+            return None
+
+        if job.tenant_id is not None:
+            db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"jobs:{job.tenant_id}"))))
+            n = db.execute(
+                select(func.count(Job.id)).where(Job.tenant_id == job.tenant_id, Job.status == "running")
+            ).scalar()
+            if n >= limit:
+                full.add(job.tenant_id)
+                continue
+
+        job.status = "running"
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.started_at = _now()
+        job.heartbeat_at = _now()
+        job_id = job.id
+        db.commit()
+        return job_id
+
+
+def _update_owned(job_id: uuid.UUID, worker_id: str, values: Dict[str, Any]) -> bool:
+    # only while this worker still owns the job (it may have been requeued)
+    with engine.begin() as conn:
+        res = conn.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id, Job.status == "running")
+            .values(**values)
+        )
+    return res.rowcount == 1
+
+
+def _retry_delay(attempts: int) -> float:
+    delay = min(settings.JOBS_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), settings.JOBS_RETRY_MAX_SECONDS)
+    return delay * random.uniform(1.0, 1.1)
+
+
+def _fail(job_id: uuid.UUID, worker_id: str, error: str, *, retry: bool) -> None:
+    with engine.begin() as conn:
+        row = conn.execute(
+            select(Job.attempts, Job.max_attempts).where(Job.id == job_id, Job.locked_by == worker_id)
+        ).first()
+    if row is None:
+        return
+
+    if retry and row.attempts < row.max_attempts:
+        values = {
+            "status": "queued",
+            "run_after": _now() + timedelta(seconds=_retry_delay(row.attempts)),
+            "locked_by": None,
+            "error": error,
+        }
+    else:
+        values = {"status": "failed", "finished_at": _now(), "error": error}
+    _update_owned(job_id, worker_id, values)
+
+
+def requeue_stale(db: Session) -> int:
+    """
+    Running jobs whose worker stopped heartbeating: back to queued (or failed
+    when out of attempts). Returns how many.
+    """
+    cutoff = _now() - timedelta(seconds=settings.JOBS_STALE_SECONDS)
+    out_of_attempts = Job.attempts >= Job.max_attempts
+    res = db.execute(
+        update(Job)
+        .where(Job.status == "running", Job.heartbeat_at < cutoff)
+        .values(
+            status=case((out_of_attempts, "failed"), else_="queued"),
+            finished_at=case((out_of_attempts, func.now()), else_=None),
+            run_after=func.now(),
+            locked_by=None,
+            error="Worker stopped responding",
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return res.rowcount
+
+
+# ---------------------------
+# Run
+# ---------------------------
+def _heartbeat(job_id: uuid.UUID, worker_id: str, stop: threading.Event) -> None:
+    while not stop.wait(settings.JOBS_HEARTBEAT_SECONDS):
+        try:
+            if not _update_owned(job_id, worker_id, {"heartbeat_at": func.now()}):
+                return
+        except Exception:
+            logger.exception("job heartbeat failed")
+
+
+def run_job(job_id: uuid.UUID, worker_id: str) -> None:
+    db = SessionLocal()
+    stop = threading.Event()
+    beat = threading.Thread(target=_heartbeat, args=(job_id, worker_id, stop), daemon=True)
+    beat.start()
+    try:
+        job = db.get(Job, job_id)
+        handler = _handlers.get(job.kind)
+        if handler is None:
+            raise JobError(f"No handler for job kind {job.kind!r}")
+
+        ctx = JobContext(db=db, job_id=job.id, worker_id=worker_id, params=dict(job.params or {}), tenant_id=job.tenant_id)
+        db.commit()  # don't hold the read transaction while the handler runs
+
+        if asyncio.iscoroutinefunction(handler):
+            result = asyncio.run(handler(ctx))
+        else:
+            result = handler(ctx)
+        db.commit()
+
+        _update_owned(
+            job_id,
+            worker_id,
+            {"status": "succeeded", "result": result, "error": None, "finished_at": _now()},
+        )
+    except JobError as e:
+        db.rollback()
+        _fail(job_id, worker_id, str(e), retry=False)
+    except Exception as e:
+        logger.exception("job %s failed", job_id)
+        db.rollback()
+        _fail(job_id, worker_id, f"{type(e).__name__}: {e}", retry=True)
+    finally:
+        stop.set()
+        db.close()
+
+
+# ---------------------------
+# Worker
+# ---------------------------
+def _worker_loop(worker_id: str, wake: threading.Event, stop: threading.Event, poll_seconds: float, kinds, reaper: bool):
+    next_reap = 0.0
+    while not stop.is_set():
+        try:
+            db = SessionLocal()
+            try:
+                if reaper and time.monotonic() >= next_reap:
+                    n = requeue_stale(db)
+                    if n:
+                        logger.warning("requeued %d stale jobs", n)
+                    next_reap = time.monotonic() + settings.JOBS_STALE_SECONDS / 2
+                wake.clear()
+                job_id = claim_next(db, worker_id, kinds=kinds)
+            finally:
+                db.close()
+        except Exception:
+            logger.exception("job claim failed")
+            job_id = None
+
+        if job_id is None:
+            wake.wait(poll_seconds)
+            continue
+        run_job(job_id, worker_id)
+
+
+def run_worker(
+    *,
+    concurrency: int = 2,
+    poll_seconds: float = 5.0,
+    kinds: Iterable[str] | None = None,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Runs `concurrency` job threads until `stop` is set. Queued jobs wake the
+    threads through NOTIFY; polling every poll_seconds covers delayed retries
+    and missed notifications.
+    """
+    load_handlers()
+    stop = stop or threading.Event()
+    wake = threading.Event()
+    pg_listen.listen(CHANNEL, lambda _payload: wake.set())
+
+    kinds = list(kinds) if kinds else None
+    base = f"{socket.gethostname()}:{uuid.uuid4().hex[:8]}"
+    threads = [
+        threading.Thread(
+            target=_worker_loop,
+            args=(f"{base}/{i}", wake, stop, poll_seconds, kinds, i == 0),
+            name=f"job-worker-{i}",
+        )
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
@@ -0,0 +1,131 @@
+# app/services/leave_conflicts.py
+"""
+Shift assignments that conflict with a leave request.
+
+Leave covers whole days in the store's timezone: [start_date 00:00,
+end_date + 1 day 00:00) local, compared against shift times in UTC. Driven
+by the employee's assignments (ix_shift_assignments_employee_shift).
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Sequence
+
+from sqlalchemy import DateTime, and_, column, delete, select, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.models.leave_request import LeaveRequest
+from app.models.schedule import Schedule, Shift, ShiftAssignment
+from app.models.store import Store
+from app.models.week import Week
+from app.services.availability_service import store_tz
+from app.services.schedule_snapshot import write_snapshot
+from app.services.schedule_version import bump_schedule_versions
+
+
+def leave_utc_bounds(start_date: date, end_date: date, tz_name: str | None) -> tuple[datetime, datetime]:
+    tz = store_tz(tz_name)
+    lo = datetime.combine(start_date, time.min, tzinfo=tz).astimezone(timezone.utc)
+    hi = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=tz).astimezone(timezone.utc)
+    return lo, hi
+
+
+def find_leave_conflicts(db: Session, lr: LeaveRequest) -> List:
+    """
+    Rows (assignment_id, shift_id, schedule_id, week_id, role, start_at,
+    end_at, is_published, week_locked) of the employee's assignments in the
+    leave's store that overlap the leave, by shift start.
+    """
+    return find_leave_conflicts_many(db, [lr]).get(lr.id, [])
+
+
+def find_leave_conflicts_many(db: Session, requests: Sequence) -> Dict[uuid.UUID, List]:
+    """
+    find_leave_conflicts for many requests (anything with id, employee_id,
+    store_id, start_date and end_date) in two queries: {request id: rows}.
+    """
+    if not requests:
+        return {}
+
+    store_ids = {lr.store_id for lr in requests}
+    tz_by_store = dict(db.execute(select(Store.id, Store.timezone).where(Store.id.in_(store_ids))).all())
+
+    leave = values(
+        column("leave_request_id", UUID(as_uuid=True)),
+        column("employee_id", UUID(as_uuid=True)),
+        column("store_id", UUID(as_uuid=True)),
+        column("lo", DateTime(timezone=True)),
+        column("hi", DateTime(timezone=True)),
+        name="leave",
+    ).data(
+        [
+            (lr.id, lr.employee_id, lr.store_id, *leave_utc_bounds(lr.start_date, lr.end_date, tz_by_store.get(lr.store_id)))
+            for lr in requests
+        ]
+    )
+
+    stmt = (
+        select(
+            leave.c.leave_request_id,
+            ShiftAssignment.id.label("assignment_id"),
+            Shift.id.label("shift_id"),
+            Schedule.id.label("schedule_id"),
+            Schedule.week_id,
+            Shift.role,
+            Shift.start_at,
+            Shift.end_at,
+            Schedule.is_published,
+            Week.is_locked.label("week_locked"),
+        )
+        .select_from(ShiftAssignment)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .join(Schedule, Schedule.id == Shift.schedule_id)
+        .join(Week, Week.id == Schedule.week_id)
+        .join(
+            leave,
+            and_(
+                ShiftAssignment.employee_id == leave.c.employee_id,
+                Schedule.store_id == leave.c.store_id,
+                Shift.start_at < leave.c.hi,
+                Shift.end_at > leave.c.lo,
+            ),
+        )
+        .order_by(Shift.start_at.asc())
+    )
+
+    out: Dict[uuid.UUID, List] = {}
+    for row in db.execute(stmt):
+        out.setdefault(row.leave_request_id, []).append(row)
+    return out
+
+
+def unassign_conflicts(db: Session, conflicts: Sequence) -> set[uuid.UUID]:
+    """
+    Deletes the conflicting assignments outside locked weeks, in one statement,
+    and re-renders the snapshot of every published schedule touched.
+    Returns the removed assignment ids. Caller commits.
+    """
+    removable = [c for c in conflicts if not c.week_locked]
+    if not removable:
+        return set()
+
+    removed = set(
+        db.execute(
+            delete(ShiftAssignment)
+            .where(ShiftAssignment.id.in_([c.assignment_id for c in removable]))
+            .returning(ShiftAssignment.id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
+
+    bump_schedule_versions(db, {c.schedule_id for c in removable if c.assignment_id in removed})
+
+    published = {c.schedule_id for c in removable if c.is_published and c.assignment_id in removed}
+    if published:
+        for schedule in db.query(Schedule).filter(Schedule.id.in_(published)).all():
+            write_snapshot(db, schedule)
+
+    return removed
@@ -0,0 +1,204 @@
+# app/services/partition_maintenance.py
+"""
+Monthly partitions of time_entries (see migrations/011_time_entries_partitioning.sql).
+
+  - ensure_time_entry_partitions: create the partitions for the coming months
+    so clock-ins never land in the default partition
+  - detach_old_time_entry_partitions: detach months older than the retention
+    window and move them to the `archive` schema (or drop them)
+
+Payroll reads time_entry_weekly_agg, so detaching old months does not change
+past payroll summaries. Detaching stops at the first month that still has
+entries in unlocked weeks, so attached months stay contiguous.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import List, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.week_service import get_week_clock_in_bounds
+
+PARENT_TABLE = "time_entries"
+DEFAULT_PARTITION = "time_entries_default"
+ARCHIVE_SCHEMA = "archive"
+
+_NAME_RE = re.compile(r"^time_entries_y(\d{4})m(\d{2})$")
+
+
+@dataclass
+class PartitionInfo:
+    name: str
+    month: date
+
+
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _add_months(d: date, n: int) -> date:
+    y, m = divmod(d.month - 1 + n, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    kind = db.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :t AND relnamespace = 'public'::regnamespace"),
+        {"t": PARENT_TABLE},
+    ).scalar()
+    return kind == "p"
+
+
+def list_time_entry_partitions(db: Session) -> List[PartitionInfo]:
+    rows = db.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'public.time_entries'::regclass
+            """
+        )
+    ).scalars()
+
+    out: List[PartitionInfo] = []
+    for name in rows:
+        m = _NAME_RE.match(name)
+        if m:
+            out.append(PartitionInfo(name=name, month=date(int(m.group(1)), int(m.group(2)), 1)))
+    return sorted(out, key=lambda p: p.month)
+
+
+def week_entries_detached(db: Session, week_start: date) -> bool:
+    """
+    True when a month the week's clock-ins can fall in is no longer attached:
+    some of its entries were detached (or dropped) from time_entries.
+    """
+    if not is_partitioned(db):
+        return False
+    return _months_missing({p.month for p in list_time_entry_partitions(db)}, week_start)
+
+
+def _months_missing(attached: Set[date], week_start: date) -> bool:
+    # months past the newest partition were never created (rows go to the
+    # default partition); any other month that is not attached was detached
+    if not attached:
+        return False
+    newest = max(attached)
+    lo, hi = get_week_clock_in_bounds(week_start)
+    month = _month_start(lo.date())
+    while month < hi.date():
+        if month < newest and month not in attached:
+            return True
+        month = _add_months(month, 1)
+    return False
+
+
+def _create_month(db: Session, month: date) -> None:
+    name = partition_name(month)
+    lo = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    nxt = _add_months(month, 1)
+    hi = datetime(nxt.year, nxt.month, 1, tzinfo=timezone.utc)
+
+    # Build the table standalone, move any rows the default partition caught
+    # for this month, then attach (attaching checks the default is clear).
+    db.execute(text(f'CREATE TABLE "{name}" (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    db.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE clock_in_at >= :lo AND clock_in_at < :hi
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            """
+        ),
+        {"lo": lo, "hi": hi},
+    )
+    db.execute(
+        text(f'ALTER TABLE {PARENT_TABLE} ATTACH PARTITION "{name}" FOR VALUES FROM (:lo) TO (:hi)'),
+        {"lo": lo.isoformat(), "hi": hi.isoformat()},
+    )
+
+
+def ensure_time_entry_partitions(db: Session, *, months_ahead: int = 3, today: date | None = None) -> List[str]:
+    """
+    Creates missing partitions from the current month through `months_ahead`
+    months ahead. Caller commits. Returns the names created.
+    """
+    current = _month_start(today or datetime.now(timezone.utc).date())
+    existing = {p.month for p in list_time_entry_partitions(db)}
+
+    created: List[str] = []
+    for i in range(months_ahead + 1):
+        month = _add_months(current, i)
+        if month in existing:
+            continue
+        _create_month(db, month)
+        created.append(partition_name(month))
+    return created
+
+
+def _has_unlocked_entries(db: Session, name: str) -> bool:
+    return bool(
+        db.execute(
+            text(
+                f"""
+                SELECT 1
+                FROM "{name}" te
+                JOIN weeks w ON w.id = te.week_id
+                WHERE w.is_locked IS NOT TRUE
+                LIMIT 1
+                """
+            )
+        ).first()
+    )
+
+
+def detach_old_time_entry_partitions(
+    db: Session,
+    *,
+    keep_months: int,
+    drop: bool = False,
+    today: date | None = None,
+) -> List[str]:
+    """
+    Detaches partitions for months that ended more than `keep_months` months
+    ago, oldest first, up to the first month with unlocked entries. Detached tables move to the `archive` schema, or are dropped when
+    `drop` is set. Caller commits. Returns the names handled.
+    """
+    if keep_months < 1:
+        raise ValueError("keep_months must be at least 1")
+
+    cutoff = _add_months(_month_start(today or datetime.now(timezone.utc).date()), -keep_months)
+
+    handled: List[str] = []
+    for p in list_time_entry_partitions(db):
+        if p.month >= cutoff:
+            break
+        if _has_unlocked_entries(db, p.name):
+            # newer months stay too: attached months must not leave gaps
+            break
+
+        db.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{p.name}"'))
+        if drop:
+            db.execute(text(f'DROP TABLE "{p.name}"'))
+        else:
+            db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            db.execute(text(f'ALTER TABLE "{p.name}" SET SCHEMA {ARCHIVE_SCHEMA}'))
+        handled.append(p.name)
+    return handled
+
+
+def default_partition_rows(db: Session) -> int:
+    return int(db.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar() or 0)
@@ -0,0 +1,255 @@
+# app/services/payroll_export.py
+"""
+Streaming payroll export (CSV / Parquet).
+
+Rows come from a server-side cursor in chunks of EXPORT_CHUNK_ROWS, and each
+chunk is encoded and handed to the response before the next one is fetched,
+so memory stays bounded regardless of how many invoices are exported.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import uuid
+from datetime import date
+from typing import Iterator, List
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.payroll_invoice import PayrollInvoice
+from app.models.store import Store
+from app.models.timeentry_weekly_agg import TimeEntryWeeklyAgg
+from app.models.week import Week
+
+EXPORT_CHUNK_ROWS = 5000
+
+INVOICE_COLUMNS: List[str] = [
+    "invoice_no",
+    "invoice_id",
+    "store_id",
+    "store_code",
+    "employee_id",
+    "week_start",
+    "pay_rate_hourly",
+    "regular_minutes",
+    "overtime_minutes",
+    "gross_pay",
+    "tax_enabled",
+    "tax_rate_percent",
+    "tax_withheld",
+    "net_pay",
+    "status",
+    "created_at",
+]
+
+AGGREGATE_COLUMNS: List[str] = [
+    "total_minutes",
+    "open_entries",
+    "out_of_zone_seconds",
+]
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_export_query(
+    *,
+    tenant_id: uuid.UUID,
+    start_date: date,
+    end_date: date,
+    store_id: uuid.UUID | None = None,
+    include_time_aggregates: bool = False,
+):
+    cols = [
+        PayrollInvoice.invoice_no.label("invoice_no"),
+        PayrollInvoice.id.label("invoice_id"),
+        PayrollInvoice.store_id.label("store_id"),
+        Store.code.label("store_code"),
+        PayrollInvoice.employee_id.label("employee_id"),
+        PayrollInvoice.week_start.label("week_start"),
+        PayrollInvoice.pay_rate_hourly.label("pay_rate_hourly"),
+        PayrollInvoice.regular_minutes.label("regular_minutes"),
+        PayrollInvoice.overtime_minutes.label("overtime_minutes"),
+        PayrollInvoice.gross_pay.label("gross_pay"),
+        PayrollInvoice.tax_enabled.label("tax_enabled"),
+        PayrollInvoice.tax_rate_percent.label("tax_rate_percent"),
+        PayrollInvoice.tax_withheld.label("tax_withheld"),
+        PayrollInvoice.net_pay.label("net_pay"),
+        PayrollInvoice.status.label("status"),
+        PayrollInvoice.created_at.label("created_at"),
+    ]
+
+    filters = [
+        PayrollInvoice.tenant_id == tenant_id,
+        PayrollInvoice.week_start >= start_date,
+        PayrollInvoice.week_start <= end_date,
+    ]
+    if store_id is not None:
+        filters.append(PayrollInvoice.store_id == store_id)
+
+    stmt_from = PayrollInvoice.__table__.join(
+        Store.__table__,
+        and_(Store.id == PayrollInvoice.store_id, Store.tenant_id == tenant_id),
+    )
+
+    if include_time_aggregates:
+        agg = (
+            select(
+                TimeEntryWeeklyAgg.store_id.label("store_id"),
+                TimeEntryWeeklyAgg.employee_id.label("employee_id"),
+                Week.week_start.label("week_start"),
+                TimeEntryWeeklyAgg.total_minutes.label("total_minutes"),
+                TimeEntryWeeklyAgg.open_entries.label("open_entries"),
+                TimeEntryWeeklyAgg.out_of_zone_seconds.label("out_of_zone_seconds"),
+            )
+            .join(Week, Week.id == TimeEntryWeeklyAgg.week_id)
+            .where(Week.week_start >= start_date, Week.week_start <= end_date)
+            .subquery("agg")
+        )
+        stmt_from = stmt_from.outerjoin(
+            agg,
+            and_(
+                agg.c.store_id == PayrollInvoice.store_id,
+                agg.c.employee_id == PayrollInvoice.employee_id,
+                agg.c.week_start == PayrollInvoice.week_start,
+            ),
+        )
+        cols += [
+            func.coalesce(agg.c.total_minutes, 0).label("total_minutes"),
+            func.coalesce(agg.c.open_entries, 0).label("open_entries"),
+            func.coalesce(agg.c.out_of_zone_seconds, 0).label("out_of_zone_seconds"),
+        ]
+
+    return (
+        select(*cols)
+        .select_from(stmt_from)
+        .where(*filters)
+        .order_by(PayrollInvoice.week_start.asc(), PayrollInvoice.invoice_no.asc())
+    )
+
+
+def _iter_chunks(stmt) -> Iterator[list]:
+    # Own session: the stream outlives the request handler that created it.
+    db: Session = SessionLocal()
+    try:
+        result = db.execute(stmt, execution_options={"yield_per": EXPORT_CHUNK_ROWS})
+        for part in result.partitions():
+            yield part
+    finally:
+        db.close()
+
+
+def _csv_value(v):
+    if v is None:
+        return ""
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if hasattr(v, "isoformat"):
+        return v.isoformat()
+    return str(v)
+
+
+def stream_csv(stmt, columns: List[str]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    writer.writerow(columns)
+    yield buf.getvalue().encode("utf-8")
+
+    for part in _iter_chunks(stmt):
+        buf.seek(0)
+        buf.truncate()
+        for row in part:
+            writer.writerow([_csv_value(v) for v in row])
+        yield buf.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file object for ParquetWriter that hands bytes out as they are
+    produced. tell() keeps counting across drains so the footer offsets stay valid.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+def _parquet_schema(columns: List[str]):
+    import pyarrow as pa
+
+    types = {
+        "invoice_no": pa.int64(),
+        "invoice_id": pa.string(),
+        "store_id": pa.string(),
+        "store_code": pa.string(),
+        "employee_id": pa.string(),
+        "week_start": pa.date32(),
+        "pay_rate_hourly": pa.decimal128(10, 2),
+        "regular_minutes": pa.int32(),
+        "overtime_minutes": pa.int32(),
+        "gross_pay": pa.decimal128(12, 2),
+        "tax_enabled": pa.bool_(),
+        "tax_rate_percent": pa.decimal128(5, 2),
+        "tax_withheld": pa.decimal128(12, 2),
+        "net_pay": pa.decimal128(12, 2),
+        "status": pa.string(),
+        "created_at": pa.timestamp("us", tz="UTC"),
+        "total_minutes": pa.int64(),
+        "open_entries": pa.int64(),
+        "out_of_zone_seconds": pa.int64(),
+    }
+    return pa.schema([(c, types[c]) for c in columns])
+
+
+def stream_parquet(stmt, columns: List[str]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(columns)
+    uuid_cols = {"invoice_id", "store_id", "employee_id"}
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for part in _iter_chunks(stmt):
+            arrays = []
+            for i, name in enumerate(columns):
+                values = [row[i] for row in part]
+                if name in uuid_cols:
+                    values = [str(v) if v is not None else None for v in values]
+                arrays.append(pa.array(values, type=schema.field(name).type))
+            # one row group per chunk
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+
+    yield sink.drain()
@@ -0,0 +1,203 @@
+# app/services/payroll_service.py
+"""
+Payroll math for one week, computed in SQL.
+
+One query per call produces, per (store, employee):
+  total/regular/overtime minutes, gross, tax withheld and net pay.
+Minutes come from time_entry_weekly_agg (see app/services/time_entry_agg.py).
+
+Rules (same as the original invoice code):
+  - minutes per entry = floor((clock_out - clock_in) / 60s), closed entries only, never negative
+  - first 40h of the week are regular, the rest overtime at 1.5x
+  - pay rate = store_memberships.pay_rate_hourly, falling back to the legacy
+    `pay_rate` string when the numeric rate is not set
+  - tax = gross * tax_rate_percent / 100 when tax is enabled
+
+Money is exact NUMERIC: every amount is a single division of an exact
+numerator, rounded half-up to cents. `compute_pay_line` is the Decimal
+reference for the same formulas.
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, List
+
+from sqlalchemy import Numeric, and_, case, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.membership import StoreMembership
+from app.models.store import Store
+from app.models.timeentry import TimeEntry
+from app.models.timeentry_weekly_agg import TimeEntryWeeklyAgg
+from app.models.week import Week
+
+REGULAR_MINUTES_CAP = 40 * 60
+OVERTIME_MULTIPLIER = Decimal("1.5")
+
+_CENTS = Decimal("0.01")
+
+
+@dataclass
+class PayLine:
+    regular_minutes: int
+    overtime_minutes: int
+    gross_pay: Decimal
+    tax_withheld: Decimal
+    net_pay: Decimal
+
+
+def compute_pay_line(
+    total_minutes: int,
+    pay_rate_hourly: Decimal,
+    tax_enabled: bool,
+    tax_rate_percent: Decimal,
+) -> PayLine:
+    """
+    Decimal reference of the SQL below (used to verify it and by callers that
+    already have minutes in hand).
+    """
+    total_minutes = max(int(total_minutes), 0)
+    regular = min(total_minutes, REGULAR_MINUTES_CAP)
+    overtime = max(total_minutes - REGULAR_MINUTES_CAP, 0)
+
+    rate = Decimal(pay_rate_hourly)
+    pct = Decimal(tax_rate_percent) if tax_enabled and Decimal(tax_rate_percent) > 0 else Decimal(0)
+
+    # pay in "rate-minutes / 60"; overtime weighs 1.5
+    weighted = regular * rate + overtime * rate * OVERTIME_MULTIPLIER
+
+    gross = weighted / 60
+    tax = weighted * pct / 6000
+    net = weighted * (100 - pct) / 6000
+
+    return PayLine(
+        regular_minutes=regular,
+        overtime_minutes=overtime,
+        gross_pay=gross.quantize(_CENTS, rounding=ROUND_HALF_UP),
+        tax_withheld=tax.quantize(_CENTS, rounding=ROUND_HALF_UP),
+        net_pay=net.quantize(_CENTS, rounding=ROUND_HALF_UP),
+    )
+
+
+def _legacy_rate_expr():
+    # legacy pay_rate is free text; only plain numbers count (anything else is 0)
+    txt = func.trim(StoreMembership.pay_rate)
+    return case(
+        (txt.op("~")(r"^[0-9]+(\.[0-9]+)?$"), cast(txt, Numeric(12, 4))),
+        else_=0,
+    )
+
+
+def membership_pay_exprs():
+    """
+    (hourly rate, tax enabled, tax percent) of an outer-joined StoreMembership,
+    with the legacy-rate fallback and no NULLs.
+    """
+    pay_rate = func.coalesce(
+        case(
+            (StoreMembership.pay_rate_hourly > 0, StoreMembership.pay_rate_hourly),
+            else_=_legacy_rate_expr(),
+        ),
+        0,
+    )
+    tax_enabled = func.coalesce(StoreMembership.tax_enabled, False)
+    tax_rate_percent = func.coalesce(StoreMembership.tax_rate_percent, 0)
+    return pay_rate, tax_enabled, tax_rate_percent
+
+
+def pay_columns(total_minutes, pay_rate, tax_enabled, tax_rate_percent) -> list:
+    """
+    SQL expressions for regular/overtime minutes and gross/tax/net given
+    column expressions for minutes, hourly rate and the tax settings.
+    Shared by payroll summaries, invoices and schedule cost forecasts.
+    """
+    regular = func.least(total_minutes, REGULAR_MINUTES_CAP)
+    overtime = func.greatest(total_minutes - REGULAR_MINUTES_CAP, 0)
+
+    pct = case(
+        (and_(tax_enabled.is_(True), tax_rate_percent > 0), tax_rate_percent),
+        else_=0,
+    )
+
+    # 2 * weighted: keeps the 1.5x exact in integers (regular*2 + overtime*3)
+    weighted2 = cast(regular * 2 + overtime * 3, Numeric) * pay_rate
+
+    return [
+        regular.label("regular_minutes"),
+        overtime.label("overtime_minutes"),
+        func.round(weighted2 / 120, 2).label("gross_pay"),
+        func.round(weighted2 * pct / 12000, 2).label("tax_withheld"),
+        func.round(weighted2 * (100 - pct) / 12000, 2).label("net_pay"),
+    ]
+
+
+def entry_minutes_expr():
+    return func.greatest(
+        func.floor(func.extract("epoch", TimeEntry.clock_out_at - TimeEntry.clock_in_at) / 60),
+        0,
+    )
+
+
+def payroll_lines_stmt(
+    *,
+    week_id: uuid.UUID,
+    store_ids: Iterable[uuid.UUID] | None = None,
+    tenant_id: uuid.UUID | None = None,
+):
+    # per-employee totals come from the maintained weekly aggregates: O(employees)
+    agg = TimeEntryWeeklyAgg
+    te = select(
+        agg.store_id.label("store_id"),
+        agg.employee_id.label("employee_id"),
+        agg.total_minutes.label("total_minutes"),
+        agg.out_of_zone_seconds.label("out_of_zone_seconds"),
+        agg.open_entries.label("open_entries"),
+    ).where(agg.week_id == week_id)
+    if store_ids is not None:
+        te = te.where(agg.store_id.in_(list(store_ids)))
+    if tenant_id is not None:
+        te = te.join(Store, and_(Store.id == agg.store_id, Store.tenant_id == tenant_id))
+    te = te.subquery("te")
+
+    pay_rate, tax_enabled, tax_rate_percent = membership_pay_exprs()
+
+    return (
+        select(
+            te.c.store_id,
+            te.c.employee_id,
+            te.c.total_minutes,
+            te.c.out_of_zone_seconds,
+            te.c.open_entries,
+            pay_rate.label("pay_rate_hourly"),
+            tax_enabled.label("tax_enabled"),
+            tax_rate_percent.label("tax_rate_percent"),
+            *pay_columns(te.c.total_minutes, pay_rate, tax_enabled, tax_rate_percent),
+        )
+        .select_from(te)
+        .outerjoin(
+            StoreMembership,
+            and_(
+                StoreMembership.store_id == te.c.store_id,
+                StoreMembership.user_id == te.c.employee_id,
+                StoreMembership.is_active.is_(True),
+            ),
+        )
+        .order_by(te.c.store_id.asc(), te.c.employee_id.asc())
+    )
+
+
+def week_payroll_lines(
+    db: Session,
+    *,
+    week: Week,
+    store_ids: Iterable[uuid.UUID] | None = None,
+    tenant_id: uuid.UUID | None = None,
+) -> List:
+    """
+    Payroll lines for a week: one store, several stores, or a whole tenant.
+    """
+    stmt = payroll_lines_stmt(week_id=week.id, store_ids=store_ids, tenant_id=tenant_id)
+    return db.execute(stmt).all()
@@ -0,0 +1,106 @@
+# app/services/report_cache.py
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.week import Week
+from app.models.week_report_cache import WeekReportCache
+
+
+def get_or_compute_week_report(
+    db: Session,
+    *,
+    kind: str,
+    store_id,
+    week: Week,
+    compute: Callable[[], Dict],
+) -> Dict:
+    """
+    Returns the report payload for one store + week.
+    Locked weeks are computed once and served from `week_report_cache` afterwards;
+    open weeks are always recomputed (their data can still change). The cache
+    row is written in its own transaction; `db` is not committed.
+    """
+    if week.is_locked:
+        cached = (
+            db.query(WeekReportCache.payload)
+            .filter(
+                WeekReportCache.report_kind == kind,
+                WeekReportCache.store_id == store_id,
+                WeekReportCache.week_id == week.id,
+            )
+            .first()
+        )
+        if cached:
+            return cached.payload
+
+    payload = compute()
+
+    if week.is_locked:
+        _store_payloads(db, kind=kind, week=week, payloads={store_id: payload})
+
+    return payload
+
+
+def get_or_compute_week_reports(
+    db: Session,
+    *,
+    kind: str,
+    store_ids: List,
+    week: Week,
+    compute: Callable[[List], Dict],
+) -> Dict:
+    """
+    get_or_compute_week_report for many stores: {store_id: payload}. One
+    cache read for all of them, and one compute(missing_store_ids) call for
+    the stores not cached.
+    """
+    payloads: Dict = {}
+    if week.is_locked and store_ids:
+        rows = (
+            db.query(WeekReportCache.store_id, WeekReportCache.payload)
+            .filter(
+                WeekReportCache.report_kind == kind,
+                WeekReportCache.store_id.in_(store_ids),
+                WeekReportCache.week_id == week.id,
+            )
+            .all()
+        )
+        payloads = {r.store_id: r.payload for r in rows}
+
+    missing = [sid for sid in store_ids if sid not in payloads]
+    if not missing:
+        return payloads
+
+    computed = compute(missing)
+    payloads.update(computed)
+
+    if week.is_locked:
+        _store_payloads(db, kind=kind, week=week, payloads={sid: computed[sid] for sid in missing})
+
+    return payloads
+
+
+def _store_payloads(db: Session, *, kind: str, week: Week, payloads: Dict) -> None:
+    # own short transaction: the caller's session is left uncommitted
+    with db.get_bind().begin() as conn:
+        # two requests may race on the same week; first writer wins
+        conn.execute(
+            insert(WeekReportCache)
+            .values(
+                [
+                    {"report_kind": kind, "store_id": sid, "week_id": week.id, "payload": payload}
+                    for sid, payload in payloads.items()
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_week_report_cache_kind_store_week")
+        )
+
+
+def drop_week_reports(db: Session, week_id) -> None:
+    # caller commits
+    db.query(WeekReportCache).filter(WeekReportCache.week_id == week_id).delete(synchronize_session=False)
@@ -0,0 +1,297 @@
+# app/services/schedule_constraints.py
+"""
+Constraint checking for a schedule.
+
+ScheduleConstraints loads, once, everything the rules need for a schedule's
+week (optionally for a subset of employees):
+
+  - each employee's assigned shifts that week, across all stores, as a sorted
+    interval list, plus running minute totals
+  - approved leave in the store, as UTC intervals (store-local days)
+  - availability windows: rows + recurring patterns (availability_service)
+
+A single assignment is then checked with bisect lookups, O(log n) per
+employee, and `add()` keeps the state current, so a batch of mutations or a
+full-week sweep never goes back to the database.
+
+Errors block a mutation; warnings are reported by the validation endpoint.
+  overlap               error    employee already works an overlapping shift
+  on_leave              error    shift overlaps approved leave
+  overstaffed           error    more assignments than headcount_required
+  outside_availability  warning  no availability window covers the shift
+  weekly_hours          warning  week total passes the regular-hours cap
+  understaffed          warning  fewer assignments than headcount_required
+"""
+
+from __future__ import annotations
+
+import uuid
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.leave_request import LeaveRequest
+from app.models.schedule import Schedule, Shift, ShiftAssignment
+from app.models.store import Store
+from app.models.week import Week
+from app.services.availability_service import week_availability_windows
+from app.services.leave_conflicts import leave_utc_bounds
+from app.services.payroll_service import REGULAR_MINUTES_CAP
+
+Interval = Tuple[datetime, datetime]
+
+
+@dataclass
+class Violation:
+    code: str
+    severity: str  # error | warning
+    message: str
+    shift_id: uuid.UUID | None = None
+    employee_id: uuid.UUID | None = None
+    assignment_id: uuid.UUID | None = None
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _minutes(start: datetime, end: datetime) -> int:
+    return int((end - start).total_seconds() // 60)
+
+
+@dataclass
+class _EmployeeState:
+    # (start, end, shift_id), sorted by start; may overlap only if already invalid
+    shifts: List[Tuple[datetime, datetime, uuid.UUID]] = field(default_factory=list)
+    # max_end[k] = latest end among shifts[: k + 1]; finds long earlier shifts
+    max_end: List[datetime] = field(default_factory=list)
+    minutes: int = 0
+    # sorted, merged
+    leave: List[Interval] = field(default_factory=list)
+    available: List[Interval] = field(default_factory=list)
+
+    def reindex(self, start: int = 0) -> None:
+        del self.max_end[start:]
+        for _, end, _ in self.shifts[start:]:
+            self.max_end.append(max(self.max_end[-1], end) if self.max_end else end)
+
+
+def _merge(intervals: Iterable[Interval]) -> List[Interval]:
+    out: List[Interval] = []
+    for s, e in sorted(intervals):
+        if out and s <= out[-1][1]:
+            if e > out[-1][1]:
+                out[-1] = (out[-1][0], e)
+        else:
+            out.append((s, e))
+    return out
+
+
+def _overlapping(merged: List[Interval], start: datetime, end: datetime) -> bool:
+    # merged intervals are disjoint and sorted, so ends are sorted too
+    i = bisect_right(merged, (start, datetime.max.replace(tzinfo=timezone.utc)))
+    if i and merged[i - 1][1] > start:
+        return True
+    return i < len(merged) and merged[i][0] < end
+
+
+def _covered(merged: List[Interval], start: datetime, end: datetime) -> bool:
+    i = bisect_right(merged, (start, datetime.max.replace(tzinfo=timezone.utc)))
+    return bool(i) and merged[i - 1][0] <= start and merged[i - 1][1] >= end
+
+
+class ScheduleConstraints:
+    def __init__(self, schedule: Schedule, week: Week, *, hours_cap_minutes: int = REGULAR_MINUTES_CAP):
+        self.schedule = schedule
+        self.week = week
+        self.hours_cap_minutes = hours_cap_minutes
+        self.employees: Dict[uuid.UUID, _EmployeeState] = {}
+
+    # ---------------------------
+    # Loading
+    # ---------------------------
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        schedule: Schedule,
+        *,
+        employee_ids: Iterable[uuid.UUID] | None = None,
+    ) -> "ScheduleConstraints":
+        """
+        Three queries (assignments, leave, availability) for the schedule's
+        week; restricted to `employee_ids` when given.
+        """
+        week = db.query(Week).filter(Week.id == schedule.week_id).one()
+        self = cls(schedule, week)
+        ids = set(employee_ids) if employee_ids is not None else None
+
+        # every assignment that week, any store: double-booking is a conflict everywhere
+        stmt = (
+            select(ShiftAssignment.employee_id, Shift.id, Shift.start_at, Shift.end_at)
+            .join(Shift, Shift.id == ShiftAssignment.shift_id)
+            .join(Schedule, Schedule.id == Shift.schedule_id)
+            .where(Schedule.week_id == schedule.week_id)
+        )
+        if ids is not None:
+            stmt = stmt.where(ShiftAssignment.employee_id.in_(ids))
+        for emp_id, shift_id, start, end in db.execute(stmt):
+            self._state(emp_id).shifts.append((_utc(start), _utc(end), shift_id))
+
+        tz_name = db.execute(select(Store.timezone).where(Store.id == schedule.store_id)).scalar()
+        leave_stmt = select(LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date).where(
+            LeaveRequest.store_id == schedule.store_id,
+            LeaveRequest.status == "approved",
+            LeaveRequest.start_date <= week.week_end,
+            LeaveRequest.end_date >= week.week_start,
+        )
+        if ids is not None:
+            leave_stmt = leave_stmt.where(LeaveRequest.employee_id.in_(ids))
+        leave: Dict[uuid.UUID, List[Interval]] = {}
+        for emp_id, start_date, end_date in db.execute(leave_stmt):
+            leave.setdefault(emp_id, []).append(leave_utc_bounds(start_date, end_date, tz_name))
+
+        available = week_availability_windows(db, store_id=schedule.store_id, week=week, employee_ids=ids)
+
+        for emp_id, intervals in leave.items():
+            self._state(emp_id).leave = _merge(intervals)
+        for emp_id, intervals in available.items():
+            self._state(emp_id).available = _merge(intervals)
+        for st in self.employees.values():
+            st.shifts.sort()
+            st.reindex()
+            st.minutes = sum(_minutes(s, e) for s, e, _ in st.shifts)
+        return self
+
+    def _state(self, employee_id: uuid.UUID) -> _EmployeeState:
+        st = self.employees.get(employee_id)
+        if st is None:
+            st = self.employees[employee_id] = _EmployeeState()
+        return st
+
+    # ---------------------------
+    # Incremental checks
+    # ---------------------------
+    def check_assign(self, employee_id: uuid.UUID, shift: Shift) -> List[Violation]:
+        """
+        Violations that assigning `employee_id` to `shift` would introduce.
+        """
+        st = self.employees.get(employee_id) or _EmployeeState()
+        start, end = _utc(shift.start_at), _utc(shift.end_at)
+        out: List[Violation] = []
+
+        # shifts starting before we end, walked back while one of them (by
+        # the running max) still ends after we start; the list may already
+        # hold overlaps, so the nearest neighbour alone is not enough
+        k = bisect_left(st.shifts, (end,)) - 1
+        while k >= 0 and st.max_end[k] > start:
+            other = st.shifts[k]
+            k -= 1
+            if other[2] != shift.id and other[1] > start:
+                out.append(
+                    Violation(
+                        code="overlap",
+                        severity="error",
+                        message=f"Employee already works overlapping shift {other[2]}",
+                        shift_id=shift.id,
+                        employee_id=employee_id,
+                    )
+                )
+                break
+
+        if _overlapping(st.leave, start, end):
+            out.append(
+                Violation(
+                    code="on_leave",
+                    severity="error",
+                    message="Shift overlaps approved leave",
+                    shift_id=shift.id,
+                    employee_id=employee_id,
+                )
+            )
+
+        if not _covered(st.available, start, end):
+            out.append(
+                Violation(
+                    code="outside_availability",
+                    severity="warning",
+                    message="No availability window covers the shift",
+                    shift_id=shift.id,
+                    employee_id=employee_id,
+                )
+            )
+
+        total = st.minutes + _minutes(start, end)
+        if total > self.hours_cap_minutes:
+            out.append(
+                Violation(
+                    code="weekly_hours",
+                    severity="warning",
+                    message=f"Week total {total / 60:.2f}h exceeds {self.hours_cap_minutes / 60:.0f}h",
+                    shift_id=shift.id,
+                    employee_id=employee_id,
+                )
+            )
+        return out
+
+    def add(self, employee_id: uuid.UUID, shift: Shift) -> None:
+        start, end = _utc(shift.start_at), _utc(shift.end_at)
+        st = self._state(employee_id)
+        item = (start, end, shift.id)
+        i = bisect_left(st.shifts, item)
+        st.shifts.insert(i, item)
+        st.reindex(i)
+        st.minutes += _minutes(start, end)
+
+    # ---------------------------
+    # Full-week validation
+    # ---------------------------
+    def validate(self, shifts: Iterable[Shift]) -> List[Violation]:
+        """
+        All violations of the schedule's shifts and assignments in one pass:
+        assignments are replayed in start order against the loaded leave and
+        availability, with interval sets rebuilt from the other stores' shifts.
+        """
+        shifts = sorted(shifts, key=lambda s: _utc(s.start_at))
+        own = {s.id for s in shifts}
+
+        # keep only shifts from other schedules; this schedule's are replayed
+        for st in self.employees.values():
+            st.shifts = [x for x in st.shifts if x[2] not in own]
+            st.reindex()
+            st.minutes = sum(_minutes(s, e) for s, e, _ in st.shifts)
+
+        out: List[Violation] = []
+        for sh in shifts:
+            n = len(sh.assignments or [])
+            if n > sh.headcount_required:
+                out.append(
+                    Violation(
+                        code="overstaffed",
+                        severity="error",
+                        message=f"{n} assigned, {sh.headcount_required} required",
+                        shift_id=sh.id,
+                    )
+                )
+            elif n < sh.headcount_required:
+                out.append(
+                    Violation(
+                        code="understaffed",
+                        severity="warning",
+                        message=f"{n} assigned, {sh.headcount_required} required",
+                        shift_id=sh.id,
+                    )
+                )
+
+            for a in sorted(sh.assignments or [], key=lambda a: a.assigned_at):
+                for v in self.check_assign(a.employee_id, sh):
+                    v.assignment_id = a.id
+                    out.append(v)
+                self.add(a.employee_id, sh)
+        return out
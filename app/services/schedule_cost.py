@@ -0,0 +1,113 @@
+# app/services/schedule_cost.py
+"""
+Projected labor cost of a schedule, before anyone clocks in.
+
+Scheduled minutes per employee (assigned shifts of the schedule) go through
+the same SQL as payroll invoices: membership pay rate with the legacy
+fallback, the first 40h regular and the rest at 1.5x, tax when enabled
+(payroll_service.pay_columns). One grouped query per schedule.
+
+Results are memoized in-process per (schedule_id, schedule.version); any
+change to the schedule or the store's pay settings bumps the version.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict
+
+from sqlalchemy import Integer, and_, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.models.membership import StoreMembership
+from app.models.schedule import Schedule, Shift, ShiftAssignment
+from app.services.payroll_service import membership_pay_exprs, pay_columns
+
+_MEMO_MAX = 512
+_memo: "OrderedDict[tuple, Dict]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def forecast_lines_stmt(schedule: Schedule):
+    minutes = cast(func.greatest(func.floor(func.extract("epoch", Shift.end_at - Shift.start_at) / 60), 0), Integer)
+    sched = (
+        select(
+            ShiftAssignment.employee_id.label("employee_id"),
+            func.count(ShiftAssignment.id).label("shifts"),
+            cast(func.sum(minutes), Integer).label("total_minutes"),
+        )
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .where(Shift.schedule_id == schedule.id)
+        .group_by(ShiftAssignment.employee_id)
+        .subquery("sched")
+    )
+    pay_rate, tax_enabled, tax_rate_percent = membership_pay_exprs()
+
+    return (
+        select(
+            sched.c.employee_id,
+            sched.c.shifts,
+            sched.c.total_minutes,
+            pay_rate.label("pay_rate_hourly"),
+            *pay_columns(sched.c.total_minutes, pay_rate, tax_enabled, tax_rate_percent),
+        )
+        .select_from(sched)
+        .outerjoin(
+            StoreMembership,
+            and_(
+                StoreMembership.store_id == schedule.store_id,
+                StoreMembership.user_id == sched.c.employee_id,
+                StoreMembership.is_active.is_(True),
+            ),
+        )
+        .order_by(sched.c.employee_id.asc())
+    )
+
+
+def schedule_cost_forecast(db: Session, schedule: Schedule) -> Dict:
+    key = (schedule.id, schedule.version)
+    with _memo_lock:
+        hit = _memo.get(key)
+        if hit is not None:
+            _memo.move_to_end(key)
+            return hit
+
+    lines = []
+    totals = {
+        "scheduled_minutes": 0,
+        "regular_minutes": 0,
+        "overtime_minutes": 0,
+        "gross_pay": Decimal("0"),
+        "tax_withheld": Decimal("0"),
+        "net_pay": Decimal("0"),
+    }
+    for r in db.execute(forecast_lines_stmt(schedule)):
+        line = {
+            "employee_id": r.employee_id,
+            "shifts": int(r.shifts),
+            "scheduled_minutes": int(r.total_minutes),
+            "regular_minutes": int(r.regular_minutes),
+            "overtime_minutes": int(r.overtime_minutes),
+            "pay_rate_hourly": r.pay_rate_hourly,
+            "gross_pay": r.gross_pay,
+            "tax_withheld": r.tax_withheld,
+            "net_pay": r.net_pay,
+        }
+        lines.append(line)
+        for k in totals:
+            totals[k] += line[k]
+
+    result = {
+        "schedule_id": schedule.id,
+        "version": schedule.version,
+        **totals,
+        "lines": lines,
+    }
+    with _memo_lock:
+        _memo[key] = result
+        _memo.move_to_end(key)
+        while len(_memo) > _MEMO_MAX:
+            _memo.popitem(last=False)
+    return result
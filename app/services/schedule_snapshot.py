@@ -0,0 +1,135 @@
+# app/services/schedule_snapshot.py
+"""
+Published schedules are served from a pre-rendered snapshot.
+
+Publishing renders the schedule, its shifts and assignments once, through the
+same ScheduleOut schema the endpoint uses, and stores the response bytes: JSON always, msgpack when the `msgpack` package is
+installed. Reads return those bytes as-is. Unpublishing deletes the snapshot;
+editing is only possible while unpublished, so a snapshot never goes stale.
+It holds no data from other tables (e.g. user names), which could change
+underneath it.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.schedule import Schedule, Shift, ShiftAssignment
+from app.models.schedule_snapshot import ScheduleSnapshot
+from app.schemas.schedule import ScheduleOut
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def msgpack_available() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def schedule_doc(db: Session, schedule) -> Dict:
+    """
+    Plain-dict document of a schedule (anything with the Schedule columns as
+    attributes: ORM object or Core row), shaped like ScheduleOut.
+    """
+    shifts = db.execute(
+        select(Shift.__table__).where(Shift.schedule_id == schedule.id).order_by(Shift.start_at.asc())
+    ).mappings().all()
+
+    assignments: Dict[uuid.UUID, List[Dict]] = {s["id"]: [] for s in shifts}
+    if shifts:
+        stmt = select(
+            ShiftAssignment.id,
+            ShiftAssignment.shift_id,
+            ShiftAssignment.employee_id,
+            ShiftAssignment.assigned_at,
+        )
+        rows = db.execute(
+            stmt.where(ShiftAssignment.shift_id.in_(list(assignments))).order_by(ShiftAssignment.assigned_at.asc())
+        ).mappings()
+        for a in rows:
+            assignments[a["shift_id"]].append(dict(a))
+
+    return {
+        "id": schedule.id,
+        "store_id": schedule.store_id,
+        "week_id": schedule.week_id,
+        "is_published": schedule.is_published,
+        "created_at": schedule.created_at,
+        "shifts": [{**s, "assignments": assignments[s["id"]]} for s in shifts],
+    }
+
+
+def render_schedule_doc(db: Session, schedule: Schedule) -> ScheduleOut:
+    return ScheduleOut.model_validate(schedule_doc(db, schedule))
+
+
+def write_snapshot(db: Session, schedule: Schedule) -> None:
+    """
+    Renders and stores the snapshot of a (published) schedule. Caller commits.
+    """
+    doc = render_schedule_doc(db, schedule)
+
+    json_body = doc.model_dump_json().encode("utf-8")
+    msgpack_body = None
+    if msgpack_available():
+        import msgpack
+
+        msgpack_body = msgpack.packb(doc.model_dump(mode="json"))
+
+    stmt = insert(ScheduleSnapshot).values(
+        schedule_id=schedule.id,
+        store_id=schedule.store_id,
+        week_id=schedule.week_id,
+        json_body=json_body,
+        msgpack_body=msgpack_body,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ScheduleSnapshot.schedule_id],
+            set_={
+                "json_body": stmt.excluded.json_body,
+                "msgpack_body": stmt.excluded.msgpack_body,
+                "created_at": func.now(),
+            },
+        )
+    )
+
+
+def drop_snapshot(db: Session, schedule_id: uuid.UUID) -> None:
+    # caller commits
+    db.query(ScheduleSnapshot).filter(ScheduleSnapshot.schedule_id == schedule_id).delete(
+        synchronize_session=False
+    )
+
+
+def get_snapshot_body(
+    db: Session,
+    *,
+    store_id: uuid.UUID,
+    week_id: uuid.UUID,
+    want_msgpack: bool = False,
+) -> tuple[bytes, str] | None:
+    """
+    (body, media type) of the published snapshot, or None when the schedule
+    is not published. msgpack is returned only when asked for and stored.
+    """
+    row = db.execute(
+        select(ScheduleSnapshot.json_body, ScheduleSnapshot.msgpack_body).where(
+            ScheduleSnapshot.store_id == store_id,
+            ScheduleSnapshot.week_id == week_id,
+        )
+    ).first()
+    if not row:
+        return None
+    if want_msgpack and row.msgpack_body is not None:
+        return bytes(row.msgpack_body), MSGPACK_MEDIA_TYPE
+    return bytes(row.json_body), JSON_MEDIA_TYPE
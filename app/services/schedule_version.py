@@ -0,0 +1,50 @@
+# app/services/schedule_version.py
+"""
+schedules.version: a counter bumped by every change that affects results
+derived from a schedule (shifts, assignments, the store's pay settings), so
+caches can key on (schedule_id, version) instead of tracking invalidation.
+bump_schedule_versions also drops the schedules' cached documents in every
+worker (app/core/cache.py).
+
+Both helpers run in the caller's transaction; caller commits.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Iterable
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.cache import invalidate
+from app.models.schedule import Schedule
+
+
+def schedule_cache_key(store_id: uuid.UUID, week_id: uuid.UUID) -> str:
+    return f"{store_id}:{week_id}"
+
+
+def bump_schedule_versions(db: Session, schedule_ids: Iterable[uuid.UUID]) -> None:
+    ids = list(schedule_ids)
+    if not ids:
+        return
+    rows = db.execute(
+        update(Schedule)
+        .where(Schedule.id.in_(ids))
+        .values(version=Schedule.version + 1)
+        .returning(Schedule.store_id, Schedule.week_id)
+        .execution_options(synchronize_session=False)
+    )
+    for store_id, week_id in rows:
+        invalidate(db, "schedules", schedule_cache_key(store_id, week_id))
+
+
+def bump_store_schedule_versions(db: Session, store_id: uuid.UUID) -> None:
+    # pay settings changed: every forecast for the store is stale
+    db.execute(
+        update(Schedule)
+        .where(Schedule.store_id == store_id)
+        .values(version=Schedule.version + 1)
+        .execution_options(synchronize_session=False)
+    )
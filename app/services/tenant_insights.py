@@ -0,0 +1,129 @@
+# app/services/tenant_insights.py
+"""
+Per-tenant usage counts for the developer portal.
+
+One grouped query per table for any number of tenants (schedules and time
+entries are tenant-scoped through their store). Runs inline or as the
+"developer.tenant_insights" background job.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Dict, Iterable, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.payroll_invoice import PayrollInvoice
+from app.models.schedule import Schedule
+from app.models.store import Store
+from app.models.tenant import Tenant
+from app.models.timeentry import TimeEntry
+from app.models.user import User
+from app.services.jobs import JobContext, job_handler
+
+JOB_KIND = "developer.tenant_insights"
+
+_COUNTS = (
+    "stores_count",
+    "users_count",
+    "active_users_count",
+    "managers_count",
+    "employees_count",
+    "schedules_count",
+    "published_schedules_count",
+    "open_time_entries_count",
+    "invoices_count",
+)
+
+
+def tenant_insights(db: Session, tenant_ids: Iterable[uuid.UUID] | None = None) -> List[Dict]:
+    """
+    TenantInsightsOut-shaped dicts, ordered by tenant name; all tenants when
+    tenant_ids is None.
+    """
+    tenants_stmt = select(Tenant.id, Tenant.code, Tenant.name, Tenant.is_active).order_by(Tenant.name.asc())
+    ids = list(tenant_ids) if tenant_ids is not None else None
+    if ids is not None:
+        tenants_stmt = tenants_stmt.where(Tenant.id.in_(ids))
+    tenants = db.execute(tenants_stmt).all()
+    if not tenants:
+        return []
+
+    out: Dict[uuid.UUID, Dict] = {
+        t.id: {
+            "tenant_id": t.id,
+            "tenant_code": t.code,
+            "tenant_name": t.name,
+            "is_active": bool(t.is_active),
+            **{k: 0 for k in _COUNTS},
+        }
+        for t in tenants
+    }
+    scope = list(out)
+
+    def fill(stmt, *keys: str) -> None:
+        for row in db.execute(stmt):
+            line = out.get(row[0])
+            if line is not None:
+                for k, v in zip(keys, row[1:]):
+                    line[k] = int(v or 0)
+
+    fill(
+        select(Store.tenant_id, func.count(Store.id)).where(Store.tenant_id.in_(scope)).group_by(Store.tenant_id),
+        "stores_count",
+    )
+
+    fill(
+        select(
+            User.tenant_id,
+            func.count(User.id),
+            func.count(User.id).filter(func.lower(User.status) == "active"),
+            func.count(User.id).filter(func.lower(User.role) == "manager"),
+            func.count(User.id).filter(func.lower(User.role) == "employee"),
+        )
+        .where(User.tenant_id.in_(scope))
+        .group_by(User.tenant_id),
+        "users_count",
+        "active_users_count",
+        "managers_count",
+        "employees_count",
+    )
+
+    fill(
+        select(
+            Store.tenant_id,
+            func.count(Schedule.id),
+            func.count(Schedule.id).filter(Schedule.is_published.is_(True)),
+        )
+        .join(Store, Store.id == Schedule.store_id)
+        .where(Store.tenant_id.in_(scope))
+        .group_by(Store.tenant_id),
+        "schedules_count",
+        "published_schedules_count",
+    )
+
+    fill(
+        select(Store.tenant_id, func.count(TimeEntry.id))
+        .join(Store, Store.id == TimeEntry.store_id)
+        .where(Store.tenant_id.in_(scope), TimeEntry.clock_out_at.is_(None))
+        .group_by(Store.tenant_id),
+        "open_time_entries_count",
+    )
+
+    fill(
+        select(PayrollInvoice.tenant_id, func.count(PayrollInvoice.id))
+        .where(PayrollInvoice.tenant_id.in_(scope))
+        .group_by(PayrollInvoice.tenant_id),
+        "invoices_count",
+    )
+
+    return list(out.values())
+
+
+@job_handler(JOB_KIND)
+def _tenant_insights_job(ctx: JobContext) -> list:
+    tenant_ids = ctx.params.get("tenant_ids")
+    lines = tenant_insights(ctx.db, [uuid.UUID(t) for t in tenant_ids] if tenant_ids is not None else None)
+    return [{**line, "tenant_id": str(line["tenant_id"])} for line in lines]
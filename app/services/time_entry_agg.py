@@ -0,0 +1,140 @@
+# app/services/time_entry_agg.py
+"""
+Maintenance of time_entry_weekly_agg.
+
+The record_* helpers run inside the caller's transaction (before commit), so
+the aggregate row changes atomically with the time entry itself.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import case, func, select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.timeentry import TimeEntry
+from app.models.timeentry_weekly_agg import TimeEntryWeeklyAgg
+from app.models.week import Week
+from app.services.partition_maintenance import week_entries_detached
+from app.services.payroll_service import entry_minutes_expr
+from app.services.week_service import get_week_clock_in_bounds
+
+_PK = ["store_id", "week_id", "employee_id"]
+
+
+def _bump(db: Session, stmt) -> None:
+    agg = TimeEntryWeeklyAgg.__table__.c
+    ex = stmt.excluded
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=_PK,
+            set_={
+                "total_minutes": agg.total_minutes + ex.total_minutes,
+                "open_entries": func.greatest(agg.open_entries + ex.open_entries, 0),
+                "out_of_zone_seconds": agg.out_of_zone_seconds + ex.out_of_zone_seconds,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def record_clock_in(db: Session, entry: TimeEntry) -> None:
+    _bump(
+        db,
+        insert(TimeEntryWeeklyAgg).values(
+            store_id=entry.store_id,
+            week_id=entry.week_id,
+            employee_id=entry.employee_id,
+            total_minutes=0,
+            open_entries=1,
+            out_of_zone_seconds=0,
+        ),
+    )
+
+
+def record_clock_out(db: Session, entry: TimeEntry) -> None:
+    # the caller holds the entry's row lock (SELECT ... FOR UPDATE) and saw it
+    # open; minutes are computed by the DB from the stored row, like rebuild_week
+    db.flush()
+    src = select(
+        TimeEntry.store_id,
+        TimeEntry.week_id,
+        TimeEntry.employee_id,
+        entry_minutes_expr(),
+        -1,
+        0,
+    ).where(TimeEntry.id == entry.id)
+    _bump(
+        db,
+        insert(TimeEntryWeeklyAgg).from_select(
+            ["store_id", "week_id", "employee_id", "total_minutes", "open_entries", "out_of_zone_seconds"],
+            src,
+        ),
+    )
+
+
+def record_out_of_zone(db: Session, entry: TimeEntry, seconds: int) -> None:
+    if seconds <= 0:
+        return
+    _bump(
+        db,
+        insert(TimeEntryWeeklyAgg).values(
+            store_id=entry.store_id,
+            week_id=entry.week_id,
+            employee_id=entry.employee_id,
+            total_minutes=0,
+            open_entries=0,
+            out_of_zone_seconds=seconds,
+        ),
+    )
+
+
+def rebuild_week(db: Session, *, week: Week, store_id: uuid.UUID | None = None) -> int:
+    """
+    Recomputes the aggregate rows of a week (optionally one store) from
+    time_entries. Caller commits. Returns the number of rows written.
+
+    Raises ValueError for weeks whose entries left time_entries (archived,
+    or in a detached partition): the aggregates are all that is left of them.
+    """
+    if week.archived_at is not None:
+        raise ValueError("Week is archived; its time entries are no longer available to rebuild from")
+    if week_entries_detached(db, week.week_start):
+        raise ValueError("Week's time entries were detached from time_entries; nothing to rebuild from")
+
+    lo, hi = get_week_clock_in_bounds(week.week_start)
+    agg_filters = [TimeEntryWeeklyAgg.week_id == week.id]
+    te_filters = [
+        TimeEntry.week_id == week.id,
+        TimeEntry.clock_in_at >= lo,
+        TimeEntry.clock_in_at < hi,
+    ]
+    if store_id is not None:
+        agg_filters.append(TimeEntryWeeklyAgg.store_id == store_id)
+        te_filters.append(TimeEntry.store_id == store_id)
+
+    db.execute(delete(TimeEntryWeeklyAgg).where(*agg_filters))
+
+    src = (
+        select(
+            TimeEntry.store_id,
+            TimeEntry.week_id,
+            TimeEntry.employee_id,
+            func.coalesce(
+                func.sum(case((TimeEntry.clock_out_at.isnot(None), entry_minutes_expr()), else_=0)), 0
+            ),
+            func.count(TimeEntry.id).filter(TimeEntry.clock_out_at.is_(None)),
+            func.coalesce(func.sum(TimeEntry.out_of_zone_seconds), 0),
+        )
+        .where(*te_filters)
+        .group_by(TimeEntry.store_id, TimeEntry.week_id, TimeEntry.employee_id)
+    )
+    result = db.execute(
+        insert(TimeEntryWeeklyAgg).from_select(
+            ["store_id", "week_id", "employee_id", "total_minutes", "open_entries", "out_of_zone_seconds"],
+            src,
+        )
+    )
+    return result.rowcount or 0
@@ -0,0 +1,232 @@
+# app/services/variance_report_service.py
+"""
+Scheduled vs actual: assigned shifts matched against time entries.
+
+Two ordered queries per week for any number of stores, both sorted by
+(store, employee, start): assigned shifts and time entries. One merge pass
+per employee then walks both streams together:
+
+  - entries overlapping a shift are that shift's attendance (an entry running
+    past the shift's end stays a candidate for the next shift: double shifts
+    clocked once)
+  - a shift that has started with no entry is a no-show
+  - lateness = first clock-in after the shift start; early leave = last
+    clock-out before the shift end (counted past GRACE_MINUTES, minutes
+    summed in full)
+  - entries matching no shift are unscheduled work
+
+Open entries count as still on the clock. Locked weeks are cached in
+week_report_cache like the geofence report.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.schedule import Schedule, Shift, ShiftAssignment
+from app.models.store import Store
+from app.models.timeentry import TimeEntry
+from app.models.week import Week
+from app.services.report_cache import get_or_compute_week_reports
+from app.services.week_service import get_week_clock_in_bounds
+
+REPORT_KIND = "variance"
+
+GRACE_MINUTES = 5
+
+_COUNTERS = (
+    "scheduled_shifts",
+    "scheduled_minutes",
+    "worked_entries",
+    "worked_minutes",
+    "no_shows",
+    "late_count",
+    "late_minutes",
+    "early_leave_count",
+    "early_leave_minutes",
+    "unscheduled_entries",
+    "unscheduled_minutes",
+)
+
+
+def _utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _minutes(start: datetime, end: datetime) -> int:
+    return max(int((end - start).total_seconds() // 60), 0)
+
+
+def _new_line(employee_id) -> Dict:
+    return {"employee_id": str(employee_id), **{k: 0 for k in _COUNTERS}}
+
+
+def _merge_employee(line: Dict, shifts: List, entries: List, now: datetime) -> None:
+    """
+    shifts: [(start, end)] sorted; entries: [(clock_in, clock_out | None)]
+    sorted. Fills `line`; each shift looks at the entries from the first one
+    still running at its start.
+    """
+    ends = [out if out is not None else max(now, cin) for cin, out in entries]
+    used = [False] * len(entries)
+
+    line["scheduled_shifts"] += len(shifts)
+    line["worked_entries"] += len(entries)
+    for (cin, out) in entries:
+        if out is not None:
+            line["worked_minutes"] += _minutes(cin, out)
+
+    j = 0
+    for start, end in shifts:
+        line["scheduled_minutes"] += _minutes(start, end)
+
+        # leading entries finished before this shift starts (later shifts
+        # start no earlier, so they are done for good)
+        while j < len(entries) and ends[j] <= start:
+            j += 1
+
+        first_in = None
+        last_out = None
+        k = j
+        while k < len(entries) and entries[k][0] < end:
+            # sorted by clock-in, not by end: a short entry behind a long
+            # one may have ended before this shift
+            if ends[k] <= start:
+                k += 1
+                continue
+            used[k] = True
+            cin, out = entries[k]
+            if first_in is None:
+                first_in = cin
+            last_out = ends[k] if last_out is None else max(last_out, ends[k])
+            k += 1
+
+        if first_in is None:
+            if start < now:
+                line["no_shows"] += 1
+            continue
+
+        late = _minutes(start, first_in)
+        line["late_minutes"] += late
+        if late > GRACE_MINUTES:
+            line["late_count"] += 1
+
+        if last_out < now:
+            early = _minutes(last_out, end)
+            line["early_leave_minutes"] += early
+            if early > GRACE_MINUTES:
+                line["early_leave_count"] += 1
+
+    for idx, (cin, _) in enumerate(entries):
+        if not used[idx]:
+            line["unscheduled_entries"] += 1
+            line["unscheduled_minutes"] += _minutes(cin, ends[idx])
+
+
+def compute_week_variances(db: Session, store_ids: List, week: Week) -> Dict:
+    """
+    {store_id: per-employee totals (JSON-ready)} for the stores' week.
+    """
+    now = datetime.now(timezone.utc)
+
+    shift_rows = db.execute(
+        select(Schedule.store_id, ShiftAssignment.employee_id, Shift.start_at, Shift.end_at)
+        .join(Shift, Shift.id == ShiftAssignment.shift_id)
+        .join(Schedule, Schedule.id == Shift.schedule_id)
+        .where(Schedule.store_id.in_(store_ids), Schedule.week_id == week.id)
+        .order_by(Schedule.store_id.asc(), ShiftAssignment.employee_id.asc(), Shift.start_at.asc())
+    ).all()
+
+    lo, hi = get_week_clock_in_bounds(week.week_start)
+    entry_rows = db.execute(
+        select(TimeEntry.store_id, TimeEntry.employee_id, TimeEntry.clock_in_at, TimeEntry.clock_out_at)
+        .where(
+            TimeEntry.store_id.in_(store_ids),
+            TimeEntry.week_id == week.id,
+            TimeEntry.clock_in_at >= lo,
+            TimeEntry.clock_in_at < hi,
+        )
+        .order_by(TimeEntry.store_id.asc(), TimeEntry.employee_id.asc(), TimeEntry.clock_in_at.asc())
+    ).all()
+
+    def key(r) -> Tuple:
+        return (r.store_id, r.employee_id)
+
+    # both streams are ordered by (store, employee): walk them side by side
+    lines: Dict = {sid: [] for sid in store_ids}
+    i = j = 0
+    while i < len(shift_rows) or j < len(entry_rows):
+        k = min(
+            key(r)
+            for r in (
+                shift_rows[i] if i < len(shift_rows) else None,
+                entry_rows[j] if j < len(entry_rows) else None,
+            )
+            if r is not None
+        )
+        shifts = []
+        while i < len(shift_rows) and key(shift_rows[i]) == k:
+            shifts.append((_utc(shift_rows[i].start_at), _utc(shift_rows[i].end_at)))
+            i += 1
+        entries = []
+        while j < len(entry_rows) and key(entry_rows[j]) == k:
+            out = entry_rows[j].clock_out_at
+            entries.append((_utc(entry_rows[j].clock_in_at), _utc(out) if out else None))
+            j += 1
+
+        line = _new_line(k[1])
+        _merge_employee(line, shifts, entries, now)
+        lines[k[0]].append(line)
+
+    return {sid: {"store_id": str(sid), "employees": emp_lines} for sid, emp_lines in lines.items()}
+
+
+def compute_week_variance(db: Session, store: Store, week: Week) -> Dict:
+    """
+    Per-employee and store totals for one store + week (JSON-ready).
+    """
+    return compute_week_variances(db, [store.id], week)[store.id]
+
+
+def build_variance_report(db: Session, *, stores: List[Store], week: Week) -> Dict:
+    store_lines: List[Dict] = []
+    employee_lines: List[Dict] = []
+
+    payloads = get_or_compute_week_reports(
+        db,
+        kind=REPORT_KIND,
+        store_ids=[store.id for store in stores],
+        week=week,
+        compute=lambda store_ids: compute_week_variances(db, store_ids, week),
+    )
+
+    for store in stores:
+        payload = payloads[store.id]
+        lines = [{"store_id": str(store.id), **e} for e in payload["employees"]]
+
+        totals = {k: sum(e[k] for e in lines) for k in _COUNTERS}
+        store_lines.append(
+            {
+                "store_id": str(store.id),
+                "store_code": store.code,
+                "employees": len(lines),
+                **totals,
+                "drift_minutes": totals["worked_minutes"] - totals["scheduled_minutes"],
+            }
+        )
+        for e in lines:
+            e["drift_minutes"] = e["worked_minutes"] - e["scheduled_minutes"]
+        employee_lines.extend(lines)
+
+    return {
+        "week_start": week.week_start,
+        "week_end": week.week_end,
+        "stores": store_lines,
+        "employees": employee_lines,
+    }
@@ -0,0 +1,214 @@
+# app/services/week_archive.py
+"""
+Cold storage for locked weeks.
+
+A locked week older than the retention window has its schedule (shifts and
+assignments), availability and time entries copied, per store, into one
+week_archives row (zlib-compressed JSON) and deleted from the hot tables.
+weeks.archived_at marks the week; read endpoints fall back to the archive.
+
+Payroll keeps working from time_entry_weekly_agg, and the geofence and
+variance reports are cached for the week before its rows leave.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import delete, select, union
+from sqlalchemy.orm import Session
+
+from app.models.availability import Availability
+from app.models.schedule import Schedule, Shift, ShiftAssignment
+from app.models.store import Store
+from app.models.timeentry import TimeEntry
+from app.models.week import Week
+from app.models.week_archive import WeekArchive
+from app.services import geofence_report_service, variance_report_service
+from app.services.report_cache import get_or_compute_week_report
+from app.services.week_service import get_week_clock_in_bounds
+
+FORMAT_VERSION = 1
+
+
+def _json_default(v):
+    if isinstance(v, uuid.UUID):
+        return str(v)
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(v)!r}")
+
+
+def encode_payload(payload: Dict) -> bytes:
+    raw = json.dumps(payload, default=_json_default, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, 9)
+
+
+def decode_payload(blob: bytes) -> Dict:
+    return json.loads(zlib.decompress(blob))
+
+
+def _rows(db: Session, table, *filters, order_by=None) -> List[Dict]:
+    stmt = select(table).where(*filters)
+    if order_by is not None:
+        stmt = stmt.order_by(order_by)
+    return [dict(r) for r in db.execute(stmt).mappings()]
+
+
+def _schedule_doc(db: Session, store_id: uuid.UUID, week_id: uuid.UUID) -> Dict | None:
+    sched = _rows(db, Schedule.__table__, Schedule.store_id == store_id, Schedule.week_id == week_id)
+    if not sched:
+        return None
+    doc = sched[0]
+
+    shifts = _rows(db, Shift.__table__, Shift.schedule_id == doc["id"], order_by=Shift.start_at.asc())
+    by_shift: Dict[uuid.UUID, List[Dict]] = {s["id"]: [] for s in shifts}
+    if shifts:
+        for a in _rows(
+            db,
+            ShiftAssignment.__table__,
+            ShiftAssignment.shift_id.in_(list(by_shift)),
+            order_by=ShiftAssignment.assigned_at.asc(),
+        ):
+            by_shift[a["shift_id"]].append(a)
+    for s in shifts:
+        s["assignments"] = by_shift[s["id"]]
+
+    doc["shifts"] = shifts
+    return doc
+
+
+def _stores_with_data(db: Session, week: Week) -> List[uuid.UUID]:
+    lo, hi = get_week_clock_in_bounds(week.week_start)
+    stmt = union(
+        select(Schedule.store_id).where(Schedule.week_id == week.id),
+        select(Availability.store_id).where(Availability.week_id == week.id),
+        select(TimeEntry.store_id).where(
+            TimeEntry.week_id == week.id, TimeEntry.clock_in_at >= lo, TimeEntry.clock_in_at < hi
+        ),
+    )
+    return [r[0] for r in db.execute(stmt).all()]
+
+
+def archive_store_week(db: Session, *, week: Week, store_id: uuid.UUID) -> WeekArchive:
+    """
+    Copies one store's rows for the week into week_archives and deletes them
+    from the hot tables. Caller commits.
+    """
+    lo, hi = get_week_clock_in_bounds(week.week_start)
+    te_filters = (
+        TimeEntry.store_id == store_id,
+        TimeEntry.week_id == week.id,
+        TimeEntry.clock_in_at >= lo,
+        TimeEntry.clock_in_at < hi,
+    )
+    av_filters = (Availability.store_id == store_id, Availability.week_id == week.id)
+
+    schedule = _schedule_doc(db, store_id, week.id)
+    availability = _rows(db, Availability.__table__, *av_filters, order_by=Availability.day.asc())
+    time_entries = _rows(db, TimeEntry.__table__, *te_filters, order_by=TimeEntry.clock_in_at.asc())
+
+    payload = {
+        "store_id": store_id,
+        "week_id": week.id,
+        "week_start": week.week_start,
+        "schedule": schedule,
+        "availability": availability,
+        "time_entries": time_entries,
+    }
+    row_counts = {
+        "schedules": 1 if schedule else 0,
+        "shifts": len(schedule["shifts"]) if schedule else 0,
+        "shift_assignments": sum(len(s["assignments"]) for s in schedule["shifts"]) if schedule else 0,
+        "availability": len(availability),
+        "time_entries": len(time_entries),
+    }
+
+    archive = WeekArchive(
+        store_id=store_id,
+        week_id=week.id,
+        format_version=FORMAT_VERSION,
+        payload=encode_payload(payload),
+        row_counts=row_counts,
+    )
+    db.add(archive)
+
+    # shifts and assignments go with the schedule (ON DELETE CASCADE)
+    db.execute(delete(Schedule).where(Schedule.store_id == store_id, Schedule.week_id == week.id))
+    db.execute(delete(Availability).where(*av_filters))
+    db.execute(delete(TimeEntry).where(*te_filters))
+    return archive
+
+
+def archive_week(db: Session, week: Week) -> List[WeekArchive]:
+    """
+    Archives every store of a locked week and marks it archived. Commits.
+    """
+    if not week.is_locked:
+        raise ValueError("Only locked weeks can be archived")
+    if week.archived_at is not None:
+        return []
+
+    store_ids = _stores_with_data(db, week)
+
+    # reports computed from time entries and shifts must be cached while the rows are hot
+    stores = db.query(Store).filter(Store.id.in_(store_ids)).all() if store_ids else []
+    for store in stores:
+        for kind, compute in (
+            (geofence_report_service.REPORT_KIND, geofence_report_service.compute_week_geofence),
+            (variance_report_service.REPORT_KIND, variance_report_service.compute_week_variance),
+        ):
+            get_or_compute_week_report(
+                db,
+                kind=kind,
+                store_id=store.id,
+                week=week,
+                compute=lambda store=store, compute=compute: compute(db, store, week),
+            )
+
+    # re-check under the row lock: an unlock may have raced with the warm-up
+    wk = db.query(Week).filter(Week.id == week.id).with_for_update().one()
+    if not wk.is_locked or wk.archived_at is not None:
+        db.rollback()
+        return []
+
+    archives = [archive_store_week(db, week=wk, store_id=sid) for sid in store_ids]
+    wk.archived_at = datetime.now(timezone.utc)
+    db.commit()
+    return archives
+
+
+def archive_locked_weeks(db: Session, *, older_than_months: int, today: date | None = None) -> List[Week]:
+    """
+    Archives locked weeks that ended more than `older_than_months` months ago
+    (30-day months). Each week commits on its own.
+    """
+    cutoff = (today or date.today()) - timedelta(days=30 * older_than_months)
+    weeks = (
+        db.query(Week)
+        .filter(Week.is_locked.is_(True), Week.archived_at.is_(None), Week.week_end < cutoff)
+        .order_by(Week.week_start.asc())
+        .all()
+    )
+
+    done: List[Week] = []
+    for wk in weeks:
+        archive_week(db, wk)
+        if wk.archived_at is not None:
+            done.append(wk)
+    return done
+
+
+def load_week_archive(db: Session, *, store_id: uuid.UUID, week_id: uuid.UUID) -> Dict | None:
+    row = (
+        db.query(WeekArchive.payload)
+        .filter(WeekArchive.store_id == store_id, WeekArchive.week_id == week_id)
+        .first()
+    )
+    if not row:
+        return None
+    return decode_payload(row.payload)
@@ -1,6 +1,6 @@
 # app/services/week_service.py
 
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta, timezone
 
 
 def get_week_start(any_date: date) -> date:
@@ -20,3 +20,25 @@ def get_week_end(week_start: date) -> date:
     Returns Thursday for a given Friday.
     """
     return week_start + timedelta(days=6)
+
+
+def get_current_and_next_week(today: date | None = None) -> tuple[date, date]:
+    """
+    (Friday of this week, Thursday of next week): the default window of
+    date-scoped list endpoints.
+    """
+    start = get_week_start(today or date.today())
+    return start, get_week_end(start + timedelta(days=7))
+
+
+def get_week_clock_in_bounds(week_start: date) -> tuple[datetime, datetime]:
+    """
+    UTC range that contains every clock_in_at of the week.
+
+    Weeks are assigned from the server's local date, so the range is padded by
+    a day on each side. Filtering on it lets Postgres prune time_entries
+    partitions; keep the week_id filter for exactness.
+    """
+    start = datetime.combine(week_start - timedelta(days=1), time.min, tzinfo=timezone.utc)
+    end = datetime.combine(get_week_end(week_start) + timedelta(days=2), time.min, tzinfo=timezone.utc)
+    return start, end
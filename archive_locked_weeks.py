@@ -0,0 +1,22 @@
+"""
+Moves locked weeks older than N months out of the hot tables into
+week_archives (see app/services/week_archive.py).
+
+    python archive_locked_weeks.py --older-than-months 6
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.week_archive import archive_locked_weeks
+
+parser = argparse.ArgumentParser(description="Archive old locked weeks")
+parser.add_argument("--older-than-months", type=int, default=6)
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    for wk in archive_locked_weeks(db, older_than_months=args.older_than_months):
+        print(f"✅ archived week {wk.week_start} ({wk.id})")
+finally:
+    db.close()
@@ -0,0 +1,109 @@
+"""
+Benchmark: response serialization for large list payloads.
+
+Compares, for N users (UserOut) and N availability rows (AvailabilityOut):
+
+  default   response_model validation of ORM-like objects, then JSON encoding
+            (what FastAPI does for `return db.query(...).all()`)
+  orjson    same validation, encoded with orjson (ORJSONResponse only)
+  rows      plain dicts from column rows encoded directly with orjson
+            (the FAST_JSON path, app/core/responses.py)
+
+    python bench_serialization.py --items 10000 --repeat 50
+
+No database needed; rows are synthetic.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.schemas.availability import AvailabilityOut
+from app.schemas.user import UserOut
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--items", type=int, default=10_000)
+parser.add_argument("--repeat", type=int, default=50)
+args = parser.parse_args()
+
+now = datetime.now(timezone.utc)
+tenant_id = uuid.uuid4()
+
+user_rows = [
+    {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant_id,
+        "email": f"user{i}@example.com",
+        "role": "employee",
+        "full_name": f"User {i}",
+        "name": f"User {i}",
+        "phone": "555-0100",
+        "status": "active",
+        "must_change_password": False,
+        "is_active": True,
+    }
+    for i in range(args.items)
+]
+
+availability_rows = [
+    {
+        "id": uuid.uuid4(),
+        "employee_id": uuid.uuid4(),
+        "store_id": uuid.uuid4(),
+        "week_id": uuid.uuid4(),
+        "day": date.today() + timedelta(days=i % 7),
+        "available_start_at": now,
+        "available_end_at": now + timedelta(hours=8),
+        "created_at": now,
+    }
+    for i in range(args.items)
+]
+
+
+def timed(fn) -> list[float]:
+    fn()  # warm up
+    out = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def report(label: str, ms: list[float]) -> None:
+    p99 = statistics.quantiles(ms, n=100)[-1] if len(ms) > 1 else ms[0]
+    print(f"  {label:<8} p50 {statistics.median(ms):8.2f} ms   p99 {p99:8.2f} ms")
+
+
+for name, schema, rows in (
+    ("users", UserOut, user_rows),
+    ("availability", AvailabilityOut, availability_rows),
+):
+    adapter = TypeAdapter(list[schema])
+    objects = [SimpleNamespace(**r) for r in rows]
+
+    def default():
+        data = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def orjson_validated():
+        data = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+        return orjson.dumps(data)
+
+    def rows_fast():
+        return orjson.dumps([dict(r) for r in rows], option=orjson.OPT_UTC_Z)
+
+    # same document either way
+    assert json.loads(default()) == json.loads(rows_fast())
+
+    print(f"{name}: {args.items} items, {args.repeat} runs")
+    report("default", timed(default))
+    report("orjson", timed(orjson_validated))
+    report("rows", timed(rows_fast))
@@ -0,0 +1,146 @@
+"""
+Benchmark: payroll week queries on a plain vs a month-partitioned time_entries.
+
+Builds two copies of a synthetic time_entries table in a scratch schema
+(`bench_partitioning`, dropped at the end unless --keep), then times the
+per-employee week aggregation that payroll rebuilds run, for a whole week and
+for a single store-week, filtered the way the app filters (week_id + the
+clock_in_at window from get_week_clock_in_bounds).
+
+    python bench_time_entries_partitioning.py --rows 20000000 --months 24
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.services.week_service import get_week_clock_in_bounds, get_week_start
+
+SCHEMA = "bench_partitioning"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=2_000_000)
+parser.add_argument("--months", type=int, default=24)
+parser.add_argument("--stores", type=int, default=100)
+parser.add_argument("--employees", type=int, default=5000)
+parser.add_argument("--repeat", type=int, default=15)
+parser.add_argument("--keep", action="store_true", help="keep the scratch schema")
+args = parser.parse_args()
+
+engine = create_engine(settings.DATABASE_URL)
+
+first_month = date.today().replace(day=1)
+for _ in range(args.months - 1):
+    first_month = (first_month - timedelta(days=1)).replace(day=1)
+first_friday = get_week_start(first_month)
+
+COLUMNS = """
+  id uuid NOT NULL,
+  store_id uuid NOT NULL,
+  employee_id uuid NOT NULL,
+  week_id uuid NOT NULL,
+  clock_in_at timestamptz NOT NULL,
+  clock_out_at timestamptz NULL,
+  out_of_zone_seconds integer NOT NULL DEFAULT 0
+"""
+
+# Week ids are derived from the week index so both tables share them.
+FILL = f"""
+INSERT INTO {SCHEMA}.{{table}}
+SELECT
+  md5('entry' || g)::uuid,
+  md5('store' || (g % :stores))::uuid,
+  md5('emp' || (g % :employees))::uuid,
+  md5('week' || floor(extract(epoch FROM ts - CAST(:first_friday AS timestamptz)) / 604800)::int)::uuid,
+  ts,
+  ts + (240 + g % 300) * interval '1 minute',
+  (g % 7) * 30
+FROM (
+  SELECT g, CAST(:start_ts AS timestamptz) + (g::float8 / :rows) * (CAST(:end_ts AS timestamptz) - CAST(:start_ts AS timestamptz)) AS ts
+  FROM generate_series(1, :rows) g
+) s
+"""
+
+WEEK_QUERY = f"""
+SELECT employee_id,
+       SUM(GREATEST(FLOOR(EXTRACT(EPOCH FROM (clock_out_at - clock_in_at)) / 60), 0)) AS minutes,
+       SUM(out_of_zone_seconds)
+FROM {SCHEMA}.{{table}}
+WHERE week_id = :week_id AND clock_in_at >= :lo AND clock_in_at < :hi {{store_filter}}
+GROUP BY employee_id
+"""
+
+
+def timed(conn, sql: str, params: dict) -> list[float]:
+    conn.execute(text(sql), params).all()  # warm up
+    out = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        conn.execute(text(sql), params).all()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+with engine.begin() as conn:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.plain ({COLUMNS}, PRIMARY KEY (id))"))
+    conn.execute(
+        text(f"CREATE TABLE {SCHEMA}.part ({COLUMNS}, PRIMARY KEY (id, clock_in_at)) PARTITION BY RANGE (clock_in_at)")
+    )
+    m = first_month
+    for _ in range(args.months + 1):
+        nxt = (m + timedelta(days=32)).replace(day=1)
+        conn.execute(
+            text(f"CREATE TABLE {SCHEMA}.part_{m:%Y%m} PARTITION OF {SCHEMA}.part FOR VALUES FROM ('{m}') TO ('{nxt}')")
+        )
+        m = nxt
+
+    params = {
+        "rows": args.rows,
+        "stores": args.stores,
+        "employees": args.employees,
+        "first_friday": first_friday,
+        "start_ts": first_month,
+        "end_ts": date.today(),
+    }
+    for table in ("plain", "part"):
+        t0 = time.perf_counter()
+        conn.execute(text(FILL.format(table=table)), params)
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (store_id, week_id)"))
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (week_id)"))
+        conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+        print(f"loaded {table}: {args.rows} rows in {time.perf_counter() - t0:.1f}s")
+
+# a week from the middle of the range
+week_start = get_week_start(first_month + (date.today() - first_month) / 2)
+week_index = (week_start - first_friday).days // 7
+lo, hi = get_week_clock_in_bounds(week_start)
+
+with engine.connect() as conn:
+    week_id = conn.execute(text("SELECT md5('week' || :i)::uuid"), {"i": week_index}).scalar()
+    store_id = conn.execute(text("SELECT md5('store' || 0)::uuid")).scalar()
+
+    cases = [
+        ("tenant week", "", {}),
+        ("store week", "AND store_id = :store_id", {"store_id": store_id}),
+    ]
+    print(f"\nweek {week_start} (p50 / p95 over {args.repeat} runs, ms)")
+    for label, store_filter, extra in cases:
+        for table in ("plain", "part"):
+            ms = timed(
+                conn,
+                WEEK_QUERY.format(table=table, store_filter=store_filter),
+                {"week_id": week_id, "lo": lo, "hi": hi, **extra},
+            )
+            p95 = statistics.quantiles(ms, n=20)[-1] if len(ms) > 1 else ms[0]
+            print(f"  {label:<12} {table:<6} {statistics.median(ms):8.2f} {p95:8.2f}")
+
+if not args.keep:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
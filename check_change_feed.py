@@ -0,0 +1,145 @@
+"""
+End-to-end check of the cache change feed (app/core/cache.py) against a real
+Postgres, e.g. a throwaway container:
+
+    docker run --rm -d --name shift-feed-pg -e POSTGRES_PASSWORD=pg -p 55432:5432 postgres:16
+    DATABASE_URL=postgresql://postgres:pg@localhost:55432/postgres SECRET_KEY=x \\
+        python check_change_feed.py --workers 4
+    docker stop shift-feed-pg
+
+Worker processes stand in for uvicorn workers: each warms a cache entry and
+reports when it disappears. This process then checks that
+
+  1. a committed invalidation reaches every worker (and how fast)
+  2. a rolled-back one reaches none
+  3. killing a worker's LISTEN connection clears its caches on reconnect
+
+Needs no schema; the feed only uses pg_notify.
+"""
+
+import argparse
+import multiprocessing as mp
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--workers", type=int, default=4)
+parser.add_argument("--timeout", type=float, default=5.0)
+args = parser.parse_args()
+
+CACHE = "feed_check"
+
+
+def worker(conn) -> None:
+    from app.core import pg_listen
+    from app.core.cache import TTLCache
+
+    cache = TTLCache(CACHE, ttl_seconds=3600)
+
+    def warm(key):
+        cache.get(key)  # starts the listener
+        while not pg_listen.connected():
+            time.sleep(0.01)
+        cache.set(key, "v", cache.token())
+
+    while True:
+        cmd, key, timeout = conn.recv()
+        if cmd == "warm":
+            warm(key)
+            conn.send("ready")
+        elif cmd == "wait_gone":
+            # when the entry was gone, or None
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if cache.get(key) is None:
+                    conn.send(time.monotonic())
+                    break
+                time.sleep(0.0005)
+            else:
+                conn.send(None)
+        elif cmd == "stop":
+            return
+
+
+def broadcast(pipes, cmd, key, timeout=None):
+    for p in pipes:
+        p.send((cmd, key, timeout))
+    return [p.recv() for p in pipes]
+
+
+def main() -> int:
+    from app.core.cache import invalidate
+    from app.db.session import SessionLocal
+
+    ctx = mp.get_context("spawn")
+    pipes, procs = [], []
+    for _ in range(args.workers):
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(target=worker, args=(child,), daemon=True)
+        proc.start()
+        pipes.append(parent)
+        procs.append(proc)
+
+    db = SessionLocal()
+    ok = True
+    try:
+        # 1. commit reaches every worker
+        broadcast(pipes, "warm", "k1")
+        for p in pipes:
+            p.send(("wait_gone", "k1", args.timeout))
+        t0 = time.monotonic()
+        invalidate(db, CACHE, "k1")
+        db.commit()
+        lat = [p.recv() for p in pipes]
+        if any(t is None for t in lat):
+            print("❌ commit: some workers kept the entry")
+            ok = False
+        else:
+            ms = [(t - t0) * 1000 for t in lat]
+            print(f"✅ commit: {len(ms)} workers, median {statistics.median(ms):.1f} ms, max {max(ms):.1f} ms")
+
+        # 2. rollback reaches none
+        broadcast(pipes, "warm", "k2")
+        db.execute(text("SELECT 1"))
+        invalidate(db, CACHE, "k2")
+        db.rollback()
+        db.commit()  # a later commit must not flush the dropped change
+        for p in pipes:
+            p.send(("wait_gone", "k2", 1.0))
+        if any(p.recv() is not None for p in pipes):
+            print("❌ rollback: invalidation was delivered")
+            ok = False
+        else:
+            print("✅ rollback: nothing delivered")
+
+        # 3. reconnect clears
+        broadcast(pipes, "warm", "k3")
+        for p in pipes:
+            p.send(("wait_gone", "k3", args.timeout + 5))
+        killed = db.execute(
+            text(
+                "SELECT count(pg_terminate_backend(pid)) FROM pg_stat_activity "
+                "WHERE pid <> pg_backend_pid() AND query LIKE 'LISTEN%'"
+            )
+        ).scalar()
+        db.commit()
+        if any(p.recv() is None for p in pipes):
+            print(f"❌ reconnect: caches kept after killing {killed} listeners")
+            ok = False
+        else:
+            print(f"✅ reconnect: {killed} listeners killed, caches cleared")
+    finally:
+        db.close()
+        for p in pipes:
+            p.send(("stop", None, None))
+        for proc in procs:
+            proc.join(timeout=5)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Maintenance job for the monthly time_entries partitions.
+
+Run it daily (cron / scheduler):
+
+    python maintain_time_entry_partitions.py --months-ahead 3 --keep-months 24
+    python maintain_time_entry_partitions.py --keep-months 24 --drop
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services.partition_maintenance import (
+    default_partition_rows,
+    detach_old_time_entry_partitions,
+    ensure_time_entry_partitions,
+    is_partitioned,
+)
+
+parser = argparse.ArgumentParser(description="Create upcoming and retire old time_entries partitions")
+parser.add_argument("--months-ahead", type=int, default=3)
+parser.add_argument("--keep-months", type=int, default=0, help="0 keeps every partition attached")
+parser.add_argument("--drop", action="store_true", help="drop old partitions instead of archiving them")
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    if not is_partitioned(db):
+        raise SystemExit("time_entries is not partitioned yet (apply migrations/011_time_entries_partitioning.sql)")
+
+    created = ensure_time_entry_partitions(db, months_ahead=args.months_ahead)
+    db.commit()
+    for name in created:
+        print(f"✅ created {name}")
+
+    if args.keep_months > 0:
+        retired = detach_old_time_entry_partitions(db, keep_months=args.keep_months, drop=args.drop)
+        db.commit()
+        for name in retired:
+            print(f"✅ {'dropped' if args.drop else 'archived'} {name}")
+
+    stray = default_partition_rows(db)
+    if stray:
+        print(f"⚠️  {stray} rows in time_entries_default (clock-ins outside the created months)")
+finally:
+    db.close()
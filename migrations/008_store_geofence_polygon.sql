@@ -0,0 +1,8 @@
+BEGIN;
+
+-- Optional polygon geofence for stores: [[lat, lng], ...]
+-- When set it takes precedence over the circle (geofence_lat/lng/radius_m).
+ALTER TABLE stores
+  ADD COLUMN IF NOT EXISTS geofence_polygon jsonb NULL;
+
+COMMIT;
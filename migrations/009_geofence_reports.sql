@@ -0,0 +1,36 @@
+BEGIN;
+
+-- Clock-in coordinates (geofence compliance report)
+ALTER TABLE time_entries
+  ADD COLUMN IF NOT EXISTS clock_in_lat double precision NULL,
+  ADD COLUMN IF NOT EXISTS clock_in_lng double precision NULL;
+
+CREATE INDEX IF NOT EXISTS ix_time_entries_store_week ON time_entries(store_id, week_id);
+
+-- Cached report payloads for locked weeks
+CREATE TABLE IF NOT EXISTS week_report_cache (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+
+  report_kind varchar(32) NOT NULL,
+  store_id uuid NOT NULL,
+  week_id uuid NOT NULL,
+
+  payload jsonb NOT NULL,
+
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'uq_week_report_cache_kind_store_week'
+  ) THEN
+    ALTER TABLE week_report_cache
+      ADD CONSTRAINT uq_week_report_cache_kind_store_week UNIQUE (report_kind, store_id, week_id);
+  END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS ix_week_report_cache_store_id ON week_report_cache(store_id);
+CREATE INDEX IF NOT EXISTS ix_week_report_cache_week_id ON week_report_cache(week_id);
+
+COMMIT;
@@ -0,0 +1,38 @@
+BEGIN;
+
+-- Running totals per store + week + employee (payroll reads these instead of time_entries)
+CREATE TABLE IF NOT EXISTS time_entry_weekly_agg (
+  store_id uuid NOT NULL,
+  week_id uuid NOT NULL,
+  employee_id uuid NOT NULL,
+
+  total_minutes integer NOT NULL DEFAULT 0,
+  open_entries integer NOT NULL DEFAULT 0,
+  out_of_zone_seconds integer NOT NULL DEFAULT 0,
+
+  updated_at timestamptz NOT NULL DEFAULT now(),
+
+  PRIMARY KEY (store_id, week_id, employee_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_time_entry_weekly_agg_week_id ON time_entry_weekly_agg(week_id);
+
+-- Backfill from existing entries
+INSERT INTO time_entry_weekly_agg (store_id, week_id, employee_id, total_minutes, open_entries, out_of_zone_seconds)
+SELECT
+  store_id,
+  week_id,
+  employee_id,
+  COALESCE(SUM(
+    CASE WHEN clock_out_at IS NOT NULL
+      THEN GREATEST(FLOOR(EXTRACT(EPOCH FROM (clock_out_at - clock_in_at)) / 60), 0)
+      ELSE 0
+    END
+  ), 0),
+  COUNT(*) FILTER (WHERE clock_out_at IS NULL),
+  COALESCE(SUM(out_of_zone_seconds), 0)
+FROM time_entries
+GROUP BY store_id, week_id, employee_id
+ON CONFLICT (store_id, week_id, employee_id) DO NOTHING;
+
+COMMIT;
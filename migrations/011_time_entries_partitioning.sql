@@ -0,0 +1,102 @@
+BEGIN;
+
+-- =========================================================
+-- TIME ENTRIES: range-partition by clock_in_at month
+--
+-- Partitions are named time_entries_yYYYYmMM and cover one UTC month.
+-- New months are created ahead of time (and old ones detached) by
+-- maintain_time_entry_partitions.py; the default partition only catches
+-- rows outside the created range and should stay empty.
+--
+-- The primary key must include the partition key, so it becomes
+-- (id, clock_in_at). The ORM still maps id as the identity.
+-- =========================================================
+DO $$
+DECLARE
+  first_month date;
+  last_month date;
+  m date;
+  r record;
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM pg_class WHERE relname = 'time_entries' AND relkind = 'p'
+  ) THEN
+    RETURN;
+  END IF;
+
+  ALTER TABLE time_entries RENAME TO time_entries_unpartitioned;
+
+  -- free the constraint names (time_entries_pkey, ..._fkey) for the new table
+  FOR r IN
+    SELECT conname FROM pg_constraint WHERE conrelid = 'time_entries_unpartitioned'::regclass
+  LOOP
+    EXECUTE format(
+      'ALTER TABLE time_entries_unpartitioned RENAME CONSTRAINT %I TO %I',
+      r.conname, 'old_' || r.conname
+    );
+  END LOOP;
+
+  CREATE TABLE time_entries (
+    id uuid NOT NULL DEFAULT gen_random_uuid(),
+
+    store_id uuid NOT NULL REFERENCES stores(id) ON DELETE CASCADE,
+    employee_id uuid NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    week_id uuid NOT NULL REFERENCES weeks(id) ON DELETE CASCADE,
+
+    clock_in_at timestamptz NOT NULL,
+    clock_out_at timestamptz NULL,
+
+    clock_in_lat double precision NULL,
+    clock_in_lng double precision NULL,
+
+    out_of_zone_seconds integer NOT NULL DEFAULT 0,
+    is_out_of_zone boolean NOT NULL DEFAULT false,
+
+    created_at timestamptz NOT NULL DEFAULT now(),
+
+    PRIMARY KEY (id, clock_in_at)
+  ) PARTITION BY RANGE (clock_in_at);
+
+  CREATE TABLE time_entries_default PARTITION OF time_entries DEFAULT;
+
+  -- one partition per month from the oldest entry through three months ahead
+  SELECT date_trunc('month', COALESCE(MIN(clock_in_at), now()) AT TIME ZONE 'UTC')::date
+    INTO first_month
+    FROM time_entries_unpartitioned;
+  last_month := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months')::date;
+
+  m := first_month;
+  WHILE m <= last_month LOOP
+    EXECUTE format(
+      'CREATE TABLE %I PARTITION OF time_entries FOR VALUES FROM (%L) TO (%L)',
+      'time_entries_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+      (m::timestamp AT TIME ZONE 'UTC'),
+      ((m + interval '1 month')::timestamp AT TIME ZONE 'UTC')
+    );
+    m := (m + interval '1 month')::date;
+  END LOOP;
+
+  INSERT INTO time_entries (
+    id, store_id, employee_id, week_id,
+    clock_in_at, clock_out_at, clock_in_lat, clock_in_lng,
+    out_of_zone_seconds, is_out_of_zone, created_at
+  )
+  SELECT
+    id, store_id, employee_id, week_id,
+    clock_in_at, clock_out_at, clock_in_lat, clock_in_lng,
+    COALESCE(out_of_zone_seconds, 0), COALESCE(is_out_of_zone, false), COALESCE(created_at, now())
+  FROM time_entries_unpartitioned;
+
+  DROP TABLE time_entries_unpartitioned;
+END $$;
+
+-- Indexes on the parent cascade to every partition (existing and future)
+CREATE INDEX IF NOT EXISTS ix_time_entries_store_week ON time_entries(store_id, week_id);
+CREATE INDEX IF NOT EXISTS ix_time_entries_week_id ON time_entries(week_id);
+CREATE INDEX IF NOT EXISTS ix_time_entries_employee_open ON time_entries(employee_id) WHERE clock_out_at IS NULL;
+CREATE INDEX IF NOT EXISTS ix_time_entries_store_open ON time_entries(store_id) WHERE clock_out_at IS NULL;
+
+-- Detached partitions are moved here by the maintenance job
+CREATE SCHEMA IF NOT EXISTS archive;
+
+COMMIT;
@@ -0,0 +1,37 @@
+BEGIN;
+
+-- Locked weeks moved out of the hot tables (archive_locked_weeks.py)
+ALTER TABLE weeks
+  ADD COLUMN IF NOT EXISTS archived_at timestamptz NULL;
+
+CREATE TABLE IF NOT EXISTS week_archives (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+
+  store_id uuid NOT NULL,
+  week_id uuid NOT NULL,
+
+  format_version integer NOT NULL DEFAULT 1,
+  -- zlib-compressed JSON: schedule (shifts, assignments), availability, time_entries
+  payload bytea NOT NULL,
+  row_counts jsonb NOT NULL,
+
+  archived_at timestamptz NOT NULL DEFAULT now()
+);
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'uq_week_archives_store_week'
+  ) THEN
+    ALTER TABLE week_archives
+      ADD CONSTRAINT uq_week_archives_store_week UNIQUE (store_id, week_id);
+  END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS ix_week_archives_store_id ON week_archives(store_id);
+CREATE INDEX IF NOT EXISTS ix_week_archives_week_id ON week_archives(week_id);
+
+-- payload is already compressed; skip TOAST compression
+ALTER TABLE week_archives ALTER COLUMN payload SET STORAGE EXTERNAL;
+
+COMMIT;
@@ -0,0 +1,26 @@
+BEGIN;
+
+-- Pre-rendered published schedules (written on publish, deleted on unpublish)
+CREATE TABLE IF NOT EXISTS schedule_snapshots (
+  schedule_id uuid PRIMARY KEY REFERENCES schedules(id) ON DELETE CASCADE,
+
+  store_id uuid NOT NULL,
+  week_id uuid NOT NULL,
+
+  json_body bytea NOT NULL,
+  msgpack_body bytea NULL,
+
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'uq_schedule_snapshots_store_week'
+  ) THEN
+    ALTER TABLE schedule_snapshots
+      ADD CONSTRAINT uq_schedule_snapshots_store_week UNIQUE (store_id, week_id);
+  END IF;
+END $$;
+
+COMMIT;
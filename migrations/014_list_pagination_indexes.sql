@@ -0,0 +1,12 @@
+BEGIN;
+
+-- Keyset pagination: one index per (filter, sort key, id) used by the list endpoints
+CREATE INDEX IF NOT EXISTS ix_users_tenant_email_id ON users(tenant_id, email, id);
+CREATE INDEX IF NOT EXISTS ix_stores_tenant_code_id ON stores(tenant_id, code, id);
+CREATE INDEX IF NOT EXISTS ix_store_memberships_store_user_id ON store_memberships(store_id, user_id, id) WHERE is_active;
+CREATE INDEX IF NOT EXISTS ix_availability_store_day_id ON availability(store_id, day, id);
+CREATE INDEX IF NOT EXISTS ix_availability_employee_day_id ON availability(employee_id, day, id);
+CREATE INDEX IF NOT EXISTS ix_leave_requests_store_start_id ON leave_requests(store_id, start_date, id);
+CREATE INDEX IF NOT EXISTS ix_leave_requests_employee_start_id ON leave_requests(employee_id, start_date, id);
+
+COMMIT;
@@ -0,0 +1,12 @@
+BEGIN;
+
+-- ?week_id= on availability lists, in keyset order
+CREATE INDEX IF NOT EXISTS ix_availability_store_week_day_id ON availability(store_id, week_id, day, id);
+CREATE INDEX IF NOT EXISTS ix_availability_employee_week_day_id ON availability(employee_id, week_id, day, id);
+
+-- leave overlapping a date window: end_date >= date_from is the selective bound
+-- for long-lived accounts (start_date <= date_to matches their whole history)
+CREATE INDEX IF NOT EXISTS ix_leave_requests_employee_end ON leave_requests(employee_id, end_date);
+CREATE INDEX IF NOT EXISTS ix_leave_requests_store_end ON leave_requests(store_id, end_date);
+
+COMMIT;
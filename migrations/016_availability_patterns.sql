@@ -0,0 +1,25 @@
+BEGIN;
+
+-- Recurring weekly availability, expanded per week in the app (never materialized)
+CREATE TABLE IF NOT EXISTS availability_patterns (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+
+  employee_id uuid NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  store_id uuid NOT NULL REFERENCES stores(id) ON DELETE CASCADE,
+
+  -- 0 = Monday ... 6 = Sunday; store-local times, end <= start runs past midnight
+  weekday smallint NOT NULL CHECK (weekday BETWEEN 0 AND 6),
+  start_time time NOT NULL,
+  end_time time NOT NULL,
+
+  effective_from date NOT NULL,
+  effective_to date NULL CHECK (effective_to IS NULL OR effective_to >= effective_from),
+
+  created_at timestamptz NOT NULL DEFAULT now(),
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_availability_patterns_store_employee ON availability_patterns(store_id, employee_id);
+CREATE INDEX IF NOT EXISTS ix_availability_patterns_employee_id ON availability_patterns(employee_id);
+
+COMMIT;
@@ -0,0 +1,8 @@
+BEGIN;
+
+-- Leave-conflict lookups: an employee's assignments, then their shifts by time
+CREATE INDEX IF NOT EXISTS ix_shift_assignments_employee_shift ON shift_assignments(employee_id, shift_id);
+CREATE INDEX IF NOT EXISTS ix_shift_assignments_shift_id ON shift_assignments(shift_id);
+CREATE INDEX IF NOT EXISTS ix_shifts_schedule_start ON shifts(schedule_id, start_at);
+
+COMMIT;
@@ -0,0 +1,7 @@
+BEGIN;
+
+-- Bumped on every schedule change; keys derived-result caches (cost forecast)
+ALTER TABLE schedules
+  ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+
+COMMIT;
@@ -0,0 +1,41 @@
+BEGIN;
+
+-- Durable background jobs, claimed by workers with FOR UPDATE SKIP LOCKED
+CREATE TABLE IF NOT EXISTS jobs (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+
+  kind varchar(64) NOT NULL,
+
+  tenant_id uuid NULL,
+  created_by uuid NULL,
+
+  -- queued | running | succeeded | failed
+  status varchar(16) NOT NULL DEFAULT 'queued',
+
+  params jsonb NOT NULL DEFAULT '{}'::jsonb,
+  result jsonb NULL,
+  error text NULL,
+
+  progress_done integer NOT NULL DEFAULT 0,
+  progress_total integer NULL,
+  progress_message varchar(255) NULL,
+
+  attempts integer NOT NULL DEFAULT 0,
+  max_attempts integer NOT NULL DEFAULT 3,
+  run_after timestamptz NOT NULL DEFAULT now(),
+
+  locked_by varchar(128) NULL,
+  heartbeat_at timestamptz NULL,
+
+  created_at timestamptz NOT NULL DEFAULT now(),
+  started_at timestamptz NULL,
+  finished_at timestamptz NULL
+);
+
+-- claim scan: only queued rows
+CREATE INDEX IF NOT EXISTS ix_jobs_queued_run_after ON jobs(run_after) WHERE status = 'queued';
+-- per-tenant running count, status lookups
+CREATE INDEX IF NOT EXISTS ix_jobs_tenant_status ON jobs(tenant_id, status);
+CREATE INDEX IF NOT EXISTS ix_jobs_created_by_created_at ON jobs(created_by, created_at);
+
+COMMIT;
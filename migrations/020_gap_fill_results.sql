@@ -0,0 +1,28 @@
+BEGIN;
+
+-- Latest gap-fill suggestions per store/week/params, valid while schedules.version matches
+CREATE TABLE IF NOT EXISTS gap_fill_results (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+
+  store_id uuid NOT NULL,
+  week_id uuid NOT NULL,
+
+  params_key varchar(64) NOT NULL,
+  schedule_version integer NOT NULL,
+
+  result jsonb NOT NULL,
+
+  created_at timestamptz NOT NULL DEFAULT now()
+);
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'uq_gap_fill_results_store_week_params'
+  ) THEN
+    ALTER TABLE gap_fill_results
+      ADD CONSTRAINT uq_gap_fill_results_store_week_params UNIQUE (store_id, week_id, params_key);
+  END IF;
+END $$;
+
+COMMIT;
@@ -0,0 +1,32 @@
+"""
+Background job worker (see app/services/jobs.py). Run one or more per
+deployment, next to the API processes:
+
+    python run_jobs_worker.py --concurrency 4
+    python run_jobs_worker.py --kinds payroll.generate_invoices
+
+Stops after the running jobs finish on SIGINT / SIGTERM.
+"""
+
+import argparse
+import logging
+import signal
+import threading
+
+from app.services.jobs import run_worker
+
+parser = argparse.ArgumentParser(description="Run background jobs")
+parser.add_argument("--concurrency", type=int, default=2)
+parser.add_argument("--poll-seconds", type=float, default=5.0)
+parser.add_argument("--kinds", nargs="*", default=None, help="only these job kinds")
+args = parser.parse_args()
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+stop = threading.Event()
+signal.signal(signal.SIGINT, lambda *_: stop.set())
+signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+print(f"✅ job worker started (concurrency={args.concurrency})")
+run_worker(concurrency=args.concurrency, poll_seconds=args.poll_seconds, kinds=args.kinds, stop=stop)
+print("✅ job worker stopped")
@@ -0,0 +1,47 @@
+"""
+Jobs handed out to several callers (gap-fill dedupes identical requests)
+must be pollable by each of them, and by nobody outside the store.
+"""
+
+from __future__ import annotations
+
+API = "/api/v1"
+
+SIZE = dict(tenants=1, stores_per_tenant=1, employees_per_store=2, shifts_per_day=1)
+
+
+def _manager(db, world, email, *, member: bool):
+    from app.models import StoreMembership, User
+
+    user = User(email=email, hashed_password="x", role="manager", tenant_id=world.tenant.id, full_name=email)
+    db.add(user)
+    db.flush()
+    if member:
+        db.add(StoreMembership(user_id=user.id, store_id=world.store.id, store_role="manager", pay_rate="0", is_active=True))
+    db.commit()
+    return user
+
+
+def _gap_fill(client, world, user):
+    r = client.post(
+        f"{API}/ai/gap-fill",
+        json={"store_id": str(world.store.id), "week_id": str(world.week.id)},
+        headers=world.headers(user),
+    )
+    assert r.status_code == 202, r.text
+    return r
+
+
+def test_shared_gap_fill_job_is_visible_to_every_store_manager(client, world_factory, db):
+    world = world_factory(**SIZE)
+    second = _manager(db, world, "mgr-second@example.com", member=True)
+    outsider = _manager(db, world, "mgr-outsider@example.com", member=False)
+
+    first = _gap_fill(client, world, world.manager)
+    again = _gap_fill(client, world, second)
+    assert again.json()["id"] == first.json()["id"]
+
+    location = again.headers["Location"]
+    assert client.get(location, headers=world.headers(second)).status_code == 200
+    assert client.get(location, headers=world.headers(world.manager)).status_code == 200
+    assert client.get(location, headers=world.headers(outsider)).status_code == 404
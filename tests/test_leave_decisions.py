@@ -0,0 +1,83 @@
+"""
+Bulk leave decisions report (and optionally remove) the shift assignments
+an approved leave conflicts with, like the single-item endpoint.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+API = "/api/v1"
+
+SIZE = dict(tenants=1, stores_per_tenant=1, employees_per_store=2, shifts_per_day=2)
+
+
+def _pending(db, world, employee):
+    from app.models import LeaveRequest
+
+    day = world.week.week_start + timedelta(days=2)
+    lr = LeaveRequest(employee_id=employee.id, store_id=world.store.id, start_date=day, end_date=day + timedelta(days=1), status="pending")
+    db.add(lr)
+    db.commit()
+    return lr
+
+
+def _assigned(db, assignment_ids):
+    from app.models import ShiftAssignment
+
+    return {a for (a,) in db.query(ShiftAssignment.id).filter(ShiftAssignment.id.in_(assignment_ids))}
+
+
+def test_bulk_approval_reports_and_unassigns_conflicts(client, world_factory, db):
+    world = world_factory(**SIZE)
+    keep = _pending(db, world, world.employees[0])
+    drop = _pending(db, world, world.employees[1])
+
+    r = client.post(
+        f"{API}/leave-request/decide",
+        json={
+            "items": [
+                {"id": str(keep.id), "status": "approved"},
+                {"id": str(drop.id), "status": "approved", "unassign_conflicts": True},
+            ]
+        },
+        headers=world.headers(world.manager),
+    )
+    assert r.status_code == 200, r.text
+    kept, dropped = r.json()
+
+    assert kept["outcome"] == dropped["outcome"] == "approved"
+    assert kept["conflicts"] and dropped["conflicts"]
+    assert not any(c["unassigned"] for c in kept["conflicts"])
+    assert all(c["unassigned"] for c in dropped["conflicts"])
+
+    db.expire_all()
+    kept_ids = {c["assignment_id"] for c in kept["conflicts"]}
+    dropped_ids = {c["assignment_id"] for c in dropped["conflicts"]}
+    assert {str(a) for a in _assigned(db, kept_ids | dropped_ids)} == kept_ids
+
+
+def test_bulk_rejection_has_no_conflicts(client, world_factory, db):
+    world = world_factory(**SIZE)
+    lr = _pending(db, world, world.employees[0])
+
+    r = client.post(
+        f"{API}/leave-request/decide",
+        json={"items": [{"id": str(lr.id), "status": "rejected", "unassign_conflicts": True}]},
+        headers=world.headers(world.manager),
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()[0]["outcome"] == "rejected"
+    assert r.json()[0]["conflicts"] == []
+
+
+def test_bulk_decide_forbidden_for_employees(client, world_factory, db):
+    world = world_factory(**SIZE)
+    lr = _pending(db, world, world.employees[0])
+
+    r = client.post(
+        f"{API}/leave-request/decide",
+        json={"items": [{"id": str(lr.id), "status": "approved"}]},
+        headers=world.headers(world.employees[0]),
+    )
+    assert r.status_code == 403, r.text
@@ -0,0 +1,24 @@
+"""
+GET /metrics is closed unless METRICS_TOKEN is configured, and then needs it.
+"""
+
+from __future__ import annotations
+
+
+def test_metrics_not_found_without_token(client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_requires_configured_token(client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    r = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert r.status_code == 200
+    assert "http_requests_total" in r.text
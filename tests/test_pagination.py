@@ -0,0 +1,49 @@
+"""
+Planner row estimates (?count=estimate) run EXPLAIN on the filtered query;
+filter values must reach it as bound parameters, never spliced into SQL.
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select
+
+SIZE = dict(tenants=1, stores_per_tenant=1, employees_per_store=3, shifts_per_day=1)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [":foo", "100%", "%(email)s", "o'brien@example.com", "x'); DROP TABLE users; --"],
+)
+def test_estimated_count_binds_filter_values(world_factory, db, value):
+    from app.core.pagination import estimated_count
+    from app.models import User
+
+    world_factory(**SIZE)
+    stmt = select(User).where(User.email == value, User.full_name.like(f"%{value}%"))
+
+    assert estimated_count(db, stmt) >= 0
+    db.rollback()
+    assert db.query(User).count() > 0
+
+
+def test_estimated_count_expands_in_lists(world_factory, db):
+    from app.core.pagination import estimated_count
+    from app.models import User
+
+    world = world_factory(**SIZE)
+    stmt = select(User).where(User.id.in_([e.id for e in world.employees]))
+
+    assert estimated_count(db, stmt) >= 1
+
+
+def test_cors_exposes_paging_headers(client, world_factory):
+    world = world_factory(**SIZE)
+    r = client.get(
+        "/api/v1/stores",
+        params={"limit": 1, "count": "exact"},
+        headers={**world.headers(world.tenant_admin), "Origin": "http://localhost:3000"},
+    )
+    assert r.status_code == 200, r.text
+    exposed = {h.strip().lower() for h in r.headers["access-control-expose-headers"].split(",")}
+    assert {"x-next-cursor", "x-total-count", "x-estimated-count", "location"} <= exposed
@@ -0,0 +1,38 @@
+"""
+Which weeks lost time entries to detached time_entries partitions.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from app.services.partition_maintenance import _months_missing
+
+ATTACHED = {date(2024, 1, 1), date(2024, 3, 1), date(2024, 4, 1)}  # February detached
+
+
+def test_week_before_oldest_partition_is_detached():
+    assert _months_missing(ATTACHED, date(2023, 12, 18))
+
+
+def test_week_in_gap_is_detached():
+    assert _months_missing(ATTACHED, date(2024, 2, 12))
+
+
+def test_week_straddling_gap_is_detached():
+    # Mon 26 Feb .. Sun 3 Mar: part of its clock-ins were in February
+    assert _months_missing(ATTACHED, date(2024, 2, 26))
+
+
+def test_week_in_attached_months():
+    assert not _months_missing(ATTACHED, date(2024, 1, 8))
+    assert not _months_missing(ATTACHED, date(2024, 3, 11))
+
+
+def test_week_past_newest_partition_is_not_detached():
+    # not created yet: its rows sit in the default partition
+    assert not _months_missing(ATTACHED, date(2024, 6, 10))
+
+
+def test_unpartitioned_table():
+    assert not _months_missing(set(), date(2024, 2, 12))
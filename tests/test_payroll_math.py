@@ -0,0 +1,112 @@
+"""
+The payroll SQL (payroll_lines_stmt) must agree to the cent with
+compute_pay_line, its Decimal reference, on seeded weekly aggregates.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+SIZE = dict(tenants=1, stores_per_tenant=1, employees_per_store=1, shifts_per_day=1)
+
+# (label, total minutes, pay_rate_hourly, legacy pay_rate, tax enabled, tax %)
+LINES = [
+    ("no-hours", 0, "15.00", "0", False, "0"),
+    ("half-cent-rounds-up", 6, "12.25", "0", False, "0"),
+    ("half-cent-tax", 6, "12.25", "0", True, "7.65"),
+    ("just-under-cap", 2399, "17.33", "0", True, "7.65"),
+    ("at-cap", 2400, "17.33", "0", True, "7.65"),
+    ("one-overtime-minute", 2401, "17.33", "0", True, "7.65"),
+    ("overtime-tax-off", 3017, "19.99", "0", False, "7.65"),
+    ("tax-enabled-zero-percent", 1234, "21.50", "0", True, "0"),
+    ("legacy-text-rate", 2461, "0", " 18.5 ", True, "10.00"),
+    ("legacy-text-ignored", 600, "16.00", "99", False, "0"),
+    ("legacy-non-numeric", 600, "0", "$18/h", True, "7.65"),
+]
+
+
+def _legacy(text: str) -> Decimal:
+    # same rule as the SQL: only a plain number counts
+    text = text.strip()
+    return Decimal(text) if re.fullmatch(r"[0-9]+(\.[0-9]+)?", text) else Decimal(0)
+
+
+@pytest.fixture
+def seeded(world_factory, db):
+    from app.models import StoreMembership, TimeEntryWeeklyAgg, User, Week
+
+    world = world_factory(**SIZE)
+    start = world.past_week.week_start - timedelta(days=7)
+    week = Week(week_start=start, week_end=start + timedelta(days=6), is_locked=False)
+    db.add(week)
+    db.flush()
+
+    expected = {}
+    for i, (label, minutes, hourly, legacy, tax_enabled, pct) in enumerate(LINES):
+        emp = User(email=f"pay{i}@example.com", hashed_password="x", role="employee", tenant_id=world.tenant.id, full_name=label)
+        db.add(emp)
+        db.flush()
+        db.add(
+            StoreMembership(
+                user_id=emp.id,
+                store_id=world.store.id,
+                store_role="employee",
+                pay_rate=legacy,
+                pay_rate_hourly=Decimal(hourly),
+                tax_enabled=tax_enabled,
+                tax_rate_percent=Decimal(pct),
+                is_active=True,
+            )
+        )
+        db.add(
+            TimeEntryWeeklyAgg(
+                store_id=world.store.id,
+                week_id=week.id,
+                employee_id=emp.id,
+                total_minutes=minutes,
+                open_entries=0,
+                out_of_zone_seconds=0,
+            )
+        )
+        rate = Decimal(hourly) if Decimal(hourly) > 0 else _legacy(legacy)
+        expected[emp.id] = (label, rate, tax_enabled, Decimal(pct), minutes)
+    db.commit()
+    return world, week, expected
+
+
+def test_sql_matches_decimal_reference(seeded, db):
+    from app.services.payroll_service import compute_pay_line, week_payroll_lines
+
+    world, week, expected = seeded
+    rows = week_payroll_lines(db, week=week, store_ids=[world.store.id])
+    assert {r.employee_id for r in rows} == set(expected)
+
+    for row in rows:
+        label, rate, tax_enabled, pct, minutes = expected[row.employee_id]
+        ref = compute_pay_line(minutes, rate, tax_enabled, pct)
+        got = (row.regular_minutes, row.overtime_minutes, row.gross_pay, row.tax_withheld, row.net_pay)
+        want = (ref.regular_minutes, ref.overtime_minutes, ref.gross_pay, ref.tax_withheld, ref.net_pay)
+        assert got == want, f"{label}: sql {got} != reference {want}"
+        assert isinstance(row.gross_pay, Decimal), label
+
+
+def test_reference_edge_cases():
+    from app.services.payroll_service import compute_pay_line
+
+    # half a cent rounds up, not to even
+    assert compute_pay_line(6, Decimal("12.25"), False, Decimal(0)).gross_pay == Decimal("1.23")
+
+    at_cap = compute_pay_line(2400, Decimal("20"), False, Decimal(0))
+    assert (at_cap.regular_minutes, at_cap.overtime_minutes, at_cap.gross_pay) == (2400, 0, Decimal("800.00"))
+
+    over = compute_pay_line(2401, Decimal("20"), False, Decimal(0))
+    assert (over.regular_minutes, over.overtime_minutes, over.gross_pay) == (2400, 1, Decimal("800.50"))
+
+    taxed = compute_pay_line(2400, Decimal("20"), True, Decimal("7.65"))
+    assert (taxed.tax_withheld, taxed.net_pay) == (Decimal("61.20"), Decimal("738.80"))
+    untaxed = compute_pay_line(2400, Decimal("20"), False, Decimal("7.65"))
+    assert (untaxed.tax_withheld, untaxed.net_pay) == (Decimal("0.00"), Decimal("800.00"))
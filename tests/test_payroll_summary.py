@@ -0,0 +1,44 @@
+"""
+Store payroll summaries carry pay figures: only managers of the store (and
+admins of its tenant) may read them.
+"""
+
+from __future__ import annotations
+
+API = "/api/v1"
+
+SIZE = dict(tenants=2, stores_per_tenant=1, employees_per_store=2, shifts_per_day=1)
+
+
+def _summary(client, world, user):
+    return client.get(
+        f"{API}/payroll/stores/{world.store.id}/week/{world.past_week.week_start}/summary",
+        headers=world.headers(user),
+    )
+
+
+def test_summary_for_store_manager(client, world_factory):
+    world = world_factory(**SIZE)
+    r = _summary(client, world, world.manager)
+    assert r.status_code == 200, r.text
+    assert r.json()["lines"]
+
+
+def test_summary_hidden_from_manager_of_other_tenant(client, world_factory, db):
+    from app.models import User
+
+    world = world_factory(**SIZE)
+    outsider = db.query(User).filter(User.role == "manager", User.tenant_id != world.tenant.id).first()
+    r = _summary(client, world, outsider)
+    assert r.status_code == 404, r.text
+
+
+def test_summary_forbidden_for_manager_of_other_store(client, world_factory, db):
+    from app.models import User
+
+    world = world_factory(**SIZE)
+    other = User(email="mgr-elsewhere@example.com", hashed_password="x", role="manager", tenant_id=world.tenant.id, full_name="Elsewhere")
+    db.add(other)
+    db.commit()
+    r = _summary(client, world, other)
+    assert r.status_code == 403, r.text
@@ -0,0 +1,165 @@
+"""
+Statement-count budgets per endpoint.
+
+Each endpoint is called once against a small and once against a large world
+(more tenants, stores, employees and shifts). It fails when its statement
+count grows with the data (an N+1 crept in), exceeds its budget, or the call
+takes longer than MAX_SECONDS.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import pytest
+
+API = "/api/v1"
+
+SMALL = dict(tenants=2, stores_per_tenant=1, employees_per_store=3, shifts_per_day=2)
+LARGE = dict(tenants=6, stores_per_tenant=3, employees_per_store=12, shifts_per_day=6)
+
+MAX_SECONDS = 2.0
+
+
+@dataclass
+class Case:
+    name: str
+    max_statements: int
+    call: Callable
+    status: int = 200
+
+    def __str__(self) -> str:
+        return self.name
+
+
+CASES = [
+    Case(
+        "developer.tenants_insights",
+        7,
+        lambda c, w: c.get(f"{API}/developer/tenants/insights", headers=w.headers(w.developer)),
+    ),
+    Case(
+        "payroll_invoices.generate_store_week_invoices",
+        5,
+        lambda c, w: c.post(
+            f"{API}/payroll-invoices/stores/{w.store.id}/week/{w.past_week.week_start}/generate-invoices",
+            headers=w.headers(w.tenant_admin),
+        ),
+    ),
+    Case(
+        "schedules.assign_employee",
+        16,
+        lambda c, w: c.post(
+            f"{API}/schedules/shifts/{w.open_shift.id}/assign",
+            json={"employee_id": str(w.employees[0].id)},
+            headers=w.headers(w.manager),
+        ),
+        status=201,
+    ),
+    Case(
+        "schedules.get_schedule",
+        6,
+        lambda c, w: c.get(f"{API}/schedules/{w.store.id}/{w.week.id}", headers=w.headers(w.manager)),
+    ),
+    Case(
+        "schedules.validate_schedule",
+        11,
+        lambda c, w: c.get(f"{API}/schedules/{w.schedule.id}/validate", headers=w.headers(w.manager)),
+    ),
+    Case(
+        "schedules.cost_forecast",
+        6,
+        lambda c, w: c.get(f"{API}/schedules/{w.schedule.id}/cost-forecast", headers=w.headers(w.manager)),
+    ),
+    Case(
+        "weeks.current",
+        1,
+        lambda c, w: c.get(f"{API}/weeks/current"),
+    ),
+    Case(
+        "stores.list",
+        3,
+        lambda c, w: c.get(f"{API}/stores", headers=w.headers(w.tenant_admin)),
+    ),
+    Case(
+        "users.list",
+        2,
+        lambda c, w: c.get(f"{API}/users", headers=w.headers(w.tenant_admin)),
+    ),
+    Case(
+        "memberships.store",
+        3,
+        lambda c, w: c.get(f"{API}/memberships/store/{w.store.id}", headers=w.headers(w.manager)),
+    ),
+    Case(
+        "availability.store",
+        2,
+        lambda c, w: c.get(f"{API}/availability/store/{w.store.id}", headers=w.headers(w.manager)),
+    ),
+    Case(
+        "manager_timeentries.store_week",
+        4,
+        lambda c, w: c.get(
+            f"{API}/manager/timeentries/stores/{w.store.id}/week/{w.past_week.week_start}/entries",
+            headers=w.headers(w.manager),
+        ),
+    ),
+    Case(
+        "payroll.store_week_summary",
+        5,
+        lambda c, w: c.get(
+            f"{API}/payroll/stores/{w.store.id}/week/{w.past_week.week_start}/summary",
+            headers=w.headers(w.manager),
+        ),
+    ),
+    Case(
+        "payroll.tenant_week_summary",
+        4,
+        lambda c, w: c.get(
+            f"{API}/payroll/tenant/week/{w.past_week.week_start}/summary",
+            headers=w.headers(w.tenant_admin),
+        ),
+    ),
+    Case(
+        "reports.variance",
+        5,
+        lambda c, w: c.get(
+            f"{API}/reports/variance",
+            params={"week_start": str(w.past_week.week_start)},
+            headers=w.headers(w.tenant_admin),
+        ),
+    ),
+    Case(
+        "ai_schedule.gap_fill",
+        10,
+        lambda c, w: c.post(
+            f"{API}/ai/gap-fill",
+            json={"store_id": str(w.store.id), "week_id": str(w.week.id)},
+            headers=w.headers(w.manager),
+        ),
+        status=202,
+    ),
+]
+
+
+@pytest.mark.parametrize("case", CASES, ids=str)
+def test_statement_count_does_not_grow_with_data(case, client, world_factory, count_queries):
+    measured = []
+    for size in (SMALL, LARGE):
+        world = world_factory(**size)
+        with count_queries() as q:
+            r = case.call(client, world)
+        assert r.status_code == case.status, r.text
+        measured.append(q)
+
+    small, large = measured
+    assert large.count <= small.count, (
+        f"{case.name}: statement count grew with data ({small.count} -> {large.count})\n{large}"
+    )
+    assert large.count <= case.max_statements, (
+        f"{case.name}: {large.count} statements, over its budget of {case.max_statements}\n{large}"
+    )
+    assert large.seconds <= MAX_SECONDS, (
+        f"{case.name}: took {large.seconds:.2f}s (max {MAX_SECONDS}s) for {large.count} statements"
+    )
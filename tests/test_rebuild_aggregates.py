@@ -0,0 +1,86 @@
+"""
+Rebuilding weekly aggregates must never wipe a week whose time entries are
+gone (archived): the aggregates are all payroll has left of it.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+API = "/api/v1"
+
+SIZE = dict(tenants=1, stores_per_tenant=1, employees_per_store=3, shifts_per_day=1)
+
+
+def _agg_rows(db, week):
+    from app.models.timeentry_weekly_agg import TimeEntryWeeklyAgg
+
+    return sorted(
+        (str(r.employee_id), r.total_minutes)
+        for r in db.query(TimeEntryWeeklyAgg).filter(TimeEntryWeeklyAgg.week_id == week.id)
+    )
+
+
+def _archive(db, week):
+    from app.services.week_archive import archive_week
+
+    week.is_locked = True
+    db.commit()
+    archive_week(db, week)
+
+
+def test_rebuild_endpoint_rejects_archived_week(client, world_factory, db):
+    world = world_factory(**SIZE)
+    before = _agg_rows(db, world.past_week)
+    assert before
+
+    _archive(db, world.past_week)
+
+    r = client.post(
+        f"{API}/payroll/stores/{world.store.id}/week/{world.past_week.week_start}/rebuild-aggregates",
+        headers=world.headers(world.manager),
+    )
+    assert r.status_code == 400, r.text
+    assert _agg_rows(db, world.past_week) == before
+
+
+def test_rebuild_week_refuses_archived_week(world_factory, db):
+    from app.services.time_entry_agg import rebuild_week
+
+    world = world_factory(**SIZE)
+    before = _agg_rows(db, world.past_week)
+    _archive(db, world.past_week)
+
+    with pytest.raises(ValueError):
+        rebuild_week(db, week=world.past_week)
+    db.rollback()
+    assert _agg_rows(db, world.past_week) == before
+
+
+def test_rebuild_endpoint_rebuilds_live_week(client, world_factory, db):
+    world = world_factory(**SIZE)
+    before = _agg_rows(db, world.past_week)
+
+    r = client.post(
+        f"{API}/payroll/stores/{world.store.id}/week/{world.past_week.week_start}/rebuild-aggregates",
+        headers=world.headers(world.manager),
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["rows"] == len(before)
+    db.expire_all()
+    assert _agg_rows(db, world.past_week) == before
+
+
+def test_rebuild_endpoint_requires_store_access(client, world_factory, db):
+    from app.models import User
+
+    world = world_factory(**SIZE)
+    outsider = User(email="other-mgr@example.com", hashed_password="x", role="manager", tenant_id=world.tenant.id, full_name="Other")
+    db.add(outsider)
+    db.commit()
+
+    r = client.post(
+        f"{API}/payroll/stores/{world.store.id}/week/{world.past_week.week_start}/rebuild-aggregates",
+        headers=world.headers(outsider),
+    )
+    assert r.status_code == 403, r.text
@@ -0,0 +1,76 @@
+"""
+Store-scoped reports: tenant admins see any store of their tenant, managers
+only the stores they belong to.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+API = "/api/v1"
+
+SIZE = dict(tenants=2, stores_per_tenant=1, employees_per_store=2, shifts_per_day=1)
+
+
+def _variance(client, world, user, store_id):
+    return client.get(
+        f"{API}/reports/variance",
+        params={"week_start": str(world.past_week.week_start), "store_id": str(store_id)},
+        headers=world.headers(user),
+    )
+
+
+@pytest.mark.parametrize("role", ["tenant_admin", "manager"])
+def test_variance_for_one_store_of_own_tenant(client, world_factory, role):
+    world = world_factory(**SIZE)
+    r = _variance(client, world, getattr(world, role), world.store.id)
+    assert r.status_code == 200, r.text
+
+
+def test_variance_for_store_of_other_tenant_is_not_found(client, world_factory, db):
+    from app.models import Store
+
+    world = world_factory(**SIZE)
+    other = db.query(Store).filter(Store.tenant_id != world.tenant.id).first()
+    r = _variance(client, world, world.tenant_admin, other.id)
+    assert r.status_code == 404, r.text
+
+
+def test_variance_for_store_manager_does_not_belong_to(client, world_factory, db):
+    from app.models import StoreMembership
+
+    world = world_factory(**SIZE)
+    db.query(StoreMembership).filter(StoreMembership.user_id == world.manager.id).update({"is_active": False})
+    db.commit()
+    r = _variance(client, world, world.manager, world.store.id)
+    assert r.status_code == 403, r.text
+
+
+def test_locked_week_report_is_cached_without_committing_the_session(world_factory, db, engine):
+    from sqlalchemy import text
+
+    from app.models import WeekReportCache
+    from app.services.report_cache import get_or_compute_week_report
+
+    world = world_factory(**SIZE)
+    world.past_week.is_locked = True
+    db.commit()
+
+    world.tenant.name = "uncommitted"
+    db.flush()
+    payload = get_or_compute_week_report(
+        db, kind="test", store_id=world.store.id, week=world.past_week, compute=lambda: {"n": 1}
+    )
+    assert payload == {"n": 1}
+
+    with engine.connect() as conn:
+        # the cache row is visible to others, the caller's pending change is not
+        assert conn.execute(text("SELECT count(*) FROM week_report_cache WHERE report_kind = 'test'")).scalar() == 1
+        assert conn.execute(text("SELECT name FROM tenants WHERE id = :id"), {"id": world.tenant.id}).scalar() != "uncommitted"
+    db.rollback()
+
+    again = get_or_compute_week_report(
+        db, kind="test", store_id=world.store.id, week=world.past_week, compute=lambda: {"n": 2}
+    )
+    assert again == {"n": 1}
+    assert db.query(WeekReportCache).filter(WeekReportCache.report_kind == "test").count() == 1
@@ -0,0 +1,60 @@
+"""
+Overlap checks of ScheduleConstraints on in-memory state (no database).
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.services.schedule_constraints import ScheduleConstraints
+
+EMP = uuid.uuid4()
+
+
+def _shift(start_hour: int, end_hour: int):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        start_at=datetime(2024, 3, 4, start_hour, tzinfo=timezone.utc),
+        end_at=datetime(2024, 3, 4, end_hour, tzinfo=timezone.utc),
+        headcount_required=1,
+        assignments=[],
+    )
+
+
+def _constraints(*shifts) -> ScheduleConstraints:
+    c = ScheduleConstraints(schedule=None, week=None)
+    for sh in shifts:
+        c.add(EMP, sh)
+    return c
+
+
+def _codes(violations):
+    return [v.code for v in violations]
+
+
+def test_overlap_with_long_shift_behind_shorter_ones():
+    # 08-20 already overlaps 09-10 (other store); 12-13 sits inside 08-20
+    c = _constraints(_shift(8, 20), _shift(9, 10))
+    assert "overlap" in _codes(c.check_assign(EMP, _shift(12, 13)))
+
+
+def test_overlap_with_shift_starting_later():
+    c = _constraints(_shift(8, 9), _shift(12, 16))
+    assert "overlap" in _codes(c.check_assign(EMP, _shift(11, 13)))
+
+
+def test_adjacent_shifts_do_not_overlap():
+    c = _constraints(_shift(8, 12), _shift(9, 10), _shift(16, 20))
+    assert "overlap" not in _codes(c.check_assign(EMP, _shift(12, 16)))
+
+
+def test_validate_reports_every_overlap():
+    long, short, late = _shift(8, 20), _shift(9, 10), _shift(12, 13)
+    for sh in (long, short, late):
+        sh.assignments = [SimpleNamespace(id=uuid.uuid4(), employee_id=EMP, assigned_at=sh.start_at)]
+
+    c = ScheduleConstraints(schedule=None, week=None)
+    overlaps = [v for v in c.validate([long, short, late]) if v.code == "overlap"]
+    assert {v.shift_id for v in overlaps} == {short.id, late.id}
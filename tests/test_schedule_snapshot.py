@@ -0,0 +1,37 @@
+"""
+A published schedule is served from its snapshot, which must read exactly
+like the live render and not go stale when other tables change.
+"""
+
+from __future__ import annotations
+
+API = "/api/v1"
+
+SIZE = dict(tenants=1, stores_per_tenant=1, employees_per_store=2, shifts_per_day=1)
+
+
+def _get(client, world):
+    r = client.get(f"{API}/schedules/{world.store.id}/{world.week.id}", headers=world.headers(world.manager))
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_published_snapshot_matches_live_render(client, world_factory, db):
+    world = world_factory(**SIZE)
+    live = _get(client, world)
+
+    r = client.post(
+        f"{API}/schedules/{world.schedule.id}/publish",
+        json={"is_published": True},
+        headers=world.headers(world.manager),
+    )
+    assert r.status_code == 200, r.text
+
+    published = _get(client, world)
+    assert {**published, "is_published": False} == live
+
+    # renaming an assigned employee leaves nothing stale in the snapshot
+    world.employees[0].full_name = "Renamed"
+    db.commit()
+    assert _get(client, world) == published
+    assert "Renamed" not in str(published)
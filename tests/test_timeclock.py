@@ -0,0 +1,80 @@
+"""
+Clocking out adds the entry's minutes to the weekly aggregate exactly once,
+even when two clock-outs of the same entry race.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+API = "/api/v1"
+
+SIZE = dict(tenants=1, stores_per_tenant=1, employees_per_store=1, shifts_per_day=1)
+
+
+def _open_entry(db, world):
+    from app.models import TimeEntry
+    from app.services.time_entry_agg import record_clock_in
+
+    emp = world.employees[0]
+    entry = TimeEntry(
+        store_id=world.store.id,
+        employee_id=emp.id,
+        week_id=world.week.id,
+        clock_in_at=datetime.now(timezone.utc) - timedelta(hours=2),
+        out_of_zone_seconds=0,
+        is_out_of_zone=False,
+    )
+    db.add(entry)
+    db.flush()
+    record_clock_in(db, entry)
+    db.commit()
+    return entry
+
+
+def _agg(db, world):
+    from app.models import TimeEntryWeeklyAgg
+
+    db.expire_all()
+    row = db.query(TimeEntryWeeklyAgg).filter(
+        TimeEntryWeeklyAgg.week_id == world.week.id,
+        TimeEntryWeeklyAgg.employee_id == world.employees[0].id,
+    ).one()
+    return row.total_minutes, row.open_entries
+
+
+def test_racing_clock_outs_count_minutes_once(client, world_factory, db, engine):
+    from sqlalchemy.orm import Session
+
+    from app.models import TimeEntry
+    from app.services.time_entry_agg import record_clock_out
+
+    world = world_factory(**SIZE)
+    entry = _open_entry(db, world)
+
+    # first clock-out, still uncommitted, holds the row
+    first = Session(engine)
+    locked = first.query(TimeEntry).filter(TimeEntry.id == entry.id).with_for_update().one()
+    locked.clock_out_at = datetime.now(timezone.utc)
+    record_clock_out(first, locked)
+
+    result = {}
+
+    def second():
+        result["r"] = client.post(
+            f"{API}/timeclock/clock-out",
+            json={"time_entry_id": str(entry.id), "lat": 40.7, "lng": -74.0},
+            headers=world.headers(world.employees[0]),
+        )
+
+    t = threading.Thread(target=second)
+    t.start()
+    time.sleep(0.5)
+    first.commit()
+    first.close()
+    t.join(10)
+
+    assert result["r"].status_code == 400, result["r"].text
+    assert _agg(db, world) == (120, 0)
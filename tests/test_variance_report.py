@@ -0,0 +1,49 @@
+"""
+Matching of clocked entries to scheduled shifts in the variance report
+(no database).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.services.variance_report_service import _merge_employee, _new_line
+
+NOW = datetime(2024, 3, 10, tzinfo=timezone.utc)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2024, 3, 4, hour, minute, tzinfo=timezone.utc)
+
+
+def _merge(shifts, entries):
+    line = _new_line("e")
+    _merge_employee(line, shifts, entries, NOW)
+    return line
+
+
+def test_short_entry_behind_long_one_is_not_attendance():
+    # 08-20 and a stray 09-10 entry; the 12-13 shift is covered by 08-20 only
+    line = _merge([(_at(12), _at(13))], [(_at(8), _at(20)), (_at(9), _at(10))])
+    assert line["no_shows"] == 0
+    assert line["unscheduled_entries"] == 1
+    assert line["unscheduled_minutes"] == 60
+
+
+def test_long_entry_covers_later_shift_after_short_one():
+    line = _merge(
+        [(_at(9), _at(10)), (_at(12), _at(13))],
+        [(_at(8), _at(20)), (_at(9), _at(10))],
+    )
+    assert line["no_shows"] == 0
+    assert line["unscheduled_entries"] == 0
+
+
+def test_late_early_and_no_show():
+    line = _merge(
+        [(_at(8), _at(12)), (_at(13), _at(17))],
+        [(_at(8, 20), _at(11, 30))],
+    )
+    assert (line["late_count"], line["late_minutes"]) == (1, 20)
+    assert (line["early_leave_count"], line["early_leave_minutes"]) == (1, 30)
+    assert line["no_shows"] == 1